@@ -3,4 +3,16 @@
 
 from ..Radial.Generator import make_radialshapestring as Radial
 from ..Spaced.Generator import make_spacedshapestring as Spaced
+from ..Spaced.Generator import make_scaleshapestring as Scale
 from ..Grid.Generator import make_gridshapestring as Grid
+from ..Path.Generator import make_pathshapestring as Path
+from ..Multi.Generator import make_multishapestring as Multi
+from ..Misc.Groups import group_shape as GroupShape
+from ..Misc.StringMap import string_shape as StringShape
+from ..Misc.StringMap import string_at as StringAt
+from ..Engrave.Generator import make_engraveshapestring as Engrave
+from ..Misc.Estimate import estimate_shapestring as Estimate
+from ..Export.DXF import export_dxf as ExportDXF
+from ..Export.SVG import export_svg as ExportSVG
+from ..Export.STEP import export_step as ExportSTEP
+from ..Export.Mesh import export_mesh as ExportMesh
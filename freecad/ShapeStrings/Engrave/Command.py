@@ -0,0 +1,66 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the GUI command to engrave a ShapeString into a solid.
+
+Select the ShapeString first, then the solid to engrave into.
+"""
+
+
+import FreeCAD as App
+import FreeCADGui as Gui
+
+from ..Misc.Resources import asIcon
+from draftutils.messages import _err
+
+from FreeCAD import Qt
+
+translate = Qt.translate
+
+
+class EngraveShapeString:
+    """Gui command for the EngraveShapeString tool."""
+
+    def GetResources(self):
+        """Set icon, menu, and tooltip."""
+        return {
+            'Pixmap': asIcon('Engrave'),
+            'MenuText': translate(
+                "ShapeStrings-Engrave",
+                "Engrave ShapeString"
+            ),
+            'ToolTip': translate(
+                "ShapeStrings-Engrave",
+                "Cuts a ShapeString into a solid in a single boolean operation. "
+                "Select the ShapeString first, then the solid. "
+                "Change Mode to Emboss to raise the text instead."
+            ),
+        }
+
+    def IsActive(self):
+        return len(Gui.Selection.getSelection()) == 2
+
+    def Activated(self):
+        """Execute when the command is called."""
+        selection = Gui.Selection.getSelection()
+        if len(selection) != 2:
+            _err(translate("draft", "Select a ShapeString, then the solid to engrave into") + "\n")
+            return
+        source, target = selection
+        if not target.isDerivedFrom("Part::Feature") or not target.Shape.Solids:
+            _err(translate("draft", "EngraveShapeString: the second selected object is not a solid") + "\n")
+            return
+
+        doc = App.ActiveDocument
+        doc.openTransaction(translate("draft", "Engrave ShapeString"))
+        Gui.addModule("ShapeStrings")
+        Gui.doCommand(
+            "ShapeStrings.Engrave("
+            "FreeCAD.ActiveDocument.getObject('{}'), "
+            "FreeCAD.ActiveDocument.getObject('{}'))".format(source.Name, target.Name)
+        )
+        doc.commitTransaction()
+        doc.recompute()
+
+def registerEngrave():
+    Gui.addCommand('ShapeStrings_Engrave', EngraveShapeString())
@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides functions to create EngraveShapeString objects."""
+
+import FreeCAD as App
+import draftutils.gui_utils as gui_utils
+
+from .Object import EngraveShapeString
+
+if App.GuiUp:
+    from .View import ViewProviderEngraveShapeString
+
+
+def make_engraveshapestring(Source, Target, Depth=1, Mode="Engrave"):
+    """EngraveShapeString(Source,Target,[Depth],[Mode])
+
+    Cuts the text faces of the ShapeString `Source` into the solid
+    `Target` (Mode "Engrave"), or fuses them onto it (Mode "Emboss"),
+    `Depth` deep, in a single boolean operation.
+    """
+    if not App.ActiveDocument:
+        App.Console.PrintError("No active document. Aborting\n")
+        return
+
+    obj = App.ActiveDocument.addObject(
+        "Part::FeaturePython",
+        "EngraveShapeString"
+    )
+    EngraveShapeString(obj)
+    obj.Source = Source
+    obj.Target = Target
+    obj.Depth = Depth
+    obj.Mode = Mode
+
+    if App.GuiUp:
+        ViewProviderEngraveShapeString(obj.ViewObject)
+        gui_utils.format_object(obj, Target)
+        Source.ViewObject.Visibility = False
+        Target.ViewObject.Visibility = False
+        gui_utils.select(obj)
+
+    obj.recompute()
+    return obj
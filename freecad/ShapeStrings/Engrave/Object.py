@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the object code for the EngraveShapeString object.
+
+Engraving hundreds of labels used to mean extruding the whole compound and
+pocketing it, or scripting one boolean per string. This feature cuts (or
+fuses) a ShapeString into a target solid in a single boolean operation:
+
+- the tool bodies start on the target face the text lies on (the nearest
+  planar face parallel to the text) and reach `Depth` into or out of it,
+- the tools are extruded from the source's own shape, so the text is
+  exactly what the ShapeString shows, kerning and `Fuse` included; pieces
+  that share their geometry - the copies of a repeated string (see
+  `Misc/Dedup.py`) or of a placed glyph (see `Misc/Instances.py`) - are
+  extruded once and the prism placed per copy,
+- all tools are handed to one boolean as a single argument list, which
+  FreeCAD runs in OpenCASCADE's parallel mode.
+
+The time the boolean took is printed and kept in `BooleanTime`.
+"""
+
+import time
+
+import FreeCAD as App
+import Part
+
+from draftobjects.base import DraftObject
+
+from FreeCAD import Qt
+
+translate = Qt.translate
+
+
+# Tools start this far outside the target face, so they cut cleanly
+# through it instead of sharing it (fraction of Depth)
+OVERLAP = 0.01
+
+# Faces of a solid piece within this of its own Z = 0 are its text faces
+PLANE_TOLERANCE = 1e-7
+
+
+class EngraveShapeString(DraftObject):
+    """The EngraveShapeString object - cuts or embosses a ShapeString into a solid"""
+
+    def __init__(self, obj):
+        super().__init__(obj, "EngraveShapeString")
+        self.set_properties(obj)
+
+    def set_properties(self, obj):
+        """Add properties to the object and set them."""
+        properties = obj.PropertiesList
+
+        if "Source" not in properties:
+            _tip = translate("App::Property", "ShapeString providing the text faces")
+            obj.addProperty("App::PropertyLink", "Source", "Draft", _tip)
+
+        if "Target" not in properties:
+            _tip = translate("App::Property", "Solid to engrave into or emboss onto")
+            obj.addProperty("App::PropertyLink", "Target", "Draft", _tip)
+
+        if "Mode" not in properties:
+            _tip = translate("App::Property", "Engrave cuts the text into the target, Emboss raises it")
+            obj.addProperty("App::PropertyEnumeration", "Mode", "Draft", _tip)
+            obj.Mode = ["Engrave", "Emboss"]
+            obj.Mode = "Engrave"
+
+        if "Depth" not in properties:
+            _tip = translate("App::Property", "Depth of the engraving, or height of the embossing")
+            obj.addProperty("App::PropertyLength", "Depth", "Draft", _tip)
+            obj.Depth = 1.0
+
+        if "BooleanTime" not in properties:
+            _tip = translate("App::Property", "Time the last boolean operation took, in seconds")
+            obj.addProperty("App::PropertyFloat", "BooleanTime", "Draft", _tip)
+            obj.setEditorMode("BooleanTime", 1)
+
+    def onDocumentRestored(self, obj):
+        super().onDocumentRestored(obj)
+        # Ensure all properties exist after document restoration
+        self.set_properties(obj)
+
+    def execute(self, obj):
+        """Cut or fuse the ShapeString's tools into the target in one boolean."""
+        if not obj.Source or not obj.Target:
+            return
+
+        target = obj.Target.Shape
+        if target.isNull() or not target.Solids:
+            App.Console.PrintWarning(translate("draft", "EngraveShapeString: target has no solid") + "\n")
+            return
+
+        depth = float(obj.Depth)
+        if depth <= 0:
+            obj.Shape = target.copy()
+            return
+
+        plane = obj.Source.Placement
+        normal = plane.Rotation.multVec(App.Vector(0, 0, 1))
+        offset = self.face_offset(target, plane.Base, normal)
+
+        # Tool prisms along the text normal, from just outside the
+        # target face to `depth` into it (Engrave) or out of it (Emboss)
+        if obj.Mode == "Engrave":
+            start = offset + depth * OVERLAP
+            length = -depth * (1 + OVERLAP)
+        else:
+            start = offset - depth * OVERLAP
+            length = depth * (1 + OVERLAP)
+
+        tools = self.make_tools(obj.Source, start, length)
+        if not tools:
+            App.Console.PrintWarning(translate("draft", "EngraveShapeString: source has no faces") + "\n")
+            obj.Shape = target.copy()
+            return
+
+        begin = time.perf_counter()
+        if obj.Mode == "Engrave":
+            result = target.cut(tools)
+        else:
+            result = target.fuse(tools)
+        elapsed = time.perf_counter() - begin
+
+        obj.Shape = result
+        obj.BooleanTime = elapsed
+        App.Console.PrintMessage(
+            translate("draft", "EngraveShapeString: {} tools in one {} took {:.2f} s").format(
+                len(tools),
+                translate("draft", "cut") if obj.Mode == "Engrave" else translate("draft", "fuse"),
+                elapsed,
+            )
+            + "\n"
+        )
+
+    def face_offset(self, target, origin, normal):
+        """Distance along `normal` from the text plane to the target face.
+
+        Picks the planar face of `target` parallel to the text that is
+        closest to it; 0 when there is none, so tools start on the text.
+        """
+        best = None
+        for face in target.Faces:
+            surface = face.Surface
+            if not isinstance(surface, Part.Plane):
+                continue
+            if abs(abs(surface.Axis.dot(normal)) - 1.0) > 1e-7:
+                continue
+            distance = (surface.Position - origin).dot(normal)
+            if best is None or abs(distance) < abs(best):
+                best = distance
+        return best or 0.0
+
+    def make_tools(self, source, start, length):
+        """Tool solids for `source`, each extruded by `length` from `start`.
+
+        Every sub-shape of the source's shape is extruded along its own
+        Z axis, the text normal. Sub-shapes sharing their geometry at
+        different placements are extruded once; solid sub-shapes (a
+        source with a `Height`) are extruded from their faces on the
+        text plane.
+        """
+        shape = source.Shape
+        pieces = shape.childShapes() if shape.ShapeType == "Compound" else [shape]
+
+        shift = App.Placement(App.Vector(0, 0, start), App.Rotation())
+        prisms = {}
+        tools = []
+        for piece in pieces:
+            base = piece.located(App.Placement())
+            bucket = prisms.setdefault(base.hashCode(), [])
+            for known, prism in bucket:
+                if known.isSame(base):
+                    break
+            else:
+                prism = self.make_prism(base, length)
+                bucket.append((base, prism))
+            if prism is not None:
+                placement = piece.Placement.multiply(shift)
+                tools.extend(solid.moved(placement) for solid in prism.Solids)
+        return tools
+
+    def make_prism(self, piece, length):
+        """`piece`'s text faces extruded by `length` along Z, or None."""
+        faces = piece.Faces
+        if piece.Solids:
+            faces = [
+                face for face in faces
+                if abs(face.BoundBox.ZMin) < PLANE_TOLERANCE and abs(face.BoundBox.ZMax) < PLANE_TOLERANCE
+            ]
+        if not faces:
+            return None
+        return Part.Compound(faces).extrude(App.Vector(0, 0, length))
+
+    def onChanged(self, obj, prop):
+        self.props_changed_store(prop)
@@ -0,0 +1,21 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the viewprovider code for the EngraveShapeString object."""
+
+
+from draftviewproviders.view_base import ViewProviderDraft
+from ..Misc.Resources import asIcon
+
+class ViewProviderEngraveShapeString(ViewProviderDraft):
+
+    def __init__(self, vobj):
+        vobj.Proxy = self
+
+    def getIcon(self):
+        return asIcon('Engrave')
+
+    def claimChildren(self):
+        # The target is consumed by the boolean, like a Part Cut's base
+        obj = self.Object
+        return [child for child in (obj.Source, obj.Target) if child]
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""DXF export with each distinct glyph written once, as a BLOCK.
+
+A generic DXF export of a ShapeString writes every character occurrence as
+its own set of spline entities, so a sheet of serial-number labels runs to
+tens of megabytes. Here each distinct glyph of an object becomes one BLOCK
+holding its outline as closed polylines, and every occurrence becomes an
+INSERT of that block with a position and rotation. File size grows with
+the number of distinct glyphs, plus one short INSERT per character.
+
+The file is written as DXF R12, which every CAM and laser package reads,
+in the ShapeStrings' own plane (see `Misc/Instances.plane_matrix`).
+Outlines are polylines discretised to `deflection`, by default 1 % of the
+text size. Each object's INSERTs go on a layer named after the object.
+
+INSERT positions are the kerned glyph placements of `Misc/Instances.py`,
+checked against the object's rendered Shape before anything is written:
+an object whose glyphs do not match it - `Fuse` merging overlapping
+glyphs, or a shape that is not up to date - is skipped with a warning,
+so the cut file never differs from the model.
+"""
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from ..Misc.Instances import collect_instances, glyph_name, plane_matrix, planar_transform
+
+
+def _tag(code, value):
+    return "{}\n{}\n".format(code, value)
+
+
+def _num(value):
+    return "{:.6f}".format(value).rstrip("0").rstrip(".") or "0"
+
+
+def _layer_name(instances):
+    # Object names are already restricted to letters, digits and "_"
+    return instances.name
+
+
+def _block_name(set_index, key):
+    return "SS{}_{}".format(set_index, glyph_name(key))
+
+
+def _write_polyline(out, points, layer="0"):
+    closed = len(points) > 2 and points[0] == points[-1]
+    if closed:
+        points = points[:-1]
+    out.write(_tag(0, "POLYLINE") + _tag(8, layer) + _tag(66, 1))
+    out.write(_tag(10, 0) + _tag(20, 0) + _tag(30, 0) + _tag(70, 1 if closed else 0))
+    for x, y in points:
+        out.write(_tag(0, "VERTEX") + _tag(8, layer) + _tag(10, _num(x)) + _tag(20, _num(y)) + _tag(30, 0))
+    out.write(_tag(0, "SEQEND") + _tag(8, layer))
+
+
+def write_dxf(out, instance_sets, deflection=None):
+    """Write `instance_sets` (`GlyphInstances`) to the text stream `out`.
+
+    Returns `(blocks, inserts)`, the number of each written.
+    """
+    out.write(_tag(0, "SECTION") + _tag(2, "HEADER"))
+    out.write(_tag(9, "$ACADVER") + _tag(1, "AC1009"))
+    out.write(_tag(0, "ENDSEC"))
+
+    out.write(_tag(0, "SECTION") + _tag(2, "TABLES"))
+    out.write(_tag(0, "TABLE") + _tag(2, "LAYER") + _tag(70, len(instance_sets) + 1))
+    for layer in ["0"] + [_layer_name(instances) for instances in instance_sets]:
+        out.write(_tag(0, "LAYER") + _tag(2, layer) + _tag(70, 0) + _tag(62, 7) + _tag(6, "CONTINUOUS"))
+    out.write(_tag(0, "ENDTAB"))
+    out.write(_tag(0, "ENDSEC"))
+
+    blocks = 0
+    out.write(_tag(0, "SECTION") + _tag(2, "BLOCKS"))
+    for set_index, instances in enumerate(instance_sets):
+        glyph_deflection = deflection or instances.size * 0.01
+        for char in instances.glyphs:
+            name = _block_name(set_index, char)
+            out.write(_tag(0, "BLOCK") + _tag(8, "0") + _tag(2, name) + _tag(70, 0))
+            out.write(_tag(10, 0) + _tag(20, 0) + _tag(30, 0) + _tag(3, name))
+            for polyline in instances.outline(char, glyph_deflection):
+                _write_polyline(out, polyline)
+            out.write(_tag(0, "ENDBLK") + _tag(8, "0"))
+            blocks += 1
+    out.write(_tag(0, "ENDSEC"))
+
+    inserts = 0
+    out.write(_tag(0, "SECTION") + _tag(2, "ENTITIES"))
+    for set_index, instances in enumerate(instance_sets):
+        layer = _layer_name(instances)
+        plane = plane_matrix(instances.placement)
+        for _index, char, matrix in instances.occurrences:
+            x, y, rotation = planar_transform(plane.multiply(matrix))
+            out.write(_tag(0, "INSERT") + _tag(8, layer) + _tag(2, _block_name(set_index, char)))
+            out.write(_tag(10, _num(x)) + _tag(20, _num(y)) + _tag(30, 0))
+            if abs(rotation) > 1e-9:
+                out.write(_tag(50, _num(rotation)))
+            inserts += 1
+    out.write(_tag(0, "ENDSEC"))
+
+    out.write(_tag(0, "EOF"))
+    return blocks, inserts
+
+
+def export_dxf(Objects, Path, Deflection=None):
+    """ExportDXF(Objects,Path,[Deflection])
+
+    Writes the given Spaced, Radial, Grid, Path and Multi ShapeStrings to a DXF file,
+    with each distinct glyph as a BLOCK and every character as an INSERT
+    of it. `Deflection` is the outline's maximum deviation from the true
+    curves, in model units; by default 1 % of each object's size.
+    Returns `(blocks, inserts)`.
+    """
+    instance_sets = collect_instances(Objects, "ExportDXF")
+    with open(Path, "w", encoding="ascii", newline="\r\n") as out:
+        blocks, inserts = write_dxf(out, instance_sets, Deflection)
+    App.Console.PrintMessage(
+        translate("draft", "{}: {} glyph blocks, {} inserts").format(Path, blocks, inserts) + "\n"
+    )
+    return blocks, inserts
+
+
+def export(exportList, filename):
+    """Entry point for FreeCAD's File > Export."""
+    export_dxf(exportList, filename)
@@ -0,0 +1,268 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""STL and 3MF export that tessellates each distinct glyph once.
+
+Meshing an extruded ShapeString tessellates every character occurrence
+from scratch, although a nameplate sheet rarely has more than a few dozen
+distinct glyphs. Here each distinct glyph is (optionally extruded and)
+tessellated once, at the requested deviation, and every occurrence is
+written as a transformed copy of that mesh. Meshing time therefore grows
+with the number of distinct glyphs; only the cheap vertex transform is
+done per character.
+
+- STL (binary) has no instancing, so the transformed copies are written
+  out triangle by triangle, straight to the file.
+- 3MF stores each glyph mesh once as an object and places it with one
+  component per occurrence, so the file itself stays small too.
+
+Only filled glyphs can be meshed; ShapeStrings rendered as wires (sticky
+fonts, `MakeFace` off) are skipped with a warning.
+
+By default each object is meshed as it is modelled: glyphs are extruded
+with its own `Height` and `Taper` (see `Misc/Extrude.py`), and flat when
+it has none. Placements are the kerned glyph instances of
+`Misc/Instances.py`, checked against the object's rendered Shape; an
+object they do not match, e.g. with `Fuse` merging glyphs, is skipped
+with a warning, so the print never differs from the model.
+"""
+
+import os
+import struct
+import zipfile
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from ..Misc.Extrude import extrude_glyph
+from ..Misc.Instances import collect_instances
+
+
+class GlyphMesh:
+    """One tessellated glyph: points, triangles and triangle normals."""
+
+    def __init__(self, shape, deviation, height, taper=0.0):
+        if height:
+            shape = extrude_glyph(shape, height, taper)
+        points, triangles = shape.tessellate(deviation)
+        self.points = [(p.x, p.y, p.z) for p in points]
+        self.triangles = [tuple(triangle) for triangle in triangles]
+        self.normals = [self._normal(triangle) for triangle in self.triangles]
+
+    def _normal(self, triangle):
+        (ax, ay, az), (bx, by, bz), (cx, cy, cz) = (self.points[i] for i in triangle)
+        ux, uy, uz = bx - ax, by - ay, bz - az
+        vx, vy, vz = cx - ax, cy - ay, cz - az
+        nx, ny, nz = uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx
+        length = (nx * nx + ny * ny + nz * nz) ** 0.5 or 1.0
+        return nx / length, ny / length, nz / length
+
+
+def _mesh_sets(instance_sets, deviation, height, label):
+    """Tessellate every distinct glyph once.
+
+    Glyphs are extruded by `height`, or with None by each object's own
+    `Height` and `Taper`. Returns a list of (instances, {char:
+    GlyphMesh}, object matrix).
+    """
+    meshed = []
+    for instances in instance_sets:
+        if not instances.filled:
+            App.Console.PrintWarning(
+                translate("draft", "{}: skipping {}, its glyphs are wires and cannot be meshed").format(
+                    label, instances.label
+                )
+                + "\n"
+            )
+            continue
+        glyph_deviation = deviation or instances.size * 0.01
+        if height is None:
+            glyph_height, taper = instances.height, instances.taper
+        else:
+            glyph_height, taper = height, 0.0
+        meshes = {
+            char: GlyphMesh(shape, glyph_deviation, glyph_height, taper)
+            for char, shape in instances.glyphs.items()
+        }
+        meshed.append((instances, meshes, instances.placement.toMatrix()))
+    return meshed
+
+
+def _rows(m):
+    return (
+        (m.A11, m.A12, m.A13, m.A14),
+        (m.A21, m.A22, m.A23, m.A24),
+        (m.A31, m.A32, m.A33, m.A34),
+    )
+
+
+def write_stl(out, meshed):
+    """Write binary STL to the byte stream `out`; return the triangle count."""
+    count = 0
+    for instances, meshes, _base in meshed:
+        for _index, char, _matrix in instances.occurrences:
+            count += len(meshes[char].triangles)
+
+    out.write(b"ShapeStrings per-glyph mesh".ljust(80, b" "))
+    out.write(struct.pack("<I", count))
+
+    pack = struct.Struct("<12fH").pack
+    for instances, meshes, base in meshed:
+        for _index, char, matrix in instances.occurrences:
+            mesh = meshes[char]
+            (a11, a12, a13, a14), (a21, a22, a23, a24), (a31, a32, a33, a34) = _rows(base.multiply(matrix))
+            points = [
+                (
+                    a11 * x + a12 * y + a13 * z + a14,
+                    a21 * x + a22 * y + a23 * z + a24,
+                    a31 * x + a32 * y + a33 * z + a34,
+                )
+                for x, y, z in mesh.points
+            ]
+            records = []
+            for (i, j, k), (nx, ny, nz) in zip(mesh.triangles, mesh.normals):
+                # Rigid motion: normals only need the rotation
+                records.append(pack(
+                    a11 * nx + a12 * ny + a13 * nz,
+                    a21 * nx + a22 * ny + a23 * nz,
+                    a31 * nx + a32 * ny + a33 * nz,
+                    *points[i], *points[j], *points[k], 0,
+                ))
+            out.write(b"".join(records))
+    return count
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>\n"
+)
+
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>\n"
+)
+
+
+def _num(value):
+    return "{:.6f}".format(value).rstrip("0").rstrip(".") or "0"
+
+
+def _transform(m):
+    # 3MF matrices act on row vectors: the columns of FreeCAD's matrix
+    # become rows, translation last
+    return " ".join(_num(v) for v in (
+        m.A11, m.A21, m.A31,
+        m.A12, m.A22, m.A32,
+        m.A13, m.A23, m.A33,
+        m.A14, m.A24, m.A34,
+    ))
+
+
+def write_3mf(path, meshed):
+    """Write a 3MF package with one mesh object per glyph and components.
+
+    Returns `(meshes, components)`, the number of each written.
+    """
+    meshes_written = 0
+    components = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        package.writestr("_rels/.rels", _RELS)
+        with package.open("3D/3dmodel.model", "w") as raw:
+            def write(text):
+                raw.write(text.encode("utf-8"))
+
+            write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            write(
+                '<model unit="millimeter" xml:lang="en-US" '
+                'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+            )
+            write("<resources>\n")
+
+            next_id = 1
+            items = []
+            for instances, meshes, base in meshed:
+                ids = {}
+                for char, mesh in meshes.items():
+                    ids[char] = next_id
+                    write('<object id="{}" type="model"><mesh><vertices>\n'.format(next_id))
+                    for x, y, z in mesh.points:
+                        write('<vertex x="{}" y="{}" z="{}"/>\n'.format(_num(x), _num(y), _num(z)))
+                    write("</vertices><triangles>\n")
+                    for i, j, k in mesh.triangles:
+                        write('<triangle v1="{}" v2="{}" v3="{}"/>\n'.format(i, j, k))
+                    write("</triangles></mesh></object>\n")
+                    next_id += 1
+                    meshes_written += 1
+
+                write('<object id="{}" type="model" name="{}"><components>\n'.format(
+                    next_id, _escape(instances.label)
+                ))
+                for _index, char, matrix in instances.occurrences:
+                    write('<component objectid="{}" transform="{}"/>\n'.format(ids[char], _transform(matrix)))
+                    components += 1
+                write("</components></object>\n")
+                items.append((next_id, base))
+                next_id += 1
+
+            write("</resources>\n<build>\n")
+            for object_id, base in items:
+                write('<item objectid="{}" transform="{}"/>\n'.format(object_id, _transform(base)))
+            write("</build>\n</model>\n")
+    return meshes_written, components
+
+
+def _escape(text):
+    return (text.replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+def export_mesh(Objects, Path, Deviation=None, Height=None):
+    """ExportMesh(Objects,Path,[Deviation],[Height])
+
+    Writes the given Spaced, Radial, Grid, Path and Multi ShapeStrings to an STL or 3MF
+    file, chosen by the extension of `Path`. Each distinct glyph is
+    tessellated once, with `Deviation` as the maximum distance from the
+    true surface (by default 1 % of each object's size), and extruded
+    along the object's normal first: by default as the object models it,
+    with its own `Height` and `Taper`, or by `Height` when given (0 for
+    flat faces). Returns the number of triangles written for STL, or
+    `(meshes, components)` for 3MF.
+    """
+    extension = os.path.splitext(Path)[1].lower()
+    if extension not in (".stl", ".3mf"):
+        App.Console.PrintError(
+            translate("draft", "ExportMesh: unsupported file type '{}', use .stl or .3mf").format(extension)
+            + "\n"
+        )
+        return None
+
+    instance_sets = collect_instances(Objects, "ExportMesh")
+    height = None if Height is None else float(Height)
+    meshed = _mesh_sets(instance_sets, Deviation, height, "ExportMesh")
+    glyphs = sum(len(meshes) for _instances, meshes, _base in meshed)
+
+    if extension == ".stl":
+        with open(Path, "wb") as out:
+            result = write_stl(out, meshed)
+        App.Console.PrintMessage(
+            translate("draft", "{}: {} glyphs tessellated, {} triangles").format(Path, glyphs, result) + "\n"
+        )
+    else:
+        result = write_3mf(Path, meshed)
+        App.Console.PrintMessage(
+            translate("draft", "{}: {} glyph meshes, {} components").format(Path, *result) + "\n"
+        )
+    return result
+
+
+def export(exportList, filename):
+    """Entry point for FreeCAD's File > Export."""
+    export_mesh(exportList, filename)
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""STEP export with each distinct glyph stored as one shared representation.
+
+Exporting a ShapeString's compound to STEP writes a full copy of the glyph
+geometry - BSpline surfaces included - for every character occurrence.
+Here the export is built as an assembly instead: each distinct glyph of an
+object is one part, and every occurrence is an instance of it with its own
+placement, so the geometry is written once per glyph and referenced from
+there.
+
+The assembly is put together in a hidden, temporary document - one glyph
+feature and one link array per distinct glyph, grouped in an App::Part per
+ShapeString - and written with FreeCAD's own STEP exporter, which turns
+link array elements into placed instances of a shared representation.
+Unlike DXF and SVG, STEP keeps the full 3D Placement of each object, and
+an object with a `Height` is written as the solids it models: each glyph
+is extruded once with the object's `Height` and `Taper`, as in
+`Misc/Extrude.py`. Placements are the kerned glyph instances of
+`Misc/Instances.py`, checked against the object's rendered Shape; an
+object they do not match, e.g. with `Fuse` merging glyphs, is skipped
+with a warning, so the file never differs from the modelled part.
+"""
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from ..Misc.Extrude import extrude_glyph
+from ..Misc.Instances import collect_instances, glyph_name
+
+
+def _build_assembly(doc, instance_sets):
+    """Fill `doc` with one App::Part per ShapeString; return the parts."""
+    parts = []
+    for instances in instance_sets:
+        part = doc.addObject("App::Part", instances.name)
+        part.Label = instances.label
+        part.Placement = instances.placement
+
+        placements = {}
+        for _index, char, matrix in instances.occurrences:
+            placements.setdefault(char, []).append(App.Placement(matrix))
+
+        for char, char_placements in placements.items():
+            suffix = glyph_name(char)
+            glyph = doc.addObject("Part::Feature", "Glyph_" + suffix)
+            shape = instances.glyphs[char]
+            if instances.height and instances.filled:
+                shape = extrude_glyph(shape, instances.height, instances.taper)
+            glyph.Shape = shape
+            glyph.Label = "{} {}".format(instances.label, char)
+
+            array = doc.addObject("App::Link", "Glyphs_" + suffix)
+            array.LinkedObject = glyph
+            array.ElementCount = len(char_placements)
+            array.PlacementList = char_placements
+            array.Label = "{} {} x{}".format(instances.label, char, len(char_placements))
+            part.addObject(array)
+        parts.append(part)
+    return parts
+
+
+def export_step(Objects, Path):
+    """ExportSTEP(Objects,Path)
+
+    Writes the given Spaced, Radial, Grid, Path and Multi ShapeStrings to a STEP file
+    as an assembly, with each distinct glyph stored once and every
+    character a placed instance of it. Glyphs of objects with a `Height`
+    are written as solids. Returns `(glyphs, instances)`.
+    """
+    import Import
+
+    instance_sets = collect_instances(Objects, "ExportSTEP")
+    glyphs = sum(len(instances.glyphs) for instances in instance_sets)
+    occurrences = sum(len(instances.occurrences) for instances in instance_sets)
+
+    doc = App.newDocument("ShapeStringsStepExport", hidden=True, temp=True)
+    try:
+        parts = _build_assembly(doc, instance_sets)
+        doc.recompute()
+        Import.export(parts, Path)
+    finally:
+        App.closeDocument(doc.Name)
+
+    App.Console.PrintMessage(
+        translate("draft", "{}: {} shared glyphs, {} instances").format(Path, glyphs, occurrences) + "\n"
+    )
+    return glyphs, occurrences
+
+
+def export(exportList, filename):
+    """Entry point for FreeCAD's File > Export."""
+    export_step(exportList, filename)
@@ -0,0 +1,152 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""SVG export with each distinct glyph defined once and reused.
+
+Draft's generic SVG export flattens a ShapeString into one path per
+character occurrence. Here every distinct glyph of an object is written
+once inside `<defs>`, and each occurrence is a `<use>` referencing it with
+a `transform`. The document is streamed to the file element by element,
+so a sheet of thousands of labels is never held in memory as one string.
+
+The drawing is in the ShapeStrings' own plane (see
+`Misc/Instances.plane_matrix`), in millimetres, with Y pointing up as in
+FreeCAD. Filled glyphs are drawn as filled paths, wire-only glyphs as
+strokes.
+
+`<use>` transforms are the kerned glyph placements of
+`Misc/Instances.py`, checked against each object's rendered Shape first;
+an object they do not match - `Fuse` merging overlapping glyphs, or a
+shape that is not up to date - is left out with a warning, so the
+drawing never differs from the model.
+"""
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from ..Misc.Instances import collect_instances, glyph_name, plane_matrix
+
+
+# Space left around the drawing (mm)
+MARGIN = 1.0
+
+
+def _num(value):
+    return "{:.4f}".format(value).rstrip("0").rstrip(".") or "0"
+
+
+def _symbol_id(set_index, key):
+    return "g{}-{}".format(set_index, glyph_name(key).lower())
+
+
+def _path_data(polylines):
+    parts = []
+    for polyline in polylines:
+        closed = len(polyline) > 2 and polyline[0] == polyline[-1]
+        if closed:
+            polyline = polyline[:-1]
+        points = " ".join("{} {}".format(_num(x), _num(y)) for x, y in polyline)
+        parts.append("M" + points + ("Z" if closed else ""))
+    return "".join(parts)
+
+
+def _extent(instance_sets):
+    """Bounding box of every placed glyph, in export coordinates."""
+    box = None
+    for instances in instance_sets:
+        plane = plane_matrix(instances.placement)
+        boxes = {char: shape.BoundBox for char, shape in instances.glyphs.items()}
+        for _index, char, matrix in instances.occurrences:
+            glyph_box = boxes[char].transformed(plane.multiply(matrix))
+            if box is None:
+                box = glyph_box
+            else:
+                box.add(glyph_box)
+    return box
+
+
+def write_svg(out, instance_sets, deflection=None):
+    """Write `instance_sets` (`GlyphInstances`) to the text stream `out`.
+
+    Returns `(symbols, uses)`, the number of each written.
+    """
+    box = _extent(instance_sets) or App.BoundBox(0, 0, 0, 0, 0, 0)
+    x_min = box.XMin - MARGIN
+    y_max = box.YMax + MARGIN
+    width = box.XLength + 2 * MARGIN
+    height = box.YLength + 2 * MARGIN
+
+    out.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
+    out.write(
+        '<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        'version="1.1" width="{w}mm" height="{h}mm" viewBox="0 0 {w} {h}">\n'.format(
+            w=_num(width), h=_num(height)
+        )
+    )
+
+    symbols = 0
+    out.write("<defs>\n")
+    for set_index, instances in enumerate(instance_sets):
+        glyph_deflection = deflection or instances.size * 0.01
+        if instances.filled:
+            style = 'fill="black" fill-rule="evenodd" stroke="none"'
+        else:
+            style = 'fill="none" stroke="black" stroke-width="{}"'.format(_num(instances.size * 0.02))
+        for char in instances.glyphs:
+            out.write(
+                '<path id="{}" {} d="{}"/>\n'.format(
+                    _symbol_id(set_index, char),
+                    style,
+                    _path_data(instances.outline(char, glyph_deflection)),
+                )
+            )
+            symbols += 1
+    out.write("</defs>\n")
+
+    uses = 0
+    # Flip Y once for the whole drawing, so glyphs and transforms stay in
+    # FreeCAD's Y-up coordinates
+    out.write(
+        '<g transform="matrix(1 0 0 -1 {} {})">\n'.format(_num(-x_min), _num(y_max))
+    )
+    for set_index, instances in enumerate(instance_sets):
+        plane = plane_matrix(instances.placement)
+        out.write('<g id="{}">\n'.format(instances.name))
+        for _index, char, matrix in instances.occurrences:
+            m = plane.multiply(matrix)
+            out.write(
+                '<use xlink:href="#{}" transform="matrix({} {} {} {} {} {})"/>\n'.format(
+                    _symbol_id(set_index, char),
+                    _num(m.A11), _num(m.A21), _num(m.A12), _num(m.A22), _num(m.A14), _num(m.A24),
+                )
+            )
+            uses += 1
+        out.write("</g>\n")
+    out.write("</g>\n")
+
+    out.write("</svg>\n")
+    return symbols, uses
+
+
+def export_svg(Objects, Path, Deflection=None):
+    """ExportSVG(Objects,Path,[Deflection])
+
+    Writes the given Spaced, Radial, Grid, Path and Multi ShapeStrings to an SVG file,
+    with each distinct glyph defined once in `<defs>` and every character
+    a `<use>` of it. `Deflection` is the outline's maximum deviation from
+    the true curves, in model units; by default 1 % of each object's size.
+    Returns `(symbols, uses)`.
+    """
+    instance_sets = collect_instances(Objects, "ExportSVG")
+    with open(Path, "w", encoding="utf-8") as out:
+        symbols, uses = write_svg(out, instance_sets, Deflection)
+    App.Console.PrintMessage(
+        translate("draft", "{}: {} glyph symbols, {} uses").format(Path, symbols, uses) + "\n"
+    )
+    return symbols, uses
+
+
+def export(exportList, filename):
+    """Entry point for FreeCAD's File > Export."""
+    export_svg(exportList, filename)
@@ -0,0 +1,25 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+
+def registerExporters ():
+    App.addExportType(
+        translate("draft", "ShapeStrings DXF, shared glyph blocks") + " (*.dxf)",
+        "freecad.ShapeStrings.Export.DXF",
+    )
+    App.addExportType(
+        translate("draft", "ShapeStrings SVG, shared glyph symbols") + " (*.svg)",
+        "freecad.ShapeStrings.Export.SVG",
+    )
+    App.addExportType(
+        translate("draft", "ShapeStrings STEP, shared glyph instances") + " (*.step *.stp)",
+        "freecad.ShapeStrings.Export.STEP",
+    )
+    App.addExportType(
+        translate("draft", "ShapeStrings mesh, per-glyph tessellation") + " (*.stl *.3mf)",
+        "freecad.ShapeStrings.Export.Mesh",
+    )
@@ -41,7 +41,20 @@ from draftutils.params import get_param
 from draftutils.translate import translate
 from DraftVecUtils import toString
 
+from ..Misc.Commit import commitProperties
+from ..Misc.Estimate import estimate_cost
+from ..Misc.Glyphs import get_glyph_cache
+from ..Misc.Layout import grid_positions
+from ..Misc.Preview import (
+    StringsPreview,
+    outline_string,
+    preview_settings,
+    translate_polylines,
+    working_plane_rotation,
+)
 from ..Misc.Resources import asIcon , asUI
+from ..Misc.Sparse import dense_strings, grid_cells, is_sparse, sparse_cells
+from ..Misc.StringsModel import CellsTableModel
 
 
 # So the resource file doesn't trigger errors from code checkers (flake8)
@@ -61,11 +74,12 @@ class GridShapeStringTaskPanel:
                  column_offset=10.0,
                  row_offset=15.0,
                  use_bounding_box=False,
-                 font=""):
+                 font="",
+                 cells=None):
 
         columns = max(1, int(columns))
 
-        if not strings:
+        if not strings and not cells:
             # Provide a single default editable cell, same spirit as
             # SpacedShapeString's default list entry.
             strings = [translate("draft", "Default")]
@@ -88,9 +102,19 @@ class GridShapeStringTaskPanel:
         self.form.sbHeight.setProperty("rawValue", size)
         self.form.sbHeight.setProperty("unit", unit_length)
 
-        # Columns and the 2D strings table
-        self.form.sbColumns.setValue(columns)
-        self._populateTable(strings, columns)
+        # Columns and the 2D strings table. Only occupied cells are kept;
+        # `cells` (row, col, text) opens the table in sparse mode.
+        self.stringsModel = CellsTableModel(
+            cells if cells else sparse_cells(strings, columns), columns, not cells, self.form
+        )
+        self.form.sbColumns.setValue(self.stringsModel.columns())
+        self.form.cbSparse.setChecked(bool(cells))
+        table = self.form.tableStrings
+        table.setModel(self.stringsModel)
+        table.horizontalHeader().setVisible(False)
+        table.verticalHeader().setVisible(False)
+        # Fixed row heights keep the view from measuring every row up front
+        table.verticalHeader().setSectionResizeMode(QtGui.QHeaderView.Fixed)
 
         # ColumnOffset, RowOffset and UseBoundingBox controls
         self.form.sbColumnOffset.setProperty("rawValue", column_offset)
@@ -154,6 +178,46 @@ class GridShapeStringTaskPanel:
             QtCore.SIGNAL("valueChanged(int)"),
             self.columnsChanged,
         )
+        QtCore.QObject.connect(
+            self.form.pbImportCsv,
+            QtCore.SIGNAL("clicked()"),
+            self.importCsv,
+        )
+        QtCore.QObject.connect(
+            self.form.cbSparse,
+            QtCore.SIGNAL("toggled(bool)"),
+            self.sparseChanged,
+        )
+
+        self.pasteShortcut = QtGui.QShortcut(QtGui.QKeySequence.Paste, self.form.tableStrings)
+        self.pasteShortcut.setContext(QtCore.Qt.WidgetShortcut)
+        QtCore.QObject.connect(
+            self.pasteShortcut,
+            QtCore.SIGNAL("activated()"),
+            self.pasteStrings,
+        )
+
+        self.updateRemoveRowButtonState()
+
+        # Live outline preview: layout changes are debounced, moving the
+        # base point only moves the existing overlay.
+        self.previewSettings = preview_settings()
+        self.previewRotation = working_plane_rotation()
+        self.preview = StringsPreview()
+        for widget, signal in (
+            (self.form.sbHeight, "valueChanged(double)"),
+            (self.form.sbColumns, "valueChanged(int)"),
+            (self.form.sbColumnOffset, "valueChanged(double)"),
+            (self.form.sbRowOffset, "valueChanged(double)"),
+            (self.form.cbUseBoundingBox, "toggled(bool)"),
+        ):
+            QtCore.QObject.connect(widget, QtCore.SIGNAL(signal), self.schedulePreview)
+        for widget in (self.form.sbX, self.form.sbY, self.form.sbZ):
+            QtCore.QObject.connect(widget, QtCore.SIGNAL("valueChanged(double)"), self.previewPlacementChanged)
+        self.stringsModel.dataChanged.connect(self.schedulePreview)
+        self.stringsModel.modelReset.connect(self.schedulePreview)
+        self.stringsModel.rowsInserted.connect(self.schedulePreview)
+        self.stringsModel.rowsRemoved.connect(self.schedulePreview)
 
     def fileSelect(self, fn):
         """Assign the selected file and remember it as default for ShapeStrings."""
@@ -163,6 +227,8 @@ class GridShapeStringTaskPanel:
             self._adv_params = App.ParamGet(ADV_PARAM_GROUP)
         # Store last-used font as mod preference
         self._adv_params.SetString("FontFile", str(fn))
+        if hasattr(self, "preview"):
+            self.schedulePreview()
 
     def resetPoint(self):
         """Reset the selected point."""
@@ -170,84 +236,168 @@ class GridShapeStringTaskPanel:
         origin = App.Vector(0.0, 0.0, 0.0)
         self.setPoint(origin)
 
-    def _populateTable(self, texts, columns):
-        """(Re)build tableStrings as a `columns`-wide grid holding `texts`
-        row-major, padding any remaining cells with empty, editable items."""
-        table = self.form.tableStrings
-        table.blockSignals(True)
-        table.clear()
-        table.horizontalHeader().setVisible(False)
-        table.verticalHeader().setVisible(False)
-        table.setColumnCount(columns)
-        row_count = max(1, -(-len(texts) // columns)) if texts else 1
-        table.setRowCount(row_count)
-
-        for index, text in enumerate(texts):
-            row, col = index // columns, index % columns
-            table.setItem(row, col, QtGui.QTableWidgetItem(text))
-
-        for row in range(table.rowCount()):
-            for col in range(table.columnCount()):
-                if table.item(row, col) is None:
-                    table.setItem(row, col, QtGui.QTableWidgetItem(""))
-
-        table.blockSignals(False)
-
     def columnsChanged(self, new_columns):
-        """Reshape the table when the Columns spin box changes."""
-        new_columns = max(1, int(new_columns))
-        texts = self._collectTableTexts()
-        self._populateTable(texts, new_columns)
+        """Reshape the table when the Columns spin box changes.
 
-    def _collectTableTexts(self):
-        """Flatten tableStrings row-major, one entry per cell (blanks kept)."""
-        table = self.form.tableStrings
-        texts = []
-        for row in range(table.rowCount()):
-            for col in range(table.columnCount()):
-                item = table.item(row, col)
-                texts.append(item.text().strip() if item else "")
-        return texts
+        Row-major cells reflow into the new width, sparse cells stay in
+        their row and column; either way only occupied cells are touched.
+        """
+        self.stringsModel.setColumns(max(1, int(new_columns)))
+        self.updateRemoveRowButtonState()
+
+    def sparseChanged(self, sparse):
+        """Switch the table between row-major and sparse cells."""
+        self.stringsModel.setRowMajor(not sparse)
+        self.form.sbColumns.setValue(self.stringsModel.columns())
 
     def addRow(self):
         """Append a new blank row of cells to tableStrings."""
-        table = self.form.tableStrings
-        row = table.rowCount()
-        table.insertRow(row)
-        for col in range(table.columnCount()):
-            table.setItem(row, col, QtGui.QTableWidgetItem(""))
+        index = self.stringsModel.appendRow()
+        self.form.tableStrings.scrollTo(index)
         self.updateRemoveRowButtonState()
 
     def removeRow(self):
         """Remove the currently selected row from tableStrings, if more than one remains."""
-        table = self.form.tableStrings
-        if table.rowCount() <= 1:
+        model = self.stringsModel
+        if model.rowCount() <= 1:
             return  # Do not allow removing the last remaining row
 
-        row = table.currentRow()
+        row = self.form.tableStrings.currentIndex().row()
         if row < 0:
-            row = table.rowCount() - 1
-        table.removeRow(row)
+            row = model.rowCount() - 1
+        model.removeRow(row)
         self.updateRemoveRowButtonState()
 
     def updateRemoveRowButtonState(self):
         """Enable/disable the Remove Row button depending on the number of rows."""
-        table = self.form.tableStrings
-        self.form.pbRemoveRow.setEnabled(table.rowCount() > 1)
+        self.form.pbRemoveRow.setEnabled(self.stringsModel.rowCount() > 1)
+
+    def pasteStrings(self):
+        """Paste tab-separated clipboard rows into tableStrings at the current cell."""
+        text = QtGui.QApplication.clipboard().text()
+        if not text:
+            return
+        dropped = self.stringsModel.pasteText(text, self.form.tableStrings.currentIndex())
+        if dropped:
+            _msg(translate("draft", "GridShapeString: {} pasted cells fell outside the grid columns and were skipped").format(dropped) + "\n")
+        self.updateRemoveRowButtonState()
+
+    def importCsv(self):
+        """Replace tableStrings with a CSV file, taking its column count from the file."""
+        path, _filter = QtGui.QFileDialog.getOpenFileName(
+            self.form,
+            translate("draft", "Import strings"),
+            "",
+            translate("draft", "CSV files (*.csv *.txt);;All files (*)"),
+        )
+        if not path:
+            return
+        try:
+            self.stringsModel.importCsv(path)
+        except (OSError, UnicodeDecodeError) as e:
+            _err(translate("draft", "GridShapeString: could not import CSV file") + " {}\n".format(e))
+            return
+        self.form.sbColumns.setValue(self.stringsModel.columns())
+        self.updateRemoveRowButtonState()
+
+    def collectCells(self):
+        """Read the non-blank cells of tableStrings as (row, col, text)."""
+        cells = []
+        for row, col, text in self.stringsModel.cells():
+            text = text.strip()
+            if text:
+                cells.append((row, col, text))
+        return cells
 
     def collectStrings(self):
         """Read strings from tableStrings, row-major. Interior blank cells
         are kept (they mark an empty grid position); only a trailing run
         of blanks is trimmed off the end of the list."""
-        texts = self._collectTableTexts()
-        while texts and not texts[-1]:
-            texts.pop()
-        return texts
+        return dense_strings(self.collectCells(), self.collectColumns())
+
+    def collectSparse(self):
+        """Whether the strings are stored as sparse cells."""
+        return self.form.cbSparse.isChecked()
 
     def collectColumns(self):
         """Read the configured column count."""
         return max(1, int(self.form.sbColumns.value()))
 
+    def schedulePreview(self, *_args):
+        """Re-lay out the preview once the current burst of edits settles."""
+        self.preview.schedule(self.previewOutlines)
+
+    def previewPlacementChanged(self, *_args):
+        """Move the preview overlay to the base point in the spin boxes."""
+        try:
+            base = App.Vector(
+                App.Units.Quantity(self.form.sbX.text()).Value,
+                App.Units.Quantity(self.form.sbY.text()).Value,
+                App.Units.Quantity(self.form.sbZ.text()).Value,
+            )
+        except ValueError:
+            return  # Mid-edit text; keep the overlay where it is
+        self.preview.setPlacement(App.Placement(base, self.previewRotation))
+
+    def updateEstimate(self, strings, size):
+        """Show the predicted recompute time for the panel's current values."""
+        settings = self.previewSettings
+        estimate = estimate_cost(
+            self.fileSpec, size, strings, settings["MakeFace"], settings["Fuse"], settings["Tracking"]
+        )
+        self.form.lEstimate.setText(
+            translate("draft", "Estimated recompute: {}").format(estimate.describe())
+        )
+
+    def previewOutlines(self):
+        """Yield the outlines of each cell, laid out like GridShapeString."""
+        settings = self.previewSettings
+        size = App.Units.Quantity(self.form.sbHeight.text()).Value
+        columns = self.stringsModel.columns()
+        column_offset = App.Units.Quantity(self.form.sbColumnOffset.text()).Value
+        row_offset = App.Units.Quantity(self.form.sbRowOffset.text()).Value
+        use_bounding_box = self.form.cbUseBoundingBox.isChecked()
+
+        cells = self.collectCells()
+        self.updateEstimate([text for _row, _col, text in cells], size)
+
+        cache = get_glyph_cache(self.fileSpec, size, settings["Tracking"])
+        measured_cap_height = cache.cap_height()
+        scale = size / measured_cap_height if settings["ScaleToSize"] else 1.0
+        cap_height = size if settings["ScaleToSize"] else measured_cap_height
+
+        # Outline every cell first: with UseBoundingBox the column widths
+        # and row heights depend on all of them.
+        outlined = []
+        for row, col, text in cells:
+            polylines, box = outline_string(
+                cache,
+                text,
+                scale,
+                settings["ObliqueAngle"],
+                settings["Justification"],
+                settings["JustificationReference"],
+                settings["KeepLeftMargin"],
+                cap_height,
+            )
+            if box is not None:
+                outlined.append((row, col, polylines, box))
+            yield None
+
+        if not outlined:
+            return
+
+        col_x, row_y = grid_positions(
+            [(row, col, box.XLength, box.YLength) for row, col, _polylines, box in outlined],
+            columns,
+            outlined[-1][0] + 1,
+            column_offset,
+            row_offset,
+            use_bounding_box,
+        )
+        for row, col, polylines, _box in outlined:
+            yield translate_polylines(polylines, col_x[col], row_y[row])
+
     def action(self, arg):
         """Scene event handler."""
         if arg["Type"] == "SoKeyboardEvent":
@@ -292,6 +442,8 @@ class GridShapeStringTaskPanelCmd(GridShapeStringTaskPanel):
     def __init__(self, sourceCmd):
         super().__init__()
         self.sourceCmd = sourceCmd
+        self.previewPlacementChanged()
+        self.schedulePreview()
 
     def accept(self):
         """Execute when clicking the OK button."""
@@ -306,6 +458,7 @@ class GridShapeStringTaskPanelCmd(GridShapeStringTaskPanel):
 
     def reject(self):
         """Run when clicking the Cancel button."""
+        self.preview.remove()
         Gui.ActiveDocument.resetEdit()
         self.sourceCmd.finish()
         self.platWinDialog("Restore")
@@ -315,13 +468,21 @@ class GridShapeStringTaskPanelCmd(GridShapeStringTaskPanel):
         """Create GridShapeString object in the current document."""
 
         # Strings and grid layout
-        strings = self.collectStrings()
         columns = self.collectColumns()
 
         # Escape each for Python string literal usage
-        string_list_expr = "[" + ", ".join(
-            ['"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"' for s in strings]
-        ) + "]"
+        def literal(text):
+            return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+        if self.collectSparse():
+            # Only the occupied cells go into the command
+            string_list_expr = "[]"
+            cells_arg = ", Cells=[" + ", ".join(
+                "({}, {}, {})".format(row, col, literal(text)) for row, col, text in self.collectCells()
+            ) + "]"
+        else:
+            string_list_expr = "[" + ", ".join(literal(text) for text in self.collectStrings()) + "]"
+            cells_arg = ""
 
         # Font file
         FFile = '"' + str(self.fileSpec) + '"'
@@ -349,7 +510,7 @@ class GridShapeStringTaskPanelCmd(GridShapeStringTaskPanel):
                     f"Strings={string_list_expr}, "
                     f"FontFile={FFile}, Size={Size}, Columns={columns}, "
                     f"ColumnOffset={ColumnOffset}, RowOffset={RowOffset}, "
-                    f"UseBoundingBox={UseBoundingBox})"
+                    f"UseBoundingBox={UseBoundingBox}{cells_arg})"
                 ),
                 "plm = FreeCAD.Placement()",
                 f"plm.Base = {toString(ssBase)}",
@@ -375,18 +536,23 @@ class GridShapeStringTaskPanelEdit(GridShapeStringTaskPanel):
         base = vobj.Object.Placement.Base
         size = vobj.Object.Size.Value
         columns = vobj.Object.Columns
-        strings = list(vobj.Object.Strings)
+        cells = list(grid_cells(vobj.Object)) if is_sparse(vobj.Object) else None
+        strings = [] if cells else list(vobj.Object.Strings)
         column_offset = vobj.Object.ColumnOffset.Value
         row_offset = vobj.Object.RowOffset.Value
         use_bounding_box = bool(getattr(vobj.Object, "UseBoundingBox", False))
         font = vobj.Object.FontFile
 
-        super().__init__(base, size, strings, columns, column_offset, row_offset, use_bounding_box, font)
+        super().__init__(base, size, strings, columns, column_offset, row_offset, use_bounding_box, font, cells)
 
         self.pointPicked = True
         self.vobj = vobj
         self.call = Gui.activeView().addEventCallback("SoEvent", self.action)
 
+        self.previewSettings = preview_settings(vobj.Object)
+        self.previewRotation = vobj.Object.Placement.Rotation
+        self.previewPlacementChanged()
+
         # Bind the numeric fields to their document object properties so the
         # "=" shortcut and "fx" icon open FreeCAD's expression editor.
         Gui.ExpressionBinding(self.form.sbX).bind(vobj.Object, "Placement.Base.x")
@@ -396,6 +562,7 @@ class GridShapeStringTaskPanelEdit(GridShapeStringTaskPanel):
         Gui.ExpressionBinding(self.form.sbColumns).bind(vobj.Object, "Columns")
         Gui.ExpressionBinding(self.form.sbColumnOffset).bind(vobj.Object, "ColumnOffset")
         Gui.ExpressionBinding(self.form.sbRowOffset).bind(vobj.Object, "RowOffset")
+        self.schedulePreview()
 
     def accept(self):
         x = App.Units.Quantity(self.form.sbX.text()).Value
@@ -404,23 +571,35 @@ class GridShapeStringTaskPanelEdit(GridShapeStringTaskPanel):
         base = App.Vector(x, y, z)
 
         size = App.Units.Quantity(self.form.sbHeight.text()).Value
-        strings = self.collectStrings()
         columns = self.collectColumns()
+        if self.collectSparse():
+            cells = self.collectCells()
+            strings = [text for _row, _col, text in cells]
+            string_rows = [row for row, _col, _text in cells]
+            string_columns = [col for _row, col, _text in cells]
+        else:
+            strings = self.collectStrings()
+            string_rows = string_columns = []
         column_offset = App.Units.Quantity(self.form.sbColumnOffset.text()).Value
         row_offset = App.Units.Quantity(self.form.sbRowOffset.text()).Value
         use_bounding_box = bool(self.form.cbUseBoundingBox.isChecked())
         font_file = self.fileSpec
 
-        o = 'FreeCAD.ActiveDocument.getObject("{}")'.format(self.vobj.Object.Name)
-        Gui.doCommand(o + ".Placement.Base=" + toString(base))
-        Gui.doCommand(o + ".Size=" + str(size))
-        Gui.doCommand(o + ".Strings=" + repr(strings))
-        Gui.doCommand(o + ".Columns=" + str(columns))
-        Gui.doCommand(o + ".ColumnOffset=" + str(column_offset))
-        Gui.doCommand(o + ".RowOffset=" + str(row_offset))
-        Gui.doCommand(o + ".UseBoundingBox=" + str(use_bounding_box))
-        Gui.doCommand(o + '.FontFile="' + font_file + '"')
-        Gui.doCommand("FreeCAD.ActiveDocument.recompute()")
+        obj = self.vobj.Object
+        placement = App.Placement(obj.Placement)
+        placement.Base = base
+        commitProperties(obj, {
+            "Placement": placement,
+            "Size": size,
+            "Strings": strings,
+            "StringRows": string_rows,
+            "StringColumns": string_columns,
+            "Columns": columns,
+            "ColumnOffset": column_offset,
+            "RowOffset": row_offset,
+            "UseBoundingBox": use_bounding_box,
+            "FontFile": font_file,
+        }, translate("draft", "Edit Grid ShapeString"))
 
         # Persist font used in edit as Shapestring default
         if not hasattr(self, "_adv_params"):
@@ -431,11 +610,13 @@ class GridShapeStringTaskPanelEdit(GridShapeStringTaskPanel):
         return True
 
     def reject(self):
+        self.preview.remove()
         self.vobj.Document.resetEdit()
         self.platWinDialog("Restore")
         return True
 
     def finish(self):
+        self.preview.remove()
         Gui.activeView().removeEventCallback("SoEvent", self.call)
         Gui.Snapper.off()
         Gui.Control.closeDialog()
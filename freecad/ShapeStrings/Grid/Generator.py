@@ -35,13 +35,20 @@ if App.GuiUp:
     from .View import ViewProviderGridShapeString
 
 
-def make_gridshapestring(Strings, FontFile, Size=100, Columns=3, ColumnOffset=10, RowOffset=15, UseBoundingBox=False):
-    """GridShapeString(Strings,FontFile,[Height],[Columns],[ColumnOffset],[RowOffset],[UseBoundingBox])
+def make_gridshapestring(Strings, FontFile, Size=100, Columns=3, ColumnOffset=10, RowOffset=15, UseBoundingBox=False, Pattern="", Cells=()):
+    """GridShapeString(Strings,FontFile,[Height],[Columns],[ColumnOffset],[RowOffset],[UseBoundingBox],[Pattern],[Cells])
 
     Turns a list of text strings into a single Compound Shape, wrapped onto
     a 2D grid after the given number of columns, using the given font and
     separated by the given column/row offsets (optionally using each
     string's bounding box to size columns/rows instead of a fixed pitch).
+
+    A non-empty `Pattern`, such as "SN-{00001..05000}", generates the
+    strings at recompute time instead; `Strings` can then be empty.
+
+    `Cells`, a list of (row, col, text), stores only the occupied cells of
+    a sparse grid instead of a row-major list with blanks for the gaps;
+    it replaces `Strings`, which can then be empty.
     """
     App.Console.PrintMessage("Creating GridShapeString object...\n")
 
@@ -62,6 +69,13 @@ def make_gridshapestring(Strings, FontFile, Size=100, Columns=3, ColumnOffset=10
     obj.ColumnOffset = ColumnOffset
     obj.RowOffset = RowOffset
     obj.UseBoundingBox = bool(UseBoundingBox)
+    obj.Pattern = Pattern
+
+    if Cells:
+        cells = [(int(row), int(col), str(text)) for row, col, text in Cells]
+        obj.Strings = [text for _row, _col, text in cells]
+        obj.StringRows = [row for row, _col, _text in cells]
+        obj.StringColumns = [col for _row, col, _text in cells]
 
     # Print all object properties to the FreeCAD console
     App.Console.PrintMessage("GridShapeString properties:\n")
@@ -32,7 +32,20 @@ import Part
 from draftutils.translate import translate
 
 from draftobjects.base import DraftObject
+from ..Misc.Background import OVER_BUDGET, PENDING, run_render
+from ..Misc.Dedup import string_cache
+from ..Misc.Estimate import check_budget
+from ..Misc.Extrude import solid_steps
+from ..Misc.Fit import auto_fit
+from ..Misc.Glyphs import get_glyph_cache
+from ..Misc.Layout import grid_positions
+from ..Misc.Nest import is_nesting, nest_offsets
+from ..Misc.Pattern import string_count
+from ..Misc.Sheet import sync_strings
+from ..Misc.Sparse import indexed_cells
 from ..Misc.StringGeometry import build_string_shape, compute_measured_cap_height
+from ..Misc.StringMap import assign_strings, string_compound, string_shape
+from ..Misc.Wrap import cell_lines, is_wrapping, line_offsets, line_pitch
 
 
 class GridShapeString(DraftObject):
@@ -51,6 +64,37 @@ class GridShapeString(DraftObject):
             _tip = translate("App::Property", "List of text strings to render, row-major. A blank entry leaves that grid position empty")
             obj.addProperty("App::PropertyStringList", "Strings", "Draft", _tip)
 
+        if "Pattern" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Generate the strings from a pattern such as SN-{00001..05000} "
+                "or {0..100..10}mm instead of Strings (empty = use Strings)",
+            )
+            obj.addProperty("App::PropertyString", "Pattern", "Draft", _tip)
+
+        if "Spreadsheet" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Spreadsheet whose SpreadsheetRange is copied into Strings on every recompute",
+            )
+            obj.addProperty("App::PropertyLink", "Spreadsheet", "Draft", _tip)
+
+        if "SpreadsheetRange" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Cells of Spreadsheet to read the strings from, row by row, such as A1:A500 "
+                "(empty = use Strings as they are)",
+            )
+            obj.addProperty("App::PropertyString", "SpreadsheetRange", "Draft", _tip)
+
+        if "StringRows" not in properties:
+            _tip = translate("App::Property", "Row of each entry of Strings; when set, Strings only holds the occupied cells (empty = row-major)")
+            obj.addProperty("App::PropertyIntegerList", "StringRows", "Draft", _tip)
+
+        if "StringColumns" not in properties:
+            _tip = translate("App::Property", "Column of each entry of Strings, when StringRows is set")
+            obj.addProperty("App::PropertyIntegerList", "StringColumns", "Draft", _tip)
+
         if "Columns" not in properties:
             _tip = translate("App::Property", "Number of columns before wrapping to a new row")
             obj.addProperty("App::PropertyInteger", "Columns", "Draft", _tip)
@@ -71,6 +115,59 @@ class GridShapeString(DraftObject):
             obj.addProperty("App::PropertyBool", "UseBoundingBox", "Draft", _tip)
             obj.UseBoundingBox = False
 
+        if "CellWidth" not in properties:
+            _tip = translate("App::Property", "Wrap each string onto lines no wider than this, breaking at spaces (0 = no wrapping)")
+            obj.addProperty("App::PropertyLength", "CellWidth", "Draft", _tip)
+            obj.CellWidth = 0.0
+
+        if "CellHeight" not in properties:
+            _tip = translate("App::Property", "Drop wrapped lines that would not fit in this height (0 = keep every line)")
+            obj.addProperty("App::PropertyLength", "CellHeight", "Draft", _tip)
+            obj.CellHeight = 0.0
+
+        if "LineSpacing" not in properties:
+            _tip = translate("App::Property", "Distance between the baselines of wrapped lines, as a multiple of Size")
+            obj.addProperty("App::PropertyFloat", "LineSpacing", "Draft", _tip)
+            obj.LineSpacing = 1.5
+
+        if "LayoutMode" not in properties:
+            _tip = translate("App::Property", "Grid = rows and columns, Nest = pack each string's bounding rectangle onto sheets of stock")
+            obj.addProperty("App::PropertyEnumeration", "LayoutMode", "Draft", _tip)
+            obj.LayoutMode = ["Grid", "Nest"]
+            obj.LayoutMode = "Grid"
+
+        if "SheetWidth" not in properties:
+            _tip = translate("App::Property", "Width of a sheet when LayoutMode is Nest")
+            obj.addProperty("App::PropertyLength", "SheetWidth", "Draft", _tip)
+            obj.SheetWidth = 300.0
+
+        if "SheetHeight" not in properties:
+            _tip = translate("App::Property", "Height of a sheet when LayoutMode is Nest")
+            obj.addProperty("App::PropertyLength", "SheetHeight", "Draft", _tip)
+            obj.SheetHeight = 200.0
+
+        if "SheetMargin" not in properties:
+            _tip = translate("App::Property", "Space kept clear along the edges of each sheet")
+            obj.addProperty("App::PropertyLength", "SheetMargin", "Draft", _tip)
+            obj.SheetMargin = 5.0
+
+        if "SheetSpacing" not in properties:
+            _tip = translate("App::Property", "Gap kept between nested strings")
+            obj.addProperty("App::PropertyLength", "SheetSpacing", "Draft", _tip)
+            obj.SheetSpacing = 2.0
+
+        if "SheetCount" not in properties:
+            _tip = translate("App::Property", "Number of sheets the nested strings use (read-only)")
+            obj.addProperty("App::PropertyInteger", "SheetCount", "Result", _tip)
+            obj.SheetCount = 0
+            obj.setEditorMode("SheetCount", 1)
+
+        if "Utilization" not in properties:
+            _tip = translate("App::Property", "Percentage of the sheets' area covered by nested strings (read-only)")
+            obj.addProperty("App::PropertyFloat", "Utilization", "Result", _tip)
+            obj.Utilization = 0.0
+            obj.setEditorMode("Utilization", 1)
+
         if "FontFile" not in properties:
             _tip = translate("App::Property", "Font file name")
             obj.addProperty("App::PropertyFile", "FontFile", "Draft", _tip)
@@ -79,6 +176,22 @@ class GridShapeString(DraftObject):
             _tip = translate("App::Property", "Height of text")
             obj.addProperty("App::PropertyLength", "Size", "Draft", _tip)
 
+        if "AutoFit" not in properties:
+            _tip = translate("App::Property", "Set Size to the largest that fits: Width = every string within FitWidth, Cell = every string within a ColumnOffset x RowOffset cell")
+            obj.addProperty("App::PropertyEnumeration", "AutoFit", "Draft", _tip)
+            obj.AutoFit = ["Off", "Width", "Cell"]
+            obj.AutoFit = "Off"
+
+        if "FitWidth" not in properties:
+            _tip = translate("App::Property", "Maximum width of each string when AutoFit is Width")
+            obj.addProperty("App::PropertyLength", "FitWidth", "Draft", _tip)
+            obj.FitWidth = 50.0
+
+        if "FitMargin" not in properties:
+            _tip = translate("App::Property", "Space kept clear when fitting, taken off the target width and height")
+            obj.addProperty("App::PropertyLength", "FitMargin", "Draft", _tip)
+            obj.FitMargin = 0.0
+
         if "Justification" not in properties:
             _tip = translate("App::Property", "Horizontal and vertical alignment")
             obj.addProperty("App::PropertyEnumeration", "Justification", "Draft", _tip)
@@ -121,6 +234,61 @@ class GridShapeString(DraftObject):
             obj.addProperty("App::PropertyBool", "Fuse", "Draft", _tip)
             obj.Fuse = False
 
+        if "Height" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Extrude each glyph into a solid of this height (0 = flat faces)",
+            )
+            obj.addProperty("App::PropertyDistance", "Height", "Draft", _tip)
+            obj.Height = 0.0
+
+        if "Taper" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Taper angle of the extruded sides; positive narrows the glyphs towards the top",
+            )
+            obj.addProperty("App::PropertyAngle", "Taper", "Draft", _tip)
+            obj.Taper = 0.0
+
+        if "BackgroundRecompute" not in properties:
+            _tip = translate("App::Property", "Render large string lists in the background, keeping the previous shape until done")
+            obj.addProperty("App::PropertyBool", "BackgroundRecompute", "Draft", _tip)
+            obj.BackgroundRecompute = True
+
+        if "TimeBudget" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Maximum recompute time in seconds; a recompute expected or found "
+                "to take longer is stopped and the previous shape kept (0 = no limit)",
+            )
+            obj.addProperty("App::PropertyFloat", "TimeBudget", "Draft", _tip)
+            obj.TimeBudget = 0.0
+
+        if "StringStarts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first sub-shape of each string in the compound, "
+                "plus the sub-shape count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringStarts", "Result", _tip)
+            obj.setEditorMode("StringStarts", 1)
+
+        if "StringFaces" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first face of each string in the shape, plus the face count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringFaces", "Result", _tip)
+            obj.setEditorMode("StringFaces", 1)
+
+        if "StringEdges" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first edge of each string in the shape, plus the edge count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringEdges", "Result", _tip)
+            obj.setEditorMode("StringEdges", 1)
+
     def onDocumentRestored(self, obj):
         super().onDocumentRestored(obj)
         # Ensure all properties exist after document restoration
@@ -133,26 +301,89 @@ class GridShapeString(DraftObject):
             self.props_changed_clear()
             return
 
-        if obj.Strings and obj.FontFile:
+        sync_strings(obj)
+        count = string_count(obj)
+        if count and obj.FontFile:
             plm = obj.Placement
-            columns = max(1, int(obj.Columns))
-
-            measured_cap_height = compute_measured_cap_height(obj.FontFile, obj.Size, obj.Tracking)
-            justification_cap_height = obj.Size if obj.ScaleToSize else measured_cap_height
-
-            # Render every string once, remembering which grid cell (row,
-            # col) it belongs to. A blank string still consumes a cell -
-            # that's what lets a grid have gaps instead of being a flat
-            # list of only non-empty entries like SpacedShapeString.
-            cells = []
-            max_row = -1
-            for index, string_text in enumerate(obj.Strings):
-                row = index // columns
-                col = index % columns
-                max_row = max(max_row, row)
-
-                shapes = build_string_shape(
-                    string_text,
+
+            auto_fit(obj)
+            estimate, message = check_budget(obj, "GridShapeString")
+            if message:
+                shape = OVER_BUDGET
+                App.Console.PrintError(message + "\n")
+            else:
+                steps = self.render_steps(obj)
+                if obj.Height.Value:
+                    # Extrude the flat render, so only the thickness changes
+                    steps = solid_steps(obj, steps)
+                    estimate = None
+                shape = run_render(obj, steps, count, "GridShapeString", estimate)
+            if shape is PENDING or shape is OVER_BUDGET:
+                # Either rendering continues in the background, or it was
+                # refused or abandoned for the TimeBudget (already
+                # reported); the previous shape stays either way.
+                pass
+            elif shape is not None:
+                assign_strings(obj, shape, count)
+            else:
+                App.Console.PrintWarning(translate("draft", "GridShapeString: strings have no wires") + "\n")
+
+            obj.Placement = plm
+
+        obj.positionBySupport()
+        self.props_changed_clear()
+
+    def render_steps(self, obj):
+        """Render the grid, yielding once per string.
+
+        Returns the finished compound, one sub-compound per string (see
+        `Misc/StringMap.py`), or None if no string produced any geometry.
+        See `Misc/Background.py` for how this is driven.
+        """
+        columns = max(1, int(obj.Columns))
+
+        measured_cap_height = compute_measured_cap_height(obj.FontFile, obj.Size, obj.Tracking)
+        justification_cap_height = obj.Size if obj.ScaleToSize else measured_cap_height
+
+        # Render every string once, remembering which grid cell (row,
+        # col) it belongs to. A blank string still consumes a cell -
+        # that's what lets a grid have gaps instead of being a flat
+        # list of only non-empty entries like SpacedShapeString. Sparse
+        # grids only list their occupied cells, see `Misc/Sparse.py`.
+        cells = []
+        max_row = -1
+        dropped = 0
+        string_shapes = string_cache(self, obj)
+        wrapping = is_wrapping(obj)
+        if wrapping:
+            # Line breaks come from the glyph cache's advances, so only
+            # the final lines are rendered, see `Misc/Wrap.py`
+            cache = get_glyph_cache(obj.FontFile, obj.Size, obj.Tracking)
+            scale = float(obj.Size) / measured_cap_height if obj.ScaleToSize else 1.0
+            pitch = line_pitch(obj)
+        for index, row, col, string_text in indexed_cells(obj):
+            yield
+            max_row = max(max_row, row)
+            columns = max(columns, col + 1)
+
+            if wrapping:
+                lines, cut = cell_lines(
+                    obj, string_text, lambda char: cache.advance(char) * scale, float(justification_cap_height)
+                )
+                if cut:
+                    dropped += 1
+                offsets = line_offsets(len(lines), pitch, obj.Justification)
+            else:
+                lines, offsets = [string_text], [0.0]
+
+            shapes = []
+            for line, offset in zip(lines, offsets):
+                if not line:
+                    continue
+                # Repeated strings are rendered once and copied, see
+                # `Misc/Dedup.py`
+                line_shapes = string_shapes.get(line, lambda: build_string_shape(
+                    line,
                     obj.FontFile,
                     obj.Size,
                     obj.Tracking,
@@ -165,55 +396,56 @@ class GridShapeString(DraftObject):
                     obj.JustificationReference,
                     obj.KeepLeftMargin,
                     justification_cap_height,
-                )
-                if shapes:
-                    bbox = Part.Compound(shapes).optimalBoundingBox()
-                    cells.append((row, col, shapes, bbox))
-
-            if cells:
-                column_offset = float(obj.ColumnOffset)
-                row_offset = float(obj.RowOffset)
-
-                if obj.UseBoundingBox:
-                    col_width = {}
-                    row_height = {}
-                    for row, col, _shapes, bbox in cells:
-                        col_width[col] = max(col_width.get(col, 0.0), bbox.XLength)
-                        row_height[row] = max(row_height.get(row, 0.0), bbox.YLength)
-
-                    col_x = {}
-                    cursor = 0.0
-                    for col in range(columns):
-                        col_x[col] = cursor
-                        cursor += col_width.get(col, 0.0) + column_offset
-
-                    row_y = {}
-                    cursor = 0.0
-                    for row in range(max_row + 1):
-                        row_y[row] = cursor
-                        cursor -= row_height.get(row, 0.0) + row_offset
-                else:
-                    col_x = {col: col * column_offset for col in range(columns)}
-                    # Row 0 is the first entry in Strings and sits at the
-                    # insertion point; later rows step in -Y so the grid
-                    # reads top-to-bottom like the Strings list itself.
-                    row_y = {row: -row * row_offset for row in range(max_row + 1)}
-
-                all_shapes = []
-                for row, col, shapes, _bbox in cells:
-                    offset_vec = App.Vector(col_x[col], row_y[row], 0)
-                    for shape in shapes:
-                        shape.translate(offset_vec)
-                    all_shapes.extend(shapes)
-
-                obj.Shape = Part.Compound(all_shapes)
-            else:
-                App.Console.PrintWarning(translate("draft", "GridShapeString: strings have no wires") + "\n")
-
-            obj.Placement = plm
-
-        obj.positionBySupport()
-        self.props_changed_clear()
+                ))
+                if offset:
+                    for shape in line_shapes:
+                        shape.translate(App.Vector(0, offset, 0))
+                shapes.extend(line_shapes)
+            if shapes:
+                bbox = Part.Compound(shapes).optimalBoundingBox()
+                cells.append((index, row, col, shapes, bbox))
+
+        string_shapes.report("GridShapeString")
+        if dropped:
+            App.Console.PrintWarning(
+                translate("draft", "GridShapeString: {} strings do not fit CellHeight and were cut short").format(dropped)
+                + "\n"
+            )
+
+        if not cells:
+            return None
+
+        parts = {}
+        if is_nesting(obj):
+            offsets = nest_offsets(obj, [bbox for _index, _row, _col, _shapes, bbox in cells])
+            for (index, _row, _col, shapes, _bbox), offset_vec in zip(cells, offsets):
+                if offset_vec is None:
+                    continue
+                for shape in shapes:
+                    shape.translate(offset_vec)
+                parts[index] = shapes
+            return string_compound(parts)
+
+        col_x, row_y = grid_positions(
+            [(row, col, bbox.XLength, bbox.YLength) for _index, row, col, _shapes, bbox in cells],
+            columns,
+            max_row + 1,
+            float(obj.ColumnOffset),
+            float(obj.RowOffset),
+            obj.UseBoundingBox,
+        )
+
+        for index, row, col, shapes, _bbox in cells:
+            offset_vec = App.Vector(col_x[col], row_y[row], 0)
+            for shape in shapes:
+                shape.translate(offset_vec)
+            parts[index] = shapes
+
+        return string_compound(parts)
 
     def onChanged(self, obj, prop):
         self.props_changed_store(prop)
+
+    def getStringShape(self, obj, index):
+        """Shapes of string `index`, without recomputing; see `Misc/StringMap.py`."""
+        return string_shape(obj, index)
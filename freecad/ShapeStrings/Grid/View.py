@@ -28,6 +28,7 @@
 import FreeCADGui as Gui
 
 from draftviewproviders.view_base import ViewProviderDraft
+from ..Misc.Commit import isCommitting
 from ..Misc.Resources import asIcon
 from .Dialog import GridShapeStringTaskPanelEdit
 
@@ -40,13 +41,33 @@ class ViewProviderGridShapeString(ViewProviderDraft):
         return asIcon('Grid')
 
     def updateData(self, obj, prop):
+        if isCommitting(obj):
+            # A batched edit recomputes once when it is done
+            return
+
         if (prop == "Strings" or
+            prop == "Pattern" or
+            prop == "Spreadsheet" or
+            prop == "SpreadsheetRange" or
+            prop == "StringRows" or
+            prop == "StringColumns" or
             prop == "FontFile" or
             prop == "Size" or
+            prop == "AutoFit" or
+            prop == "FitWidth" or
+            prop == "FitMargin" or
             prop == "Columns" or
             prop == "ColumnOffset" or
             prop == "RowOffset" or
-            prop == "UseBoundingBox"):
+            prop == "UseBoundingBox" or
+            prop == "CellWidth" or
+            prop == "CellHeight" or
+            prop == "LineSpacing" or
+            prop == "LayoutMode" or
+            prop == "SheetWidth" or
+            prop == "SheetHeight" or
+            prop == "SheetMargin" or
+            prop == "SheetSpacing"):
             obj.recompute()
 
         return
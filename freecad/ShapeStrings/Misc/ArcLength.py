@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Arc-length lookup along a path, for text placed along edges.
+
+Finding where a glyph goes on a curve by projecting onto it, or by asking
+the edge for the parameter at a given length, costs a geometric solve per
+glyph - thousands of them for a long bezel text. `ArcLengthTable` instead
+discretises the path once per recompute into points with their cumulative
+length; a glyph's position is then a binary search and a linear
+interpolation, and its direction the chord across a short window around
+it. The window is the length of the polyline segment the glyph falls on,
+so it stays short where the discretisation is dense - on a tight arc next
+to a long straight edge, say - and a glyph there follows the arc. It is
+capped at a fraction of the glyph size, so a glyph near the end of a long
+straight segment does not take its direction from the curve beyond it.
+
+The path is flattened into the text's plane: its points are taken in the
+ShapeString's local coordinates and their Z dropped.
+"""
+
+import bisect
+import math
+
+import Part
+
+
+class ArcLengthTable:
+    """Points along a polyline path, indexed by their distance from its start."""
+
+    def __init__(self, points, closed=False, window=None):
+        self.points = points
+        self.closed = closed
+        # Longest window a direction is taken across, None for no limit
+        self.window = window
+        self.lengths = [0.0]
+        for (ax, ay), (bx, by) in zip(points, points[1:]):
+            self.lengths.append(self.lengths[-1] + math.hypot(bx - ax, by - ay))
+        self.length = self.lengths[-1]
+
+    def _wrap(self, s):
+        if self.closed and self.length > 0:
+            return s % self.length
+        return s
+
+    def _segment(self, s):
+        index = bisect.bisect_right(self.lengths, s) - 1
+        return min(max(index, 0), len(self.points) - 2)
+
+    def point(self, s):
+        """(x, y) at distance `s` along the path.
+
+        A closed path wraps around; an open one continues straight past
+        its ends.
+        """
+        points = self.points
+        lengths = self.lengths
+        s = self._wrap(s)
+        index = self._segment(s)
+        (ax, ay), (bx, by) = points[index], points[index + 1]
+        span = lengths[index + 1] - lengths[index]
+        t = (s - lengths[index]) / span if span > 0 else 0.0
+        return ax + (bx - ax) * t, ay + (by - ay) * t
+
+    def locate(self, s):
+        """(x, y, direction in degrees) at distance `s` along the path.
+
+        The direction is the chord from one segment length before `s` to
+        one after it, the segment being the one `s` falls on, or across the
+        table's `window` if that is shorter.
+        """
+        x, y = self.point(s)
+        index = self._segment(self._wrap(s))
+        window = self.lengths[index + 1] - self.lengths[index]
+        if self.window is not None:
+            window = min(window, self.window)
+        ax, ay = self.point(s - window)
+        bx, by = self.point(s + window)
+        return x, y, math.degrees(math.atan2(by - ay, bx - ax))
+
+
+def link_shape(link):
+    """Shape referenced by an App::PropertyLinkSub value, or None.
+
+    With sub-elements (e.g. "Edge3") only those are used, joined in a
+    compound; otherwise the whole shape of the linked object.
+    """
+    if not link:
+        return None
+    obj, subnames = link
+    if obj is None or not hasattr(obj, "Shape"):
+        return None
+    subnames = [name for name in subnames if name]
+    if not subnames:
+        return obj.Shape
+    return Part.Compound([obj.Shape.getElement(name) for name in subnames])
+
+
+def path_table(shape, placement, deflection, reverse=False, window=None):
+    """`ArcLengthTable` of the first wire of `shape`, or None.
+
+    Loose edges are joined into wires first. The points are brought into
+    the local coordinates of `placement` and spaced so the polyline is
+    within `deflection` of the curve; `reverse` runs the table from the
+    wire's end to its start. `window` caps the span directions are taken
+    across.
+    """
+    if shape is None or shape.isNull() or not shape.Edges:
+        return None
+    wires = shape.Wires
+    if not wires:
+        wires = [Part.Wire(edges) for edges in Part.sortEdges(shape.Edges)]
+    if not wires:
+        return None
+    wire = wires[0]
+
+    inverse = placement.inverse()
+    points = []
+    for point in wire.discretize(Deflection=deflection):
+        local = inverse.multVec(point)
+        if not points or (local.x, local.y) != points[-1]:
+            points.append((local.x, local.y))
+    if len(points) < 2:
+        return None
+    if reverse:
+        points.reverse()
+    return ArcLengthTable(points, wire.isClosed(), window)
@@ -0,0 +1,308 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Render large ShapeStrings without blocking the GUI.
+
+Each object renders its strings through a generator that yields once per
+string (its `render_steps()`). For small lists that generator is simply
+run to the end inside `execute()`. For large ones, with the GUI up,
+`run_render` instead hands it to a `RenderJob` that advances it in short
+time slices on the event loop, shows per-string progress in the status bar
+and can be cancelled from there. The object keeps its previous shape while
+the job runs.
+
+OpenCASCADE shapes and document objects must stay on the GUI thread, which
+is why the job is cooperative rather than a worker thread.
+
+When a job finishes, its shape is parked together with a snapshot of the
+inputs it was built from and the object alone is recomputed once more -
+not its whole document, which a timer callback must not start. That
+`execute()` picks the parked shape up with `run_render` and assigns it;
+the objects depending on it are touched, and update with the document's
+next normal recompute. If the inputs changed in the meantime the parked
+shape is discarded - the change will already have started a newer job.
+
+An object with a `TimeBudget` is also held to it while rendering: a render
+that runs past the budget, synchronous or not, is abandoned with a message
+rather than left to hang the session.
+"""
+
+import time
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from .Estimate import calibrate
+
+
+PARAM_GROUP = "User parameter:BaseApp/Preferences/Mod/ShapeStrings"
+
+# Strings in a list before it is rendered in the background by default
+DEFAULT_THRESHOLD = 200
+
+# Work done per event loop turn (s)
+TIME_SLICE = 0.05
+
+# Returned by `run_render` when the render continues in the background
+PENDING = object()
+
+# Returned by `run_render` when the render ran past the object's TimeBudget
+OVER_BUDGET = object()
+
+_jobs = {}
+_finished = {}
+_status = None
+
+
+def _key(obj):
+    return (obj.Document.Name, obj.Name)
+
+
+def _lookup(key):
+    try:
+        return App.getDocument(key[0]).getObject(key[1])
+    except NameError:
+        return None
+
+
+def render_signature(obj):
+    """Snapshot of the rendering inputs: every property in the Draft group."""
+    values = []
+    for name in obj.PropertiesList:
+        if obj.getGroupOfProperty(name) != "Draft":
+            continue
+        value = getattr(obj, name)
+        if isinstance(value, list):
+            value = tuple(value)
+        values.append((name, value))
+    return tuple(values)
+
+
+def background_threshold():
+    """Number of strings from which a render goes to the background."""
+    return App.ParamGet(PARAM_GROUP).GetInt("BackgroundThreshold", DEFAULT_THRESHOLD)
+
+
+def time_budget(obj):
+    """The object's `TimeBudget` in seconds, 0 for none."""
+    return max(0.0, float(getattr(obj, "TimeBudget", 0.0)))
+
+
+def run_steps(steps, budget=0.0):
+    """Drain a render generator synchronously and return its result.
+
+    With a `budget` (s), the render is abandoned as soon as it has run
+    longer than that, and `OVER_BUDGET` is returned.
+    """
+    start = time.perf_counter()
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+        if budget and time.perf_counter() - start > budget:
+            steps.close()
+            return OVER_BUDGET
+
+
+def _report_over_budget(label, budget):
+    App.Console.PrintError(
+        translate(
+            "draft",
+            "{}: recompute stopped after exceeding TimeBudget ({:.1f} s), "
+            "the previous shape is kept.",
+        ).format(label, budget) + "\n"
+    )
+
+
+def run_render(obj, steps, count, label, estimate=None):
+    """Render `obj` now, or start a background job for it.
+
+    `steps` is the object's render generator and `count` the number of
+    steps it will yield. Returns the rendered shape (or None if nothing
+    could be rendered), `PENDING` when a background job was started, or
+    `OVER_BUDGET` when the render was abandoned (the message is already
+    printed). `estimate`, the render's `CostEstimate`, is used to calibrate
+    future estimates against the time actually taken.
+    """
+    key = _key(obj)
+
+    finished = _finished.pop(key, None)
+    if finished is not None and finished[0] == render_signature(obj):
+        return finished[1]
+
+    if (App.GuiUp
+            and getattr(obj, "BackgroundRecompute", False)
+            and count >= background_threshold()):
+        cancel_job(obj)
+        job = RenderJob(obj, steps, count, label, estimate)
+        _jobs[key] = job
+        job.start()
+        return PENDING
+
+    cancel_job(obj)
+    budget = time_budget(obj)
+    start = time.perf_counter()
+    shape = run_steps(steps, budget)
+    if shape is OVER_BUDGET:
+        _report_over_budget(label, budget)
+    else:
+        calibrate(estimate, time.perf_counter() - start)
+    return shape
+
+
+def cancel_job(obj):
+    """Stop the background job of `obj`, if any; its shape is left as is."""
+    job = _jobs.pop(_key(obj), None)
+    if job:
+        job.stop()
+        _update_status()
+
+
+def cancel_all():
+    """Stop every background job."""
+    for key in list(_jobs):
+        obj = _lookup(key)
+        job = _jobs.pop(key)
+        job.stop()
+        if obj:
+            # The shape on display is stale; let the next recompute redo it
+            obj.touch()
+            App.Console.PrintMessage(
+                translate("draft", "{}: recompute cancelled, previous shape kept").format(job.label) + "\n"
+            )
+    _update_status()
+
+
+def is_running(obj):
+    """Whether `obj` has a background job in progress."""
+    return _key(obj) in _jobs
+
+
+class RenderJob:
+    """One object's render generator, advanced in time slices."""
+
+    def __init__(self, obj, steps, count, label, estimate=None):
+        import PySide.QtCore as QtCore
+
+        self.key = _key(obj)
+        self.signature = render_signature(obj)
+        self.steps = steps
+        self.count = max(1, count)
+        self.done = 0
+        self.label = label
+        self.estimate = estimate
+        self.budget = time_budget(obj)
+        # Time spent rendering, not counting the event loop in between
+        self.busy = 0.0
+
+        self.timer = QtCore.QTimer()
+        self.timer.setInterval(0)
+        QtCore.QObject.connect(self.timer, QtCore.SIGNAL("timeout()"), self._advance)
+
+    def start(self):
+        self.timer.start()
+        _update_status()
+
+    def stop(self):
+        self.timer.stop()
+        self.steps = None
+
+    def _advance(self):
+        start = time.perf_counter()
+        deadline = start + TIME_SLICE
+        try:
+            while time.perf_counter() < deadline:
+                next(self.steps)
+                self.done += 1
+        except StopIteration as stop:
+            self.busy += time.perf_counter() - start
+            self._finish(stop.value)
+            return
+        except Exception as e:
+            self._abandon()
+            App.Console.PrintError("{}: {}\n".format(self.label, e))
+            return
+        self.busy += time.perf_counter() - start
+        if self.budget and self.busy > self.budget:
+            self._abandon()
+            _report_over_budget(self.label, self.budget)
+            return
+        _update_status()
+
+    def _abandon(self):
+        self.stop()
+        if _jobs.get(self.key) is self:
+            del _jobs[self.key]
+        _update_status()
+
+    def _finish(self, shape):
+        calibrate(self.estimate, self.busy)
+        self.stop()
+        if _jobs.get(self.key) is self:
+            del _jobs[self.key]
+        _update_status()
+
+        obj = _lookup(self.key)
+        if obj is None or render_signature(obj) != self.signature:
+            return
+
+        _finished[self.key] = (self.signature, shape)
+        obj.recompute()
+        for dependent in obj.InList:
+            dependent.touch()
+
+
+def _update_status():
+    """Show the combined progress of all running jobs in the status bar."""
+    global _status
+    if not App.GuiUp:
+        return
+    if _status is None:
+        if not _jobs:
+            return
+        _status = _StatusWidget()
+    _status.refresh(list(_jobs.values()))
+
+
+class _StatusWidget:
+    """Progress bar and Cancel button living in the main window's status bar."""
+
+    def __init__(self):
+        import FreeCADGui as Gui
+        import PySide.QtCore as QtCore
+        import PySide.QtGui as QtGui
+
+        self.status_bar = Gui.getMainWindow().statusBar()
+        self.progress = QtGui.QProgressBar()
+        self.progress.setMaximumWidth(200)
+        self.cancel = QtGui.QPushButton(translate("draft", "Cancel"))
+        self.cancel.setToolTip(translate("draft", "Stop rendering ShapeStrings in the background"))
+        QtCore.QObject.connect(self.cancel, QtCore.SIGNAL("clicked()"), cancel_all)
+        self.visible = False
+
+    def refresh(self, jobs):
+        if not jobs:
+            if self.visible:
+                self.status_bar.removeWidget(self.progress)
+                self.status_bar.removeWidget(self.cancel)
+                self.status_bar.clearMessage()
+                self.visible = False
+            return
+
+        if not self.visible:
+            self.status_bar.addPermanentWidget(self.progress)
+            self.status_bar.addPermanentWidget(self.cancel)
+            self.progress.show()
+            self.cancel.show()
+            self.visible = True
+
+        done = sum(job.done for job in jobs)
+        total = sum(job.count for job in jobs)
+        self.progress.setMaximum(total)
+        self.progress.setValue(min(done, total))
+        labels = ", ".join(sorted({job.label for job in jobs}))
+        self.status_bar.showMessage(
+            translate("draft", "Rendering {}: {} / {} strings").format(labels, done, total)
+        )
@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Apply a task panel's edits to a document object in one undoable step.
+
+The edit panels used to push every property through its own
+`Gui.doCommand` string, with `Strings` spelled out via `repr()`. For a
+large list that meant generating, echoing and re-parsing the whole list as
+Python source, plus one change notification per property. `commitProperties`
+assigns the values directly inside a single transaction, skips any
+property whose value did not change, and recomputes once at the end rather
+than after every assignment.
+"""
+
+import FreeCAD as App
+
+
+# Objects currently being written by `commitProperties`, as
+# (document name, object name). View providers consult this to skip their
+# per-property eager recompute while a batch is in flight.
+_committing = set()
+
+
+def isCommitting(obj):
+    """Whether `obj` is in the middle of a `commitProperties` batch."""
+    return (obj.Document.Name, obj.Name) in _committing
+
+
+def assignQuietly(obj, name, value):
+    """Set a property from inside `obj`'s own `execute()`.
+
+    The view provider would otherwise answer the change with an eager
+    recompute of the object already being recomputed.
+    """
+    key = (obj.Document.Name, obj.Name)
+    _committing.add(key)
+    try:
+        setattr(obj, name, value)
+    finally:
+        _committing.discard(key)
+
+
+def _unchanged(current, value):
+    """Whether assigning `value` over `current` would be a no-op."""
+    if isinstance(current, App.Placement):
+        return current.isSame(value, 1e-12)
+    if isinstance(current, App.Units.Quantity):
+        return current.Value == float(value)
+    return current == value
+
+
+def commitProperties(obj, values, label):
+    """Set `values` (property name -> value) on `obj` as one transaction.
+
+    Properties whose value is already current are not touched, so they
+    raise no change notification. The document is recomputed inside the
+    same transaction, so a single undo restores the previous state.
+    Returns the names of the properties that were changed.
+    """
+    changed = {}
+    for name, value in values.items():
+        if not _unchanged(getattr(obj, name), value):
+            changed[name] = value
+
+    if not changed:
+        return []
+
+    doc = obj.Document
+    key = (doc.Name, obj.Name)
+    doc.openTransaction(label)
+    _committing.add(key)
+    try:
+        for name, value in changed.items():
+            setattr(obj, name, value)
+    except Exception:
+        _committing.discard(key)
+        doc.abortTransaction()
+        raise
+    _committing.discard(key)
+    try:
+        doc.recompute()
+    finally:
+        doc.commitTransaction()
+
+    App.Console.PrintLog("{}: {} ({})\n".format(label, obj.Name, ", ".join(changed)))
+    return list(changed)
@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Render each distinct string once per recompute.
+
+Label sets repeat themselves: "GND" and "VCC" on every connector of a
+panel, "M6" on every hole. Each occurrence used to run the whole string
+pipeline again - `makeWireString`, face making, scale, shear and
+justification - for the same geometry. Within one recompute every string
+shares the object's render settings, so a string's shapes only depend on
+its text (and, on Radial rings, its size). `StringShapes` renders a text
+the first time it is asked for and hands out placed copies afterwards:
+the copies share the rendered geometry and only carry their own location,
+so the layout can translate or turn them without touching the original.
+
+The rendered strings are also kept between recomputes, on the object's
+proxy (see `string_cache`), for as long as the settings they were
+rendered with stay the same. Editing one string, or one cell of a bound
+spreadsheet range (see `Misc/Sheet.py`), then renders just that string
+again; the others are only laid out anew. Strings a recompute no longer
+uses are dropped at its end.
+
+`estimate_cost` (see `Misc/Estimate.py`) counts the distinct strings the
+same way, and each recompute logs how many strings it actually rendered.
+"""
+
+import FreeCAD as App
+
+
+# Properties a rendered string depends on, besides its text and size
+RENDER_PROPERTIES = (
+    "FontFile", "Size", "Tracking", "MakeFace", "Fuse", "ScaleToSize", "ObliqueAngle",
+    "Justification", "JustificationReference", "KeepLeftMargin",
+)
+
+
+def render_settings(obj):
+    """Snapshot of the properties every string of `obj` is rendered with."""
+    return tuple(getattr(obj, name, None) for name in RENDER_PROPERTIES)
+
+
+class StringShapes:
+    """Rendered strings, keyed by text and size.
+
+    `strings` counts the lookups and `rendered` the distinct strings that
+    were actually rendered since `begin()`; `settings` is what they were
+    rendered with.
+    """
+
+    def __init__(self, settings=None):
+        self._shapes = {}
+        self._used = set()
+        self.settings = settings
+        self.strings = 0
+        self.rendered = 0
+
+    def begin(self):
+        """Start counting, and tracking the strings used, for a new recompute."""
+        self._used = set()
+        self.strings = 0
+        self.rendered = 0
+
+    def get(self, key, render):
+        """Fresh copies of the shapes of string `key`.
+
+        `render()` builds the shapes, a list, the first time `key` is
+        asked for; strings that render nothing give an empty list.
+        """
+        self.strings += 1
+        self._used.add(key)
+        shapes = self._shapes.get(key)
+        if shapes is None:
+            self.rendered += 1
+            shapes = self._shapes[key] = render() or []
+        return [shape.moved(App.Placement()) for shape in shapes]
+
+    def ratio(self):
+        """Strings per rendered string: how much rendering was saved."""
+        return self.strings / self.rendered if self.rendered else 1.0
+
+    def report(self, label):
+        """Drop the strings this recompute did not use, and log how many
+        strings were rendered, for diagnostics.
+        """
+        for key in [key for key in self._shapes if key not in self._used]:
+            del self._shapes[key]
+        App.Console.PrintLog(
+            "{}: rendered {} distinct of {} strings (dedup ratio {:.2f})\n".format(
+                label, self.rendered, self.strings, self.ratio()
+            )
+        )
+
+
+def string_cache(proxy, obj):
+    """The `StringShapes` kept on `proxy` for `obj`'s next render.
+
+    Kept on the proxy only, so it starts empty in every session, and
+    emptied when `obj`'s render settings change.
+    """
+    settings = render_settings(obj)
+    cache = getattr(proxy, "_string_cache", None)
+    if cache is None or cache.settings != settings:
+        cache = proxy._string_cache = StringShapes(settings)
+    cache.begin()
+    return cache
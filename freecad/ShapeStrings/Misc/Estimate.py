@@ -0,0 +1,274 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Predict how long a ShapeString will take to recompute.
+
+Recompute time is dominated by OpenCASCADE work that grows with the number
+of edges in the rendered glyphs: building the wires, making faces from them
+and, above all, fusing them. Ticking `Fuse` on a long list can take minutes,
+and nothing used to warn about it beforehand.
+
+`estimate_cost` counts the strings and glyphs of a list, looks up each
+distinct character's edge count in the font's `GlyphCache` (so a font is
+only ever measured once per character) and turns those counts into seconds
+with a simple linear model:
+
+- every string costs a fixed overhead,
+- every edge costs a little to render, and more to fill when `MakeFace`
+  is on,
+- with `Fuse`, each string costs its edge count times its glyph count,
+  since every glyph is fused against the rest of its string.
+
+A string that repeats an earlier one only costs the fixed overhead: the
+objects render each distinct string once and copy it (see
+`Misc/Dedup.py`). `distinct` and `dedup_ratio` report how much that saves.
+
+Radial rings and Multi groups are estimated one by one, each at its own
+size, and the estimates added up. Only a string-by-string render fits the
+model, so the `TimeBudget` is not checked beforehand for objects that
+place cached glyphs instead - curved Radial text, Path and Multi
+ShapeStrings (see `Misc/Instances.py`); a render of theirs that runs past
+the budget is still stopped (see `Misc/Background.py`).
+
+The coefficients are rough; each completed recompute of an object with a
+`TimeBudget` nudges a correction factor, kept in the preferences, towards
+the measured time so the estimates adapt to the machine they run on. Only
+the string-by-string render the model describes is timed for that:
+instanced glyphs and solids cost differently per string.
+"""
+
+import math
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from draftutils import utils
+
+from .Glyphs import get_glyph_cache
+from .Groups import object_groups
+from .Pattern import object_strings
+from .Rings import is_curved, object_rings
+
+
+PARAM_GROUP = "User parameter:BaseApp/Preferences/Mod/ShapeStrings"
+
+# Model coefficients (s)
+STRING_COST = 2e-4
+EDGE_COST = 2e-5
+FACE_EDGE_COST = 6e-5
+FUSE_EDGE_COST = 1e-4
+
+# Weight of a new measurement in the running correction factor
+CALIBRATION_WEIGHT = 0.2
+
+# Measurements shorter than this are mostly noise (s)
+CALIBRATION_MINIMUM = 0.05
+
+
+class CostEstimate:
+    """Predicted recompute cost of one list of strings.
+
+    `seconds` is the prediction; the counts it was made from are kept
+    alongside so callers can explain or re-weigh it.
+    """
+
+    def __init__(self, strings=0, glyphs=0, edges=0, make_face=True, fuse=False, seconds=0.0, distinct=None):
+        self.strings = strings
+        self.distinct = strings if distinct is None else distinct
+        self.glyphs = glyphs
+        self.edges = edges
+        self.make_face = make_face
+        self.fuse = fuse
+        self.seconds = seconds
+
+    @property
+    def dedup_ratio(self):
+        """Strings per distinct string, 1.0 when nothing repeats."""
+        return self.strings / self.distinct if self.distinct else 1.0
+
+    def __repr__(self):
+        return (
+            "CostEstimate(strings={}, distinct={}, glyphs={}, edges={}, make_face={}, fuse={}, seconds={:.3f})"
+        ).format(self.strings, self.distinct, self.glyphs, self.edges, self.make_face, self.fuse, self.seconds)
+
+    def describe(self):
+        """One line summary for task panels and messages."""
+        if self.distinct < self.strings:
+            return translate(
+                "draft", "{} strings ({} distinct), {} glyphs, {} edges: about {}"
+            ).format(self.strings, self.distinct, self.glyphs, self.edges, format_seconds(self.seconds))
+        return translate(
+            "draft", "{} strings, {} glyphs, {} edges: about {}"
+        ).format(self.strings, self.glyphs, self.edges, format_seconds(self.seconds))
+
+
+def format_seconds(seconds):
+    """Short human readable duration."""
+    if seconds < 1.0:
+        return translate("draft", "< 1 s")
+    if seconds < 120.0:
+        return translate("draft", "{:.0f} s").format(seconds)
+    return translate("draft", "{:.0f} min").format(seconds / 60.0)
+
+
+def correction():
+    """Current machine correction factor applied to the model."""
+    return App.ParamGet(PARAM_GROUP).GetFloat("EstimateCorrection", 1.0) or 1.0
+
+
+def calibrate(estimate, seconds):
+    """Fold a measured recompute time into the correction factor.
+
+    Only times of the `render_steps` path, one `makeWireString` per
+    string, fit the model; instanced and solid renders are not passed in.
+    """
+    if estimate is None or estimate.seconds <= 0.0 or seconds < CALIBRATION_MINIMUM:
+        return
+    params = App.ParamGet(PARAM_GROUP)
+    current = correction()
+    ratio = seconds / (estimate.seconds / current)
+    # Average in log space so over- and underestimates pull equally hard
+    updated = math.exp(
+        (1.0 - CALIBRATION_WEIGHT) * math.log(current) + CALIBRATION_WEIGHT * math.log(ratio)
+    )
+    params.SetFloat("EstimateCorrection", min(max(updated, 0.01), 100.0))
+
+
+def estimate_cost(font_file, size, strings, make_face=True, fuse=False, tracking=0.0):
+    """Predict the recompute time of rendering `strings`.
+
+    Returns a `CostEstimate`. Whitespace counts towards glyphs but has no
+    edges, so it adds next to nothing; repeated strings only add their
+    fixed overhead. Characters are measured through the
+    shared `GlyphCache`, so repeated estimates with the same font are cheap.
+    """
+    cache = get_glyph_cache(font_file, size, tracking)
+    edges_of = {}
+
+    seen = set()
+    total_strings = 0
+    total_glyphs = 0
+    total_edges = 0
+    fuse_weight = 0
+    for text in strings:
+        if not text:
+            continue
+        total_strings += 1
+        total_glyphs += len(text)
+        if text in seen:
+            continue
+        seen.add(text)
+        string_edges = 0
+        string_glyphs = 0
+        for char in text:
+            edges = edges_of.get(char)
+            if edges is None:
+                edges = edges_of[char] = cache.edge_count(char)
+            if edges:
+                string_edges += edges
+                string_glyphs += 1
+        total_edges += string_edges
+        fuse_weight += string_edges * string_glyphs
+
+    seconds = total_strings * STRING_COST + total_edges * EDGE_COST
+    if make_face:
+        seconds += total_edges * FACE_EDGE_COST
+        if fuse:
+            seconds += fuse_weight * FUSE_EDGE_COST
+    seconds *= correction()
+
+    return CostEstimate(
+        total_strings, total_glyphs, total_edges, bool(make_face), bool(fuse), seconds, len(seen)
+    )
+
+
+def combine(estimates):
+    """One `CostEstimate` adding up `estimates`, e.g. of several rings."""
+    total = CostEstimate()
+    for estimate in estimates:
+        total.strings += estimate.strings
+        total.distinct += estimate.distinct
+        total.glyphs += estimate.glyphs
+        total.edges += estimate.edges
+        total.seconds += estimate.seconds
+        total.make_face = estimate.make_face
+        total.fuse = estimate.fuse
+    return total
+
+
+def estimate_object(obj):
+    """`estimate_cost` for a ShapeString object, or None without a font.
+
+    The rings of a RadialShapeString and the groups of a
+    MultiShapeString are estimated at their own sizes.
+    """
+    if not obj.FontFile:
+        return None
+    kind = utils.get_type(obj)
+    if kind == "RadialShapeString":
+        lists = [(ring.size, ring.texts) for ring in object_rings(obj)]
+    elif kind == "MultiShapeString":
+        lists = [(group.size, group.texts) for group in object_groups(obj)]
+    else:
+        lists = [(float(obj.Size), object_strings(obj))]
+    return combine(
+        estimate_cost(
+            obj.FontFile,
+            size,
+            texts,
+            obj.MakeFace,
+            getattr(obj, "Fuse", False),
+            float(obj.Tracking),
+        )
+        for size, texts in lists
+    )
+
+
+def is_modelled(obj):
+    """Whether `obj` renders string by string, as the model assumes."""
+    kind = utils.get_type(obj)
+    if kind == "RadialShapeString":
+        return not is_curved(obj)
+    return kind in ("SpacedShapeString", "GridShapeString")
+
+
+def check_budget(obj, label):
+    """Estimate `obj` and check the estimate against its `TimeBudget`.
+
+    Returns `(estimate, message)`. Without a budget, or for an object
+    the model does not cover (see `is_modelled`), nothing is estimated
+    and both are None. `message` is None when the object fits in its
+    budget; otherwise it explains why the recompute was refused, ready to
+    print.
+    """
+    budget = float(getattr(obj, "TimeBudget", 0.0))
+    if budget <= 0.0 or not is_modelled(obj):
+        # Estimating expands every string; not worth it without a budget
+        return None, None
+    estimate = estimate_object(obj)
+    if estimate is None or estimate.seconds <= budget:
+        return estimate, None
+    hint = ""
+    if estimate.fuse:
+        hint = " " + translate("draft", "Turning off Fuse is usually the largest saving.")
+    message = translate(
+        "draft",
+        "{}: estimated recompute time ({}) exceeds TimeBudget ({:.1f} s), "
+        "the previous shape is kept.",
+    ).format(label, estimate.describe(), budget) + hint
+    return estimate, message
+
+
+def estimate_shapestring(Strings=None, FontFile="", Size=100, MakeFace=True, Fuse=False, Tracking=0.0, Object=None):
+    """Estimate([Strings],[FontFile],[Size],[MakeFace],[Fuse],[Tracking],[Object])
+
+    Predicts how long a ShapeString would take to recompute, without
+    building any geometry, so batch jobs can order or split their work.
+    Pass either an existing ShapeString `Object` or the values a new one
+    would be created with. Returns a `CostEstimate`; its `seconds` is the
+    prediction, and `dedup_ratio` how often strings repeat.
+    """
+    if Object is not None:
+        return estimate_object(Object)
+    return estimate_cost(FontFile, Size, Strings or [], MakeFace, Fuse, Tracking)
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Solid output for ShapeStrings with a `Height`.
+
+Padding a ShapeString with a separate feature extrudes every character's
+faces again, and does so on every change of the text object. With a
+`Height` set, the objects produce solids themselves: the object is
+rendered flat exactly as without a `Height` - kerning, `Fuse` and scaling
+included - and its pieces are extruded, so `Height` only changes the
+thickness. Pieces that share their geometry at different places, the
+copies of a repeated string (see `Misc/Dedup.py`) or of a placed glyph
+(see `Misc/Instances.py`), are extruded once and the solid moved into
+place for each, so a label sheet costs one prism per distinct string or
+glyph rather than one per character.
+
+A `Taper` angle narrows the sides as they rise (negative widens them).
+"""
+
+import math
+
+import FreeCAD as App
+import Part
+
+from draftutils.translate import translate
+
+
+
+def extrude_glyph(shape, height, taper=0.0):
+    """Extrude the faces of a glyph by `height` along Z, tapered by `taper` degrees.
+
+    Returns a shape of solids. A taper the glyph cannot take - one that
+    would close a stroke before the top - falls back to a straight
+    extrusion with a warning.
+    """
+    direction = App.Vector(0, 0, height)
+    if not taper:
+        return shape.extrude(direction)
+
+    inset = abs(height) * math.tan(math.radians(taper))
+    try:
+        solids = []
+        for face in shape.Faces:
+            top = face.makeOffset2D(-inset, 0, False, False, False)
+            top.translate(direction)
+            outer = Part.makeLoft([face.OuterWire, top.Faces[0].OuterWire], True, True)
+            for bottom_hole, top_hole in zip(_holes(face), _holes(top.Faces[0])):
+                outer = outer.cut(Part.makeLoft([bottom_hole, top_hole], True, True))
+            solids.extend(outer.Solids)
+        if not solids:
+            raise ValueError("no solids")
+        return Part.Compound(solids)
+    except Exception:
+        App.Console.PrintWarning(
+            translate("draft", "ShapeString: taper too steep for a glyph, extruded it straight") + "\n"
+        )
+        return shape.extrude(direction)
+
+
+def _holes(face):
+    outer = face.OuterWire
+    return [wire for wire in face.Wires if not wire.isSame(outer)]
+
+
+def solid_steps(obj, flat_steps):
+    """Render `obj` flat with the `flat_steps` generator, then extrude it.
+
+    Yields once per string of the flat render and once per distinct
+    piece extruded. Returns the compound of solids, one sub-compound per
+    string like the flat render's (see `Misc/StringMap.py`), or None if
+    no string has any geometry. Strings that are wires rather than faces
+    cannot be extruded; the flat render is then returned as it is.
+    """
+    flat = yield from flat_steps
+    if flat is None:
+        return None
+    if not flat.Faces:
+        App.Console.PrintWarning(
+            translate("draft", "{}: glyphs are wires and cannot be extruded, Height is ignored").format(
+                obj.Label
+            )
+            + "\n"
+        )
+        return flat
+
+    height = float(obj.Height)
+    taper = float(getattr(obj, "Taper", 0.0))
+    # Extruded pieces by the hash of their unplaced geometry
+    prisms = {}
+    strings = []
+    for string in flat.childShapes():
+        solids = []
+        for piece in string.childShapes():
+            base = piece.located(App.Placement())
+            bucket = prisms.setdefault(base.hashCode(), [])
+            prism = next((prism for known, prism in bucket if known.isSame(base)), None)
+            if prism is None:
+                yield
+                prism = extrude_glyph(base, height, taper)
+                bucket.append((base, prism))
+            placement = piece.Placement
+            solids.extend(solid.moved(placement) for solid in prism.Solids or [prism])
+        strings.append(Part.Compound(solids))
+    return Part.Compound(strings)
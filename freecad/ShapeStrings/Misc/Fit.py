@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Choose `Size` so that every string fits a target, without trial renders.
+
+Finding the largest text that fits a label width, a Grid cell or the arc
+between two Radial positions used to mean changing `Size` and recomputing
+until it looked right. With `AutoFit` set, the objects solve for it
+instead, before rendering:
+
+- `Width` : no string is wider than `FitWidth`,
+- `Cell` (Grid) : every string fits a `ColumnOffset` x `RowOffset` cell,
+- `Arc` (Radial) : every string fits the span between neighbouring
+  positions on its ring - the chord for rigid strings, the arc for
+  `CurvedText` - or, with `Distribution` Even, all of a ring's strings
+  fit its `ArcSpan` together.
+
+`FitMargin` is taken off the target width (and the cell height).
+
+A string's width is the sum of its glyph advances from the glyph cache
+(see `Misc/Glyphs.py`). Advances grow linearly with the size and tracking
+adds a constant per character, so the width at any size follows from one
+measurement and the limit on `Size` is a division per string; the cap
+height is handled the same way. The object then renders once, at the
+result.
+"""
+
+import math
+
+import FreeCAD as App
+
+from draftutils import utils
+from draftutils.translate import translate
+
+from .Commit import assignQuietly
+from .Glyphs import get_glyph_cache
+from .Pattern import object_strings
+from .Rings import is_curved, is_even, object_rings
+
+
+# Fitted sizes are rounded down to this, so recomputes do not drift
+RESOLUTION = 1e-4
+
+
+def _is_scaled(kind, obj):
+    # Grid scales glyphs to a cap height of Size; Spaced and Radial
+    # render unscaled, see `Misc/StringGeometry.py`
+    return kind == "GridShapeString" and obj.ScaleToSize
+
+
+def _slope(cache, text, tracking, size):
+    """Width of `text` per unit of size, tracking excluded."""
+    return max(0.0, cache.width(text) - len(text) * tracking) / size
+
+
+def _width_limit(texts, cache, limit, tracking, size, scale):
+    """Largest size at which every text is at most `limit` wide, or None."""
+    best = None
+    for text in texts:
+        if not text:
+            continue
+        slope = _slope(cache, text, tracking, size)
+        room = limit / scale - len(text) * tracking
+        if slope <= 0:
+            continue
+        if room <= 0:
+            return 0.0
+        candidate = room / slope
+        if best is None or candidate < best:
+            best = candidate
+    return best
+
+
+def _chord(radius, angle_step, curved):
+    step = math.radians(abs(angle_step))
+    if curved:
+        return radius * step
+    return 2 * radius * math.sin(min(step, math.pi) / 2)
+
+
+def fit_size(obj):
+    """The `Size` that makes `obj`'s strings fit its `AutoFit` target.
+
+    Returns None when `AutoFit` is off, or nothing limits the size (no
+    font, no strings with glyphs). Raises ValueError, with a message for
+    the user, when the target leaves no room.
+    """
+    mode = getattr(obj, "AutoFit", "Off")
+    if mode == "Off" or not obj.FontFile:
+        return None
+
+    kind = utils.get_type(obj)
+    size = float(obj.Size) or 1.0
+    tracking = float(obj.Tracking)
+    margin = float(getattr(obj, "FitMargin", 0.0))
+    cache = get_glyph_cache(obj.FontFile, size, tracking)
+    # Unscaled cap height per unit of size
+    cap_ratio = cache.cap_height() / size
+    # Glyph scale, constant in size: Size over the measured cap height
+    scale = 1.0 / cap_ratio if _is_scaled(kind, obj) and cap_ratio > 0 else 1.0
+
+    limits = []
+    if mode == "Width":
+        limits.append(("width", list(object_strings(obj)), float(obj.FitWidth) - margin))
+
+    elif mode == "Cell":
+        limits.append(("width", list(object_strings(obj)), float(obj.ColumnOffset) - margin))
+        limits.append(("height", None, float(obj.RowOffset) - margin))
+
+    elif mode == "Arc":
+        curved = is_curved(obj)
+        for ring in object_rings(obj):
+            if ring.size != float(obj.Size):
+                # Rings with a size of their own are not fitted
+                continue
+            if is_even(obj):
+                # All strings together, with a margin between each
+                span = ring.radius * math.radians(min(abs(float(obj.ArcSpan)), 360.0))
+                limits.append(("width", ["".join(ring.texts)], span - len(ring.texts) * margin))
+            else:
+                limits.append(("width", ring.texts, _chord(ring.radius, ring.angle_step, curved) - margin))
+
+    best = None
+    for what, texts, limit in limits:
+        if limit <= 0:
+            raise ValueError(translate("draft", "AutoFit {}: the target leaves no room for the text").format(mode))
+        if what == "width":
+            candidate = _width_limit(texts, cache, limit, tracking, size, scale)
+        else:
+            # Cap height: Size when scaled to it, else measured
+            if obj.ScaleToSize:
+                candidate = limit
+            elif cap_ratio > 0:
+                candidate = limit / cap_ratio
+            else:
+                candidate = None
+        if candidate is not None and (best is None or candidate < best):
+            best = candidate
+
+    if best is None:
+        return None
+    if best <= 0:
+        raise ValueError(translate("draft", "AutoFit {}: the target leaves no room for the text").format(mode))
+    return math.floor(best / RESOLUTION) * RESOLUTION
+
+
+def auto_fit(obj):
+    """Set `obj.Size` from `fit_size`, before `obj` renders.
+
+    Meant to be called from `execute()`: the view provider's eager
+    recompute is skipped for the assignment. Problems are reported and
+    leave `Size` as it is.
+    """
+    try:
+        size = fit_size(obj)
+    except ValueError as e:
+        App.Console.PrintError("{}: {}\n".format(obj.Label, e))
+        return
+    if size is not None and abs(size - float(obj.Size)) > RESOLUTION / 2:
+        assignQuietly(obj, "Size", size)
@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Per-font glyph cache: outlines and metrics, measured once per character.
+
+`Part.makeWireString` builds every character of every string from scratch.
+For work that only needs to know where glyphs go - previews, measuring,
+layout - that is far more than necessary: a label set rarely uses more than
+a few dozen distinct characters. `GlyphCache` renders each character once
+for a given font, size and tracking and remembers its wires, a discretised
+outline, its faces, its edge count and its advance width.
+
+Advances are measured by rendering the character in front of a reference
+glyph and seeing where the reference lands, so they include tracking.
+Positions within a text (`pens`) come from pair advances instead: the
+second character of each distinct pair is located in a two-character
+render, so the font's pair kerning is included and the pens match a full
+`makeWireString` render of the text. Only a pair whose second character
+has no outline, such as a space, falls back to the plain advance.
+"""
+
+import os
+
+import Part
+
+from .StringGeometry import make_faces
+
+
+# Number of (font, size, tracking) caches kept alive at once
+CACHE_LIMIT = 16
+
+_caches = {}
+
+
+def get_glyph_cache(font_file, size, tracking=0.0):
+    """Return the shared `GlyphCache` for this font, size and tracking.
+
+    Caches are keyed on the font file's modification time too, so editing
+    or replacing a font on disk is picked up. The least recently used
+    cache is dropped once more than `CACHE_LIMIT` are alive.
+    """
+    try:
+        mtime = os.path.getmtime(font_file)
+    except OSError:
+        mtime = None
+
+    key = (str(font_file), mtime, float(size), float(tracking))
+    cache = _caches.pop(key, None)
+    if cache is None:
+        cache = GlyphCache(font_file, size, tracking)
+    # Re-insert so dictionary order doubles as recency order
+    _caches[key] = cache
+
+    while len(_caches) > CACHE_LIMIT:
+        del _caches[next(iter(_caches))]
+
+    return cache
+
+
+class GlyphCache:
+    """Wires, outlines and advance widths of single characters."""
+
+    # Glyph rendered after a character to measure that character's advance
+    REFERENCE = "H"
+
+    def __init__(self, font_file, size, tracking=0.0):
+        self.font_file = str(font_file)
+        self.size = float(size)
+        self.tracking = float(tracking)
+        self._wires = {}
+        self._faces = {}
+        self._outlines = {}
+        self._advances = {}
+        self._pair_advances = {}
+        self._edge_counts = {}
+        self._reference_xmin = None
+        self._cap_height = None
+
+    def wires(self, char):
+        """Wires of `char` as rendered at pen position 0 (may be empty)."""
+        if char not in self._wires:
+            chars = Part.makeWireString(char, self.font_file, self.size, self.tracking)
+            self._wires[char] = chars[0] if chars else []
+        return self._wires[char]
+
+    def faces(self, char):
+        """Faces filling `char` (empty for glyphs without closed outlines)."""
+        if char not in self._faces:
+            wires = self.wires(char)
+            self._faces[char] = make_faces(wires) if wires else []
+        return self._faces[char]
+
+    def outline(self, char):
+        """Discretised outline of `char`: a list of [(x, y), ...] polylines."""
+        if char not in self._outlines:
+            deflection = self.size * 0.01
+            polylines = []
+            for wire in self.wires(char):
+                try:
+                    points = wire.discretize(Deflection=deflection)
+                except Exception:
+                    points = []
+                    for edge in wire.Edges:
+                        points.extend(edge.discretize(Deflection=deflection))
+                if len(points) > 1:
+                    polylines.append([(p.x, p.y) for p in points])
+            self._outlines[char] = polylines
+        return self._outlines[char]
+
+    def edge_count(self, char):
+        """Number of edges in the wires of `char`."""
+        if char not in self._edge_counts:
+            self._edge_counts[char] = sum(len(wire.Edges) for wire in self.wires(char))
+        return self._edge_counts[char]
+
+    def advance(self, char):
+        """Horizontal pen advance of `char`, tracking included."""
+        if char not in self._advances:
+            if self._reference_xmin is None:
+                self._reference_xmin = Part.Compound(self.wires(self.REFERENCE)).BoundBox.XMin
+            pair = Part.makeWireString(char + self.REFERENCE, self.font_file, self.size, self.tracking)
+            reference = Part.Compound(pair[-1]) if pair else None
+            if reference is None or not reference.Edges:
+                self._advances[char] = 0.0
+            else:
+                self._advances[char] = reference.BoundBox.XMin - self._reference_xmin
+        return self._advances[char]
+
+    def pair_advance(self, left, right):
+        """Pen advance from `left` to `right`, tracking and kerning included."""
+        pair = (left, right)
+        if pair not in self._pair_advances:
+            advance = self.advance(left)
+            wires = self.wires(right)
+            if wires:
+                chars = Part.makeWireString(left + right, self.font_file, self.size, self.tracking)
+                placed = Part.Compound(chars[-1]) if chars else None
+                if placed is not None and placed.Edges:
+                    advance = placed.BoundBox.XMin - Part.Compound(wires).BoundBox.XMin
+            self._pair_advances[pair] = advance
+        return self._pair_advances[pair]
+
+    def cap_height(self):
+        """Measured cap height: the top of an unscaled 'M'."""
+        if self._cap_height is None:
+            self._cap_height = Part.Compound(self.wires("M")).BoundBox.YMax
+        return self._cap_height
+
+    def pens(self, text):
+        """Yield (char, pen x) for every character of `text`, kerned."""
+        pen = 0.0
+        previous = None
+        for char in text:
+            if previous is not None:
+                pen += self.pair_advance(previous, char)
+            yield char, pen
+            previous = char
+
+    def width(self, text):
+        """Total advance of `text`, kerned."""
+        width = 0.0
+        for char, pen in self.pens(text):
+            width = pen + self.advance(char)
+        return width
@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Named layout groups of a MultiShapeString.
+
+Big projects used to hold hundreds of Spaced, Radial and Grid objects,
+each probing the font, recomputing and showing in the tree on its own. A
+MultiShapeString holds them as groups instead, rendered in one pass from
+one `GlyphSet` into one compound (see `Misc/Instances.py`).
+
+`GroupCounts` splits the object's strings into groups, in order, like the
+rings of a RadialShapeString (see `Misc/Rings.py`): the first
+`GroupCounts[0]` strings are group 0, the next `GroupCounts[1]` group 1,
+and so on. Each group takes its name, layout and placement from
+`GroupNames`, `GroupLayouts` ("Spaced", "Radial" or "Grid") and
+`GroupPlacements`, and its size and layout settings from `GroupSizes`,
+`GroupOffsets`, `GroupColumns`, `GroupRowOffsets`, `GroupRadii`,
+`GroupStartAngles` and `GroupAngleSteps`; a group without an entry uses
+the object's own `Size`, `Offset`, `Columns`, ... `AngleStep`. An empty
+`GroupCounts` is a single Spaced group holding every string.
+
+`GroupStarts` maps the groups onto the compound: group i's shapes are
+its sub-shapes `GroupStarts[i]` up to `GroupStarts[i + 1]`. It is only
+written by the object's own recompute, together with its shape.
+"""
+
+import FreeCAD as App
+import Part
+
+from draftutils.translate import translate
+
+from .Commit import assignQuietly
+from .Pattern import object_strings
+
+
+LAYOUTS = ("Spaced", "Radial", "Grid")
+
+
+class Group:
+    """One layout group of a MultiShapeString.
+
+    `first` is the index of the group's first string in the object's
+    string list. `offset` is the distance between strings (Spaced) or
+    columns (Grid).
+    """
+
+    def __init__(self, index, first, texts, name, layout, placement, size,
+                 offset, columns, row_offset, radius, start_angle, angle_step):
+        self.index = index
+        self.first = first
+        self.texts = texts
+        self.name = name
+        self.layout = layout
+        self.placement = placement
+        self.size = size
+        self.offset = offset
+        self.columns = columns
+        self.row_offset = row_offset
+        self.radius = radius
+        self.start_angle = start_angle
+        self.angle_step = angle_step
+
+
+def _entry(values, index, default):
+    return values[index] if index < len(values) else default
+
+
+def _group_name(obj, index):
+    return _entry(obj.GroupNames, index, "") or "Group{:03d}".format(index)
+
+
+def group_names(obj):
+    """Name of each group, in order."""
+    return [_group_name(obj, index) for index in range(max(1, len(obj.GroupCounts)))]
+
+
+def object_groups(obj):
+    """The groups of a MultiShapeString, as a list of `Group`."""
+    texts = list(object_strings(obj))
+    counts = list(obj.GroupCounts) or [len(texts)]
+
+    groups = []
+    first = 0
+    for index, count in enumerate(counts):
+        count = max(0, int(count))
+        layout = _entry(obj.GroupLayouts, index, "Spaced")
+        if layout not in LAYOUTS:
+            App.Console.PrintWarning(
+                translate("draft", "{}: group {} has unknown layout '{}', using Spaced").format(
+                    obj.Label, index, layout
+                )
+                + "\n"
+            )
+            layout = "Spaced"
+        groups.append(Group(
+            index,
+            first,
+            texts[first:first + count],
+            _group_name(obj, index),
+            layout,
+            App.Placement(_entry(obj.GroupPlacements, index, App.Placement())),
+            float(_entry(obj.GroupSizes, index, 0.0)) or float(obj.Size),
+            float(_entry(obj.GroupOffsets, index, obj.Offset)),
+            max(1, int(_entry(obj.GroupColumns, index, obj.Columns))),
+            float(_entry(obj.GroupRowOffsets, index, obj.RowOffset)),
+            float(_entry(obj.GroupRadii, index, obj.Radius)),
+            float(_entry(obj.GroupStartAngles, index, obj.StartAngle)),
+            float(_entry(obj.GroupAngleSteps, index, obj.AngleStep)),
+        ))
+        first += count
+    return groups
+
+
+def group_index(obj, name):
+    """Index of the group called `name`, or None."""
+    names = group_names(obj)
+    return names.index(name) if name in names else None
+
+
+def record_starts(obj):
+    """Store the first sub-shape of each group in `GroupStarts`.
+
+    Read from the string map (see `Misc/StringMap.py`), so call it right
+    after the object's shape was assigned.
+    """
+    string_starts = list(obj.StringStarts) or [0]
+    firsts = [0]
+    for count in list(obj.GroupCounts)[:-1]:
+        firsts.append(firsts[-1] + max(0, int(count)))
+    starts = [string_starts[min(first, len(string_starts) - 1)] for first in firsts]
+    if list(obj.GroupStarts) != starts:
+        assignQuietly(obj, "GroupStarts", starts)
+
+
+def group_shape(obj, name):
+    """Compound of the shapes of group `name` of a MultiShapeString.
+
+    Returns None for an unknown group, or one whose shapes are not in
+    the object's current shape.
+    """
+    index = group_index(obj, name)
+    starts = list(obj.GroupStarts)
+    if index is None or index >= len(starts):
+        return None
+    shapes = obj.Shape.childShapes()
+    end = starts[index + 1] if index + 1 < len(starts) else len(shapes)
+    if end > len(shapes):
+        return None
+    return Part.Compound(shapes[starts[index]:end])
@@ -0,0 +1,683 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""A ShapeString as distinct glyphs plus placed occurrences of them.
+
+The objects' shapes are flat compounds: every occurrence of a character is
+its own copy of the glyph's geometry. Exporters that can reference shared
+geometry (DXF blocks, SVG symbols, STEP and 3MF components) only need each
+distinct glyph once and a placement per occurrence, and so does solid
+output (see `Misc/Extrude.py`). `glyph_instances`
+rebuilds exactly that from an object's properties, using the same glyph
+cache and `Layout` rules as the objects and the preview:
+
+- each glyph shape is taken from the `GlyphCache` and has the object's
+  scale and oblique shear baked in, so every occurrence is a rigid motion
+  (translation plus in-plane rotation) of it,
+- occurrences are positioned with the glyph cache's pens, which include
+  pair kerning (see `Misc/Glyphs.py`), as in a full render,
+- `Fuse` is ignored: fused strings no longer consist of separate glyphs,
+  so `collect_instances` refuses to export them where the fused shape
+  differs (see `shape_mismatch`),
+- wrapped Grid cells (see `Misc/Wrap.py`) are measured line by line,
+- the rings of a RadialShapeString (see `Misc/Rings.py`) share one
+  `GlyphSet`; a character used at two sizes is two glyphs.
+- so do the groups of a MultiShapeString (see `Misc/Groups.py`), each
+  laid out by its own layout's rules and moved by its placement.
+
+Matrices are local to the object; apply `placement` for document
+coordinates.
+
+Exports must write the geometry the user saw, so `collect_instances`
+compares every object's instances with its rendered Shape, string by
+string (see `Misc/StringMap.py`), and skips objects they do not match.
+"""
+
+import math
+
+import FreeCAD as App
+import Part
+
+from draftutils import utils
+from draftutils.translate import translate
+
+from .ArcLength import link_shape, path_table
+from .Glyphs import get_glyph_cache
+from .Groups import object_groups
+from .Justify import justification_offset
+from .Layout import (
+    curved_matrix,
+    grid_positions,
+    path_matrix,
+    pitch_positions,
+    radial_matrix,
+    spaced_positions,
+)
+from .Nest import is_nesting, nest_offsets
+from .Pattern import is_scale, object_strings
+from .Rings import Ring, anchor_angle, is_curved, object_rings, ring_angles, ring_signature
+from .Sparse import cell_positions, grid_columns
+from .StringMap import string_compound
+from .StringGeometry import font_can_fill, fuse_faces
+from .Wrap import cell_lines, is_wrapping, line_offsets, line_pitch
+
+
+# Path points are within this fraction of Size of the true path
+PATH_DEFLECTION = 0.002
+
+# Path directions are taken across at most this fraction of Size
+PATH_WINDOW = 0.05
+
+# Exported glyphs may differ from the object's shape by this fraction of Size
+MATCH_TOLERANCE = 1e-3
+
+# Faces of a solid piece within this of its own Z = 0 are its text faces
+PLANE_TOLERANCE = 1e-7
+
+SUPPORTED_TYPES = ("SpacedShapeString", "RadialShapeString", "GridShapeString", "PathShapeString", "MultiShapeString")
+
+# Kinds whose glyphs are scaled to a cap height of Size
+SCALED_TYPES = ("GridShapeString", "PathShapeString", "MultiShapeString")
+
+
+class GlyphInstances:
+    """Distinct glyph shapes of one ShapeString and where each occurrence goes.
+
+    `glyphs` maps a glyph key - the character, see `GlyphSet` - to its
+    shape at the origin (faces, or wires for sticky fonts and `MakeFace`
+    off). `occurrences` lists a `(string index, key, App.Matrix)` tuple
+    per placed glyph, in string order. `placement` is the object's
+    Placement; `height` and `taper` its `Height` and `Taper`, 0 without.
+    """
+
+    def __init__(self, obj, glyphs, occurrences, placement, filled):
+        self.name = obj.Name
+        self.label = obj.Label
+        self.size = float(obj.Size)
+        self.height = float(getattr(obj, "Height", 0.0))
+        self.taper = float(getattr(obj, "Taper", 0.0))
+        self.glyphs = glyphs
+        self.occurrences = occurrences
+        self.placement = placement
+        self.filled = filled
+        self._outlines = {}
+
+    def outline(self, key, deflection):
+        """Discretised outline of a glyph: a list of closed-or-open [(x, y), ...]."""
+        outline_key = (key, deflection)
+        if outline_key not in self._outlines:
+            polylines = []
+            for wire in self.glyphs[key].Wires:
+                points = wire.discretize(Deflection=deflection)
+                if len(points) > 1:
+                    polylines.append([(p.x, p.y) for p in points])
+            self._outlines[outline_key] = polylines
+        return self._outlines[outline_key]
+
+
+def supports(obj):
+    """Whether `obj` is a ShapeString `glyph_instances` can decompose."""
+    return utils.get_type(obj) in SUPPORTED_TYPES
+
+
+def _glyph_matrix(scale, oblique):
+    m = App.Matrix()
+    m.scale(scale, scale, scale)
+    if oblique and -80 <= oblique <= 80:
+        shear = App.Matrix()
+        shear.A12 = math.tan(math.radians(oblique))
+        m = shear.multiply(m)
+    return m
+
+
+def _translation(x, y):
+    m = App.Matrix()
+    m.move(App.Vector(x, y, 0))
+    return m
+
+
+def glyph_instances(obj):
+    """Decompose a Spaced, Radial, Grid, Path or Multi ShapeString into glyph instances.
+
+    Returns a `GlyphInstances`, or None if `obj` is not one of them or has
+    no font.
+    """
+    steps = iter_glyph_instances(obj)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+class GlyphSet:
+    """The distinct glyph shapes of one object, across the sizes it uses.
+
+    Glyphs are keyed by their character at the object's `Size`, and by
+    `"<char>@<size>"` at any other size (rings of a RadialShapeString,
+    see `Misc/Rings.py`); `glyph_name` turns a key into an identifier.
+    """
+
+    def __init__(self, obj, kind):
+        self.kind = kind
+        self.font_file = obj.FontFile
+        self.tracking = float(obj.Tracking)
+        self.size = float(obj.Size)
+        self.scale_to_size = bool(obj.ScaleToSize)
+        self.oblique = float(obj.ObliqueAngle)
+        self.filled = bool(obj.MakeFace) and font_can_fill(obj.FontFile)
+        self.glyphs = {}
+
+    def cache(self, size):
+        return get_glyph_cache(self.font_file, size, self.tracking)
+
+    def scale(self, size):
+        """Scale applied to glyphs rendered at `size`."""
+        # Spaced and Radial keep their historical unscaled rendering, see
+        # `Misc/StringGeometry.py`; Grid, Path and Multi scale by the
+        # measured cap height.
+        if self.kind in SCALED_TYPES and self.scale_to_size:
+            return size / self.cache(size).cap_height()
+        return 1.0
+
+    def cap_height(self, size):
+        """Cap height used to justify strings rendered at `size`."""
+        return size if self.scale_to_size else self.cache(size).cap_height()
+
+    def key(self, char, size):
+        return char if size == self.size else "{}@{:g}".format(char, size)
+
+    def glyph(self, key, char, size):
+        """Shape of `char` at `size`, stored under `key`; None if it has none."""
+        if key not in self.glyphs:
+            cache = self.cache(size)
+            base = cache.faces(char) if self.filled else cache.wires(char)
+            if base:
+                matrix = _glyph_matrix(self.scale(size), self.oblique)
+                self.glyphs[key] = Part.Compound(base).transformGeometry(matrix)
+            else:
+                self.glyphs[key] = None
+        return self.glyphs[key]
+
+    def shapes(self):
+        """The glyphs that have geometry, by key."""
+        return {key: shape for key, shape in self.glyphs.items() if shape is not None}
+
+
+def glyph_name(key):
+    """An identifier for a glyph key, safe in DXF block names and XML ids."""
+    # A key is one character, optionally followed by "@size"; the
+    # character itself may be "@"
+    char, size = key, ""
+    if len(key) > 1:
+        char, _at, size = key.rpartition("@")
+    name = "{:04X}".format(ord(char))
+    if size:
+        name += "_" + size.replace(".", "_")
+    return name
+
+
+def _measure_text(obj, text, glyph_set, size):
+    """Place the glyphs of one line of text; see `measure_strings`."""
+    cache = glyph_set.cache(size)
+    scale = glyph_set.scale(size)
+    placed = []
+    box = None
+    for char, pen in cache.pens(text):
+        key = glyph_set.key(char, size)
+        shape = glyph_set.glyph(key, char, size)
+        if shape is None:
+            continue
+        x = pen * scale
+        glyph_box = App.BoundBox(shape.BoundBox)
+        glyph_box.move(App.Vector(x, 0, 0))
+        if box is None:
+            box = glyph_box
+        else:
+            box.add(glyph_box)
+        placed.append((key, x, 0.0))
+    if not placed:
+        return None
+    vec = justification_offset(
+        box, glyph_set.cap_height(size), obj.Justification, obj.JustificationReference, obj.KeepLeftMargin
+    )
+    box.move(vec)
+    return placed, vec, box
+
+
+def _measure_cell(obj, text, glyph_set, size):
+    """Place the glyphs of a wrapped Grid cell, line by line.
+
+    The lines' own justification and their offset in the cell are
+    folded into each glyph's position, so the cell's vector is zero.
+    """
+    cache = glyph_set.cache(size)
+    scale = glyph_set.scale(size)
+    lines, _dropped = cell_lines(obj, text, lambda char: cache.advance(char) * scale, glyph_set.cap_height(size))
+    placed = []
+    box = None
+    for line, offset in zip(lines, line_offsets(len(lines), line_pitch(obj), obj.Justification)):
+        entry = _measure_text(obj, line, glyph_set, size)
+        if entry is None:
+            continue
+        line_placed, vec, line_box = entry
+        placed.extend((key, x + vec.x, y + vec.y + offset) for key, x, y in line_placed)
+        line_box.move(App.Vector(0, offset, 0))
+        if box is None:
+            box = line_box
+        else:
+            box.add(line_box)
+    if not placed:
+        return None
+    return placed, App.Vector(), box
+
+
+def measure_strings(obj, texts, glyph_set, size):
+    """Place the glyphs of each string in `texts`, yielding once per string.
+
+    Returns a list with, per string, None when it has no glyphs or else
+    `(placed, vec, box)`: the `(key, x, y)` of each glyph, the
+    justification offset and the justified box. Glyphs are on the
+    baseline (y = 0) except in wrapped Grid cells, see `Misc/Wrap.py`.
+    """
+    measure = _measure_cell if glyph_set.kind == "GridShapeString" and is_wrapping(obj) else _measure_text
+    strings = []
+    for text in texts:
+        yield
+        strings.append(measure(obj, text, glyph_set, size))
+    return strings
+
+
+def string_occurrences(strings, layouts, first=0):
+    """`(string index, key, App.Matrix)` of every glyph of measured `strings`.
+
+    `layouts` maps a string's position in `strings` to its matrix, and
+    strings without one are left out; `first` is added to that position
+    to give the string index.
+    """
+    occurrences = []
+    for index, entry in enumerate(strings):
+        layout = layouts.get(index)
+        if entry is None or layout is None:
+            continue
+        placed, vec, _box = entry
+        for key, x, y in placed:
+            occurrences.append((first + index, key, layout.multiply(_translation(x + vec.x, y + vec.y))))
+    return occurrences
+
+
+def iter_glyph_instances(obj):
+    """`glyph_instances` as a generator yielding once per string.
+
+    For use in render generators (see `Misc/Background.py`); the
+    `GlyphInstances` is the generator's return value.
+    """
+    kind = utils.get_type(obj)
+    if kind not in SUPPORTED_TYPES or not obj.FontFile:
+        return None
+
+    glyph_set = GlyphSet(obj, kind)
+    if kind == "RadialShapeString":
+        occurrences = []
+        for ring in object_rings(obj):
+            strings = yield from measure_strings(obj, ring.texts, glyph_set, ring.size)
+            occurrences.extend(ring_occurrences(obj, ring, strings, glyph_set, ring.first))
+    elif kind == "PathShapeString":
+        strings = yield from measure_strings(obj, object_strings(obj), glyph_set, glyph_set.size)
+        occurrences = path_occurrences(obj, strings, glyph_set)
+    elif kind == "MultiShapeString":
+        occurrences = []
+        for group in object_groups(obj):
+            strings = yield from measure_strings(obj, group.texts, glyph_set, group.size)
+            occurrences.extend(group_occurrences(obj, group, strings))
+    else:
+        strings = yield from measure_strings(obj, object_strings(obj), glyph_set, glyph_set.size)
+        occurrences = string_occurrences(strings, _string_matrices(obj, kind, strings))
+
+    return GlyphInstances(
+        obj,
+        glyph_set.shapes(),
+        occurrences,
+        App.Placement(obj.Placement),
+        glyph_set.filled,
+    )
+
+
+def instanced_steps(obj):
+    """Render `obj` flat from glyph instances, yielding once per string.
+
+    Every occurrence is its cached glyph moved into place, sharing the
+    glyph's geometry; used for pattern-expanded strings, where a handful
+    of distinct glyphs make up thousands of strings. Returns the
+    compound, one sub-compound per string (see `Misc/StringMap.py`), or
+    None if no string has any glyphs.
+    """
+    instances = yield from iter_glyph_instances(obj)
+    if instances is None or not instances.occurrences:
+        return None
+    return string_compound(occurrence_parts(instances.occurrences, instances.glyphs))
+
+
+def occurrence_parts(occurrences, shapes):
+    """Each string's placed copies of `shapes`, keyed by string index.
+
+    `shapes` maps a glyph key to the shape placed at its occurrences.
+    """
+    parts = {}
+    for index, key, matrix in occurrences:
+        parts.setdefault(index, []).append(shapes[key].moved(App.Placement(matrix)))
+    return parts
+
+
+def ring_steps(obj, ring_cache):
+    """Render a RadialShapeString ring by ring from glyph instances.
+
+    `ring_cache` maps a ring index to the `(ring_signature, parts)` it
+    was last laid out with, `parts` holding the placed glyphs of each of
+    the ring's strings by their position in the ring; rings whose
+    signature is unchanged reuse them, the others are laid out again -
+    yielding once per string - and stored. With `MakeFace` and `Fuse`
+    each string's placed glyphs are fused together. Returns the compound
+    of every ring, one sub-compound per string, or None if no string has
+    any glyphs.
+    """
+    glyph_set = GlyphSet(obj, "RadialShapeString")
+    fuse = glyph_set.filled and bool(obj.Fuse)
+    rings = object_rings(obj)
+    parts = {}
+    for ring in rings:
+        signature = ring_signature(obj, ring)
+        cached = ring_cache.get(ring.index)
+        if cached is None or cached[0] != signature:
+            strings = yield from measure_strings(obj, ring.texts, glyph_set, ring.size)
+            occurrences = ring_occurrences(obj, ring, strings, glyph_set)
+            ring_parts = occurrence_parts(occurrences, glyph_set.glyphs)
+            if fuse:
+                # Each string's placed glyphs fuse like a straight string's
+                ring_parts = {index: fuse_faces(shapes) for index, shapes in ring_parts.items()}
+            cached = ring_cache[ring.index] = (signature, ring_parts)
+        for index, shapes in cached[1].items():
+            parts[ring.first + index] = shapes
+    for index in [index for index in ring_cache if index >= len(rings)]:
+        del ring_cache[index]
+
+    return string_compound(parts)
+
+
+def ring_occurrences(obj, ring, strings, glyph_set, first=0):
+    """Occurrences of the measured `strings` of a ring.
+
+    Strings are placed as rigid blocks, or, with `CurvedText`, glyph by
+    glyph: each glyph's center goes on the arc at its arc length from
+    the string's origin and is turned to the arc there. Only the
+    transforms differ, the glyphs are the same.
+    """
+    if not is_curved(obj):
+        return string_occurrences(strings, ring_matrices(obj, ring, strings), first)
+
+    inside = obj.CurvedText == "Inside"
+    string_rotation = float(getattr(obj, "StringRotation", 0.0))
+    angles = ring_angles(obj, ring)
+    centers = {}
+    occurrences = []
+    for index, entry in enumerate(strings):
+        if entry is None:
+            continue
+        placed, vec, box = entry
+        angle = anchor_angle(obj, ring, angles[index], box.XMin + box.XLength / 2)
+        for key, x, y in placed:
+            if key not in centers:
+                glyph_box = glyph_set.glyphs[key].BoundBox
+                centers[key] = (glyph_box.XMin + glyph_box.XMax) / 2
+            center = centers[key]
+            m = curved_matrix(angle, ring.radius, x + vec.x + center, y + vec.y, inside, string_rotation)
+            occurrences.append((first + index, key, m.multiply(_translation(-center, 0.0))))
+    return occurrences
+
+
+def path_occurrences(obj, strings, glyph_set):
+    """Occurrences of the measured `strings` of a PathShapeString.
+
+    Strings follow each other along the path like a Spaced layout
+    starting `StartOffset` in; every glyph's center goes on the path at
+    its arc length and is turned to the path's direction there, looked
+    up in one `ArcLengthTable` per call.
+    """
+    table = path_table(
+        link_shape(obj.Path),
+        obj.Placement,
+        float(obj.Size) * PATH_DEFLECTION,
+        bool(obj.Reverse),
+        float(obj.Size) * PATH_WINDOW,
+    )
+    if table is None:
+        return []
+
+    # Strings without glyphs take no slot
+    indices = [index for index, entry in enumerate(strings) if entry is not None]
+    widths = [strings[index][2].XLength for index in indices]
+    positions = spaced_positions(widths, float(obj.Offset), obj.UseBoundingBox)
+
+    start = float(obj.StartOffset)
+    centers = {}
+    occurrences = []
+    for index, position in zip(indices, positions):
+        placed, vec, _box = strings[index]
+        for key, x, y in placed:
+            if key not in centers:
+                glyph_box = glyph_set.glyphs[key].BoundBox
+                centers[key] = (glyph_box.XMin + glyph_box.XMax) / 2
+            center = centers[key]
+            px, py, direction = table.locate(start + position + x + vec.x + center)
+            m = path_matrix(px, py, direction, y + vec.y)
+            occurrences.append((index, key, m.multiply(_translation(-center, 0.0))))
+    return occurrences
+
+
+def group_occurrences(obj, group, strings):
+    """Occurrences of the measured `strings` of a MultiShapeString group.
+
+    Each group is laid out like the object its layout is named after, at
+    the group's own size and settings, then moved by its placement.
+    """
+    layouts = {}
+    indices = [index for index, entry in enumerate(strings) if entry is not None]
+    if group.layout == "Radial":
+        ring = Ring(group.index, group.first, group.texts, group.radius, group.start_angle,
+                    group.angle_step, group.size, bool(obj.Tangential))
+        layouts = ring_matrices(obj, ring, strings)
+    elif group.layout == "Grid":
+        extents = []
+        for index in indices:
+            row, col = divmod(index, group.columns)
+            extents.append((row, col, strings[index][2].XLength, strings[index][2].YLength))
+        rows = (len(strings) - 1) // group.columns + 1 if strings else 0
+        col_x, row_y = grid_positions(
+            extents, group.columns, rows, group.offset, group.row_offset, obj.UseBoundingBox
+        )
+        for index in indices:
+            row, col = divmod(index, group.columns)
+            layouts[index] = _translation(col_x[col], row_y[row])
+    else:
+        widths = [strings[index][2].XLength for index in indices]
+        for index, x in zip(indices, spaced_positions(widths, group.offset, obj.UseBoundingBox)):
+            layouts[index] = _translation(x, 0.0)
+
+    placement = group.placement.toMatrix()
+    return [
+        (index, key, placement.multiply(matrix))
+        for index, key, matrix in string_occurrences(strings, layouts, group.first)
+    ]
+
+
+def ring_matrices(obj, ring, strings):
+    """Matrix of each non-empty string of a ring, keyed by its position in it."""
+    angles = ring_angles(obj, ring)
+    layouts = {}
+    for index, entry in enumerate(strings):
+        if entry is None:
+            continue
+        # Blank entries still use up their angular slot
+        box = entry[2]
+        angle = anchor_angle(obj, ring, angles[index], box.XMin + box.XLength / 2)
+        layouts[index] = radial_matrix(
+            angle,
+            ring.radius,
+            ring.tangential,
+            float(getattr(obj, "StringRotation", 0.0)),
+        )
+    return layouts
+
+
+def _string_matrices(obj, kind, strings):
+    """Matrix of each non-empty string's origin, keyed by string index."""
+    layouts = {}
+    if kind == "SpacedShapeString":
+        indices = [index for index, entry in enumerate(strings) if entry is not None]
+        if is_scale(obj):
+            positions = pitch_positions(indices, float(obj.Offset))
+        else:
+            # Strings without glyphs take no slot
+            widths = [strings[index][2].XLength for index in indices]
+            positions = spaced_positions(widths, float(obj.Offset), obj.UseBoundingBox)
+        for index, x in zip(indices, positions):
+            layouts[index] = _translation(x, 0.0)
+
+    elif is_nesting(obj):
+        indices = [index for index, entry in enumerate(strings) if entry is not None]
+        offsets = nest_offsets(obj, [strings[index][2] for index in indices])
+        for index, offset in zip(indices, offsets):
+            if offset is not None:
+                layouts[index] = _translation(offset.x, offset.y)
+
+    else:
+        # Row-major, or the cells of a sparse grid, see `Misc/Sparse.py`
+        positions = cell_positions(obj, len(strings))
+        extents = []
+        for position, entry in zip(positions, strings):
+            if entry is not None and position is not None:
+                extents.append((position[0], position[1], entry[2].XLength, entry[2].YLength))
+        rows = max([row + 1 for row, _col, _width, _height in extents], default=0)
+        col_x, row_y = grid_positions(
+            extents,
+            grid_columns(obj, positions),
+            rows,
+            float(obj.ColumnOffset),
+            float(obj.RowOffset),
+            obj.UseBoundingBox,
+        )
+        for index, (position, entry) in enumerate(zip(positions, strings)):
+            if entry is not None and position is not None:
+                row, col = position
+                layouts[index] = _translation(col_x[col], row_y[row])
+
+    return layouts
+
+
+def planar_transform(matrix):
+    """Split a rigid in-plane matrix into (x, y, rotation in degrees)."""
+    return matrix.A14, matrix.A24, math.degrees(math.atan2(matrix.A21, matrix.A11))
+
+
+def plane_matrix(placement):
+    """The part of `placement` that keeps a drawing in the XY plane.
+
+    2D formats (DXF, SVG) are written in the ShapeString's own plane. Its
+    Placement is applied when it only moves and turns the text within
+    XY; any other rotation is dropped, which lays the text flat.
+    """
+    rotation = placement.Rotation
+    m = App.Matrix()
+    if rotation.multVec(App.Vector(0, 0, 1)).z > 1.0 - 1e-9:
+        x_axis = rotation.multVec(App.Vector(1, 0, 0))
+        m.rotateZ(math.atan2(x_axis.y, x_axis.x))
+    m.move(App.Vector(placement.Base.x, placement.Base.y, 0))
+    return m
+
+
+def _leaves(shape):
+    if shape.ShapeType == "Compound":
+        return [leaf for child in shape.childShapes() for leaf in _leaves(child)]
+    return [shape]
+
+
+def _plane_box(piece):
+    """Bounding box of `piece` on its text plane, Z = 0."""
+    if piece.Solids:
+        faces = [
+            face for face in piece.Faces
+            if abs(face.BoundBox.ZMin) < PLANE_TOLERANCE and abs(face.BoundBox.ZMax) < PLANE_TOLERANCE
+        ]
+        if faces:
+            return Part.Compound(faces).BoundBox
+    return piece.BoundBox
+
+
+def _same_box(a, b, tolerance):
+    return (
+        abs(a.XMin - b.XMin) <= tolerance and abs(a.XMax - b.XMax) <= tolerance
+        and abs(a.YMin - b.YMin) <= tolerance and abs(a.YMax - b.YMax) <= tolerance
+    )
+
+
+def shape_mismatch(obj, instances):
+    """Why `instances` does not reproduce `obj`'s Shape, or None if it does.
+
+    Each string's pieces in the shape, taken from `StringStarts`, are
+    compared in order with the pieces of its placed glyphs by their
+    boxes on the text plane, in the object's own coordinates; solid
+    pieces (a `Height`) by their faces on that plane.
+    """
+    shape = obj.Shape
+    children = [] if shape.isNull() else shape.located(App.Placement()).childShapes()
+    starts = list(obj.StringStarts)
+    if not starts or starts[-1] != len(children):
+        return translate("draft", "its shape is not up to date, recompute it first")
+
+    placed = {}
+    for index, key, matrix in instances.occurrences:
+        placement = App.Placement(matrix)
+        placed.setdefault(index, []).extend(
+            piece.moved(placement) for piece in _leaves(instances.glyphs[key])
+        )
+
+    tolerance = instances.size * MATCH_TOLERANCE
+    for index in range(max(len(starts) - 1, max(placed, default=-1) + 1)):
+        rendered = []
+        if index < len(starts) - 1:
+            for child in children[starts[index]:starts[index + 1]]:
+                rendered.extend(_leaves(child))
+        pieces = placed.get(index, [])
+        if len(rendered) != len(pieces) or not all(
+            _same_box(_plane_box(piece), glyph.BoundBox, tolerance) for piece, glyph in zip(rendered, pieces)
+        ):
+            if getattr(obj, "MakeFace", False) and getattr(obj, "Fuse", False):
+                return translate("draft", "Fuse merges the glyphs of string {}, turn it off to export").format(index)
+            return translate("draft", "its glyphs do not match its shape at string {}").format(index)
+    return None
+
+
+def collect_instances(objects, label):
+    """`GlyphInstances` of every supported object in `objects`.
+
+    Other objects, and objects whose instances do not match their shape
+    (see `shape_mismatch`), are skipped with a warning naming the
+    exporter `label`.
+    """
+    collected = []
+    for obj in objects:
+        instances = glyph_instances(obj) if supports(obj) else None
+        if instances is None:
+            App.Console.PrintWarning(
+                translate("draft", "{}: skipping {}, not a ShapeString with a font").format(label, obj.Label)
+                + "\n"
+            )
+            continue
+        mismatch = shape_mismatch(obj, instances)
+        if mismatch:
+            App.Console.PrintWarning(
+                translate("draft", "{}: skipping {}, {}").format(label, obj.Label, mismatch) + "\n"
+            )
+            continue
+        collected.append(instances)
+    return collected
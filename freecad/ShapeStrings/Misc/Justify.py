@@ -19,7 +19,18 @@ def justification_vector(ss_shape, cap_height, just, just_ref, keep_left_margin)
 
     Returns an App.Vector offset to apply to the string shapes.
     """
-    box = ss_shape.optimalBoundingBox()
+    return justification_offset(
+        ss_shape.optimalBoundingBox(), cap_height, just, just_ref, keep_left_margin
+    )
+
+
+def justification_offset(box, cap_height, just, just_ref, keep_left_margin):
+    """Calculate the justification offset vector from a bounding box.
+
+    Same as `justification_vector`, for callers that already know the
+    string's extent without having built its shape (e.g. from cached glyph
+    outlines). `box` is an App.BoundBox.
+    """
     if keep_left_margin is True and "Left" in just:
         vec = App.Vector(0, 0, 0)
     else:
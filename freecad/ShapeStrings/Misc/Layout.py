@@ -0,0 +1,235 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Where each string goes, for the Spaced, Radial, Grid and Path layouts.
+
+These are the placement rules of the three objects with the geometry taken
+out: they work on plain numbers (string widths, cell extents, indices), so
+the objects' `execute()` and anything that only needs the layout - such as
+the task panels' live preview - share one implementation.
+"""
+
+import math
+
+import FreeCAD as App
+
+
+def spaced_positions(widths, offset, use_bounding_box):
+    """X position of each string laid out left to right.
+
+    `widths` are the strings' bounding box widths, in order. Strings are
+    `offset` apart, measured origin to origin, or edge to edge when
+    `use_bounding_box` is set.
+    """
+    positions = []
+    cursor = 0.0
+    for width in widths:
+        positions.append(cursor)
+        if use_bounding_box:
+            cursor += width
+        cursor += offset
+    return positions
+
+
+def pitch_positions(indices, pitch):
+    """X position of strings at an exact pitch, e.g. the labels of a scale.
+
+    The string at list position `index` sits at `index * pitch`, whatever
+    its width; strings that render nothing still keep their slot.
+    """
+    return [index * pitch for index in indices]
+
+
+def radial_angle(index, start_angle, angle_step, clockwise=False):
+    """Angle, in degrees, of the `index`-th position on the arc."""
+    direction = -1.0 if clockwise else 1.0
+    return start_angle + index * angle_step * direction
+
+
+def distributed_angles(widths, radius, start_angle, span, clockwise=False):
+    """Angle of the middle of each string, spread over `span` degrees.
+
+    `widths` are the strings' lengths along the arc. The gaps between
+    neighbouring strings are all equal: the first string is centred on
+    `start_angle` and, for a partial circle, the last one on
+    `start_angle + span`; over a full circle the gap after the last
+    string matches the others.
+    """
+    count = len(widths)
+    if count < 2 or radius <= 0:
+        return [start_angle] * count
+
+    direction = -1.0 if clockwise else 1.0
+    span = min(abs(span), 360.0)
+    length = radius * math.radians(span)
+    if span >= 360.0 - 1e-9:
+        gap = (length - sum(widths)) / count
+    else:
+        gap = (length - sum(widths) + (widths[0] + widths[-1]) / 2) / (count - 1)
+
+    angles = [start_angle]
+    position = 0.0
+    for previous, width in zip(widths, widths[1:]):
+        position += previous / 2 + gap + width / 2
+        angles.append(start_angle + direction * math.degrees(position / radius))
+    return angles
+
+
+def radial_matrix(angle, radius, tangential=True, string_rotation=0.0):
+    """Matrix placing a string at `angle` degrees on a circle of `radius`.
+
+    A tangential string has its baseline tangent to the arc, reading
+    counter-clockwise; otherwise the baseline stays parallel to X.
+    `string_rotation` is added on top either way.
+    """
+    if tangential:
+        # Tangent direction: radial angle minus 90° for the baseline
+        rot_deg = angle - 90.0
+    else:
+        rot_deg = 0.0
+    rot_deg += string_rotation
+
+    angle_rad = math.radians(angle)
+    rot_rad = math.radians(rot_deg)
+
+    m = App.Matrix()
+    m.A11 = math.cos(rot_rad)
+    m.A12 = -math.sin(rot_rad)
+    m.A21 = math.sin(rot_rad)
+    m.A22 = math.cos(rot_rad)
+    m.A14 = radius * math.cos(angle_rad)
+    m.A24 = radius * math.sin(angle_rad)
+    return m
+
+
+def curved_matrix(angle, radius, x, y, inside=False, string_rotation=0.0):
+    """Matrix placing one glyph of a string bent onto a circle of `radius`.
+
+    The string's origin is at `angle` degrees; the glyph sits `x` along
+    its baseline and `y` above it, and `x` is turned into an angle by arc
+    length on the glyph's own baseline radius. Outside reading runs
+    clockwise with the glyph tops facing out, like a tangential string;
+    inside reading runs counter-clockwise with the tops facing the center.
+    """
+    if inside:
+        baseline = radius - y
+        direction = 1.0
+        rot_deg = 90.0
+    else:
+        baseline = radius + y
+        direction = -1.0
+        rot_deg = -90.0
+
+    if baseline > 1e-9:
+        angle += direction * math.degrees(x / baseline)
+    rot_deg += angle + string_rotation
+
+    angle_rad = math.radians(angle)
+    rot_rad = math.radians(rot_deg)
+
+    m = App.Matrix()
+    m.A11 = math.cos(rot_rad)
+    m.A12 = -math.sin(rot_rad)
+    m.A21 = math.sin(rot_rad)
+    m.A22 = math.cos(rot_rad)
+    m.A14 = baseline * math.cos(angle_rad)
+    m.A24 = baseline * math.sin(angle_rad)
+    return m
+
+
+def path_matrix(x, y, direction, lift=0.0):
+    """Matrix placing a glyph at (x, y) on a path heading `direction` degrees.
+
+    The glyph's baseline follows the path's direction there; `lift` moves
+    it off the path to the left of that direction, i.e. upwards for the
+    glyph.
+    """
+    rot_rad = math.radians(direction)
+    cos_r = math.cos(rot_rad)
+    sin_r = math.sin(rot_rad)
+
+    m = App.Matrix()
+    m.A11 = cos_r
+    m.A12 = -sin_r
+    m.A21 = sin_r
+    m.A22 = cos_r
+    m.A14 = x - sin_r * lift
+    m.A24 = y + cos_r * lift
+    return m
+
+
+def grid_positions(extents, columns, rows, column_offset, row_offset, use_bounding_box):
+    """Column X and row Y coordinates of a grid.
+
+    `extents` holds a (row, col, width, height) tuple for every occupied
+    cell. Returns `(col_x, row_y)` lists indexed by column and row. Row 0
+    sits at the insertion point and later rows step in -Y, so the grid
+    reads top to bottom like the row-major strings list.
+
+    With `use_bounding_box`, each column is as wide as its widest string
+    and each row as tall as its tallest, with the offsets added as gaps;
+    otherwise columns and rows sit at a fixed pitch.
+    """
+    if not use_bounding_box:
+        col_x = [col * column_offset for col in range(columns)]
+        row_y = [-row * row_offset for row in range(rows)]
+        return col_x, row_y
+
+    col_width = [0.0] * columns
+    row_height = [0.0] * rows
+    for row, col, width, height in extents:
+        col_width[col] = max(col_width[col], width)
+        row_height[row] = max(row_height[row], height)
+
+    col_x = []
+    cursor = 0.0
+    for col in range(columns):
+        col_x.append(cursor)
+        cursor += col_width[col] + column_offset
+
+    row_y = []
+    cursor = 0.0
+    for row in range(rows):
+        row_y.append(cursor)
+        cursor -= row_height[row] + row_offset
+
+    return col_x, row_y
+
+
+def shelf_positions(sizes, sheet_width, sheet_height, margin, spacing):
+    """Pack rectangles onto sheets, shelf by shelf.
+
+    `sizes` holds a (width, height) tuple per rectangle. Returns
+    `(positions, sheets)`: per rectangle, None when it does not fit on an
+    empty sheet, or else `(sheet, x, y)` of its top-left corner, with
+    (0, 0) the top-left corner of the sheet and -Y down it; and the
+    number of sheets used.
+
+    This is next-fit decreasing height: rectangles are taken tallest
+    first and placed left to right, `spacing` apart, on a shelf as tall
+    as its first one. One that does not fit the shelf's width starts a
+    new shelf below it, and one that does not fit below starts a new
+    sheet. `margin` is kept clear along the sheet's edges. Sorting is
+    the only O(n log n) step; placing is a single pass.
+    """
+    usable_width = sheet_width - 2 * margin
+    usable_height = sheet_height - 2 * margin
+    positions = [None] * len(sizes)
+    sheets = 0
+    # Cursor along the shelf, depth of the shelf's top, shelf height
+    x = top = shelf = 0.0
+    for index in sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0])):
+        width, height = sizes[index]
+        if width > usable_width or height > usable_height:
+            continue
+        if not sheets:
+            sheets = 1
+            x, top, shelf = 0.0, 0.0, height
+        elif x + width > usable_width:
+            x, top, shelf = 0.0, top + shelf + spacing, height
+            if top + shelf > usable_height:
+                sheets += 1
+                top = 0.0
+        positions[index] = (sheets - 1, margin + x, -(margin + top))
+        x += width + spacing
+    return positions, sheets
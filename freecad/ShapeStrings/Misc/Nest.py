@@ -0,0 +1,71 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Nest the strings of a GridShapeString onto sheets of stock.
+
+Tags cut from sheet material rarely share a length, and fixed rows and
+columns leave the space a short label does not use on the sheet. With
+`LayoutMode` Nest, each string's bounding rectangle is instead packed
+onto `SheetWidth` x `SheetHeight` sheets with `shelf_positions` (see
+`Misc/Layout.py`): `SheetMargin` is kept clear along each sheet's edges
+and `SheetSpacing` between labels. `Columns` and the offsets do not
+apply.
+
+Sheets are laid out side by side in +X, each `SheetWidth` along, with
+their top edge on the object's origin. The number of sheets and the share
+of their area covered by label rectangles are written to the read-only
+`SheetCount` and `Utilization` properties. Strings too big for an empty
+sheet are left out, with a warning.
+"""
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from .Commit import assignQuietly
+from .Layout import shelf_positions
+
+
+def is_nesting(obj):
+    """Whether `obj` packs its strings onto sheets."""
+    return getattr(obj, "LayoutMode", "Grid") == "Nest"
+
+
+def nest_offsets(obj, boxes):
+    """Translation moving each of `boxes` to its place on the sheets.
+
+    `boxes` are the strings' bounding boxes where they were rendered.
+    Returns an `App.Vector` per box, or None for one that does not fit a
+    sheet, and records the sheet count and utilization on `obj`.
+    """
+    sheet_width = float(obj.SheetWidth)
+    sheet_height = float(obj.SheetHeight)
+    sizes = [(box.XLength, box.YLength) for box in boxes]
+    positions, sheets = shelf_positions(
+        sizes, sheet_width, sheet_height, float(obj.SheetMargin), float(obj.SheetSpacing)
+    )
+
+    offsets = []
+    used = 0.0
+    skipped = 0
+    for box, (width, height), position in zip(boxes, sizes, positions):
+        if position is None:
+            offsets.append(None)
+            skipped += 1
+            continue
+        sheet, x, y = position
+        offsets.append(App.Vector(sheet * sheet_width + x - box.XMin, y - box.YMax, 0))
+        used += width * height
+
+    if skipped:
+        App.Console.PrintWarning(
+            translate("draft", "{}: {} strings are larger than a sheet and were left out").format(obj.Label, skipped)
+            + "\n"
+        )
+    area = sheets * sheet_width * sheet_height
+    utilization = round(100.0 * used / area, 2) if area > 0 else 0.0
+    if obj.SheetCount != sheets:
+        assignQuietly(obj, "SheetCount", sheets)
+    if obj.Utilization != utilization:
+        assignQuietly(obj, "Utilization", utilization)
+    return offsets
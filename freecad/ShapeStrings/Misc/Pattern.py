@@ -0,0 +1,205 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Strings described by a pattern instead of stored one by one.
+
+Serial numbers and scale labels used to be typed - or scripted - into
+`Strings` in full: "SN-00001" to "SN-05000" is five thousand entries saved
+in the file, copied into every undo step and re-serialised on every edit.
+A `Pattern` describes the same list in a few characters, using the brace
+range syntax of shells:
+
+    SN-{00001..05000}       SN-00001, SN-00002, ... SN-05000
+    {0..100..10} mm         0 mm, 10 mm, ... 100 mm
+    R{10..1..3}             R10, R7, R4, R1
+
+Text before and after the braces is a fixed prefix and suffix. The range
+is `{start..stop}` or `{start..stop..step}`; it includes `stop` when the
+step lands on it and counts down when `stop < start`, whatever the sign
+of the step. Leading zeros on either bound pad every number to that many
+digits, a minus sign coming on top: `{-05..05..5}` is -05, 00, 05.
+
+A pattern can hold several ranges, expanded like nested loops with the
+last range varying fastest: `{1..2}.{1..3}` gives 1.1, 1.2, 1.3, 2.1,
+2.2, 2.3.
+
+The strings are produced lazily by `expand_pattern`, at execute time, and
+are never stored. They are rendered exactly like stored `Strings`, so a
+pattern and the same strings typed out give the same shape.
+
+SpacedShapeString's scale label mode generates its strings the same way:
+`scale_labels` formats the values from `ScaleStart` to `ScaleStop` by
+`ScaleStep`, e.g. the numbers along a ruler.
+"""
+
+import re
+
+from itertools import product
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+
+_RANGE = re.compile(r"\{(-?\d+)\.\.(-?\d+)(?:\.\.(-?\d+))?\}")
+
+# Patterns longer than this are almost certainly a typo
+MAXIMUM_COUNT = 1000000
+
+
+def _width(bound):
+    digits = bound.lstrip("-")
+    return len(digits) if len(digits) > 1 and digits.startswith("0") else 0
+
+
+def _format(value, width):
+    digits = str(abs(value)).zfill(width)
+    return "-" + digits if value < 0 else digits
+
+
+def _count(ranges):
+    count = 1
+    for start, stop, step, _digits in ranges:
+        count *= (stop - start) // step + 1
+    return count
+
+
+def parse_pattern(pattern):
+    """Split `pattern` into its texts and its ranges.
+
+    Returns `(texts, ranges)`: the fixed texts around the ranges, one
+    more than there are ranges, and each range as (start, stop, step,
+    width). Raises ValueError, with a message for the user, if it is
+    malformed.
+    """
+    texts, ranges = [], []
+    position = 0
+    for match in _RANGE.finditer(pattern):
+        start = int(match.group(1))
+        stop = int(match.group(2))
+        step = abs(int(match.group(3) or 1))
+        if step == 0:
+            raise ValueError(translate("draft", "Pattern '{}' has a step of 0").format(pattern))
+        if stop < start:
+            step = -step
+        width = max(_width(match.group(1)), _width(match.group(2)))
+        texts.append(pattern[position:match.start()])
+        ranges.append((start, stop, step, width))
+        position = match.end()
+    if not ranges:
+        raise ValueError(
+            translate("draft", "Pattern '{}' has no {{start..stop}} range").format(pattern)
+        )
+    texts.append(pattern[position:])
+    if _count(ranges) > MAXIMUM_COUNT:
+        raise ValueError(
+            translate("draft", "Pattern '{}' expands to more than {} strings").format(pattern, MAXIMUM_COUNT)
+        )
+    return texts, ranges
+
+
+def pattern_count(pattern):
+    """Number of strings `pattern` expands to."""
+    _texts, ranges = parse_pattern(pattern)
+    return _count(ranges)
+
+
+def expand_pattern(pattern):
+    """Yield the strings described by `pattern`, in order."""
+    texts, ranges = parse_pattern(pattern)
+    values = [
+        [_format(value, width) for value in range(start, stop + (1 if step > 0 else -1), step)]
+        for start, stop, step, width in ranges
+    ]
+    for numbers in product(*values):
+        parts = [texts[0]]
+        for number, text in zip(numbers, texts[1:]):
+            parts.extend((number, text))
+        yield "".join(parts)
+
+
+def scale_count(start, stop, step):
+    """Number of values from `start` to `stop` by `step`, both included."""
+    if step == 0:
+        return 1
+    if (stop - start) * step < 0:
+        return 0
+    # Tolerate rounding in (stop - start) / step, so 0..1 by 0.1 has 11
+    return int((stop - start) / step + 1e-9) + 1
+
+
+def scale_labels(start, stop, step, label_format):
+    """Yield each value from `start` to `stop` by `step`, formatted.
+
+    Values are computed as `start + i * step` rather than accumulated, so
+    long scales do not drift. `label_format` is a Python format string
+    such as "{:g}" or "{:.1f} mm".
+    """
+    for index in range(scale_count(start, stop, step)):
+        yield label_format.format(start + index * step)
+
+
+def check_scale(obj):
+    """Raise ValueError, with a message for the user, for unusable scale settings."""
+    try:
+        obj.ScaleFormat.format(0.0)
+    except (ValueError, IndexError, KeyError) as e:
+        raise ValueError(
+            translate("draft", "ScaleFormat '{}' cannot format a number: {}").format(obj.ScaleFormat, e)
+        )
+    if scale_count(float(obj.ScaleStart), float(obj.ScaleStop), float(obj.ScaleStep)) > MAXIMUM_COUNT:
+        raise ValueError(
+            translate("draft", "The scale has more than {} labels").format(MAXIMUM_COUNT)
+        )
+
+
+def is_scale(obj):
+    """Whether `obj` is a SpacedShapeString in scale label mode."""
+    return getattr(obj, "LabelMode", "Strings") == "Scale"
+
+
+def is_generated(obj):
+    """Whether `obj`'s strings are generated rather than stored."""
+    return bool(getattr(obj, "Pattern", "")) or is_scale(obj)
+
+
+def object_strings(obj):
+    """The strings `obj` renders: its scale labels, its expanded
+    `Pattern`, or its `Strings`.
+
+    A malformed pattern or format renders nothing; `string_count`
+    reports it.
+    """
+    if is_scale(obj):
+        try:
+            check_scale(obj)
+        except ValueError:
+            return iter(())
+        return scale_labels(float(obj.ScaleStart), float(obj.ScaleStop), float(obj.ScaleStep), obj.ScaleFormat)
+    pattern = getattr(obj, "Pattern", "")
+    if not pattern:
+        return obj.Strings
+    try:
+        parse_pattern(pattern)
+    except ValueError:
+        return iter(())
+    return expand_pattern(pattern)
+
+
+def string_count(obj):
+    """Number of strings `obj` renders, reporting a malformed `Pattern`."""
+    if is_scale(obj):
+        try:
+            check_scale(obj)
+        except ValueError as e:
+            App.Console.PrintError("{}: {}\n".format(obj.Label, e))
+            return 0
+        return scale_count(float(obj.ScaleStart), float(obj.ScaleStop), float(obj.ScaleStep))
+    pattern = getattr(obj, "Pattern", "")
+    if not pattern:
+        return len(obj.Strings)
+    try:
+        return pattern_count(pattern)
+    except ValueError as e:
+        App.Console.PrintError("{}: {}\n".format(obj.Label, e))
+        return 0
@@ -0,0 +1,236 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Live, wire-only preview of a task panel's layout.
+
+The task panels used to show nothing until OK, so every tweak of a radius,
+step or offset meant a full recompute of the real object. The preview
+instead draws the strings as plain outlines in a temporary Coin overlay,
+built from `GlyphCache` outlines (each distinct character is discretised
+once) and re-laid out with the same `Layout` rules the objects use. The
+document is never touched; faces, fusing and the real geometry only happen
+when the panel is accepted.
+
+Rebuilding is debounced - a burst of spin box changes triggers a single
+layout - and runs in small time slices, so a newer change simply abandons
+the layout still in progress.
+"""
+
+import math
+import time
+
+import PySide.QtCore as QtCore
+
+import FreeCAD as App
+
+from pivy import coin
+from draftguitools import gui_trackers
+
+from .Justify import justification_offset
+
+
+# Wait this long after the last change before laying out again (ms)
+DEBOUNCE_DELAY = 150
+
+# Work done per event loop turn while laying out (s)
+TIME_SLICE = 0.02
+
+
+def working_plane_rotation():
+    """Rotation of the current Draft working plane, for create-mode previews."""
+    try:
+        import WorkingPlane
+        return WorkingPlane.get_working_plane(update=False).get_placement().Rotation
+    except Exception:
+        return App.Rotation()
+
+
+def preview_settings(obj=None, justification="Bottom-Left"):
+    """The rendering properties a preview or estimate needs, from `obj` or defaults.
+
+    The create panels have no object yet, so they use the defaults the
+    objects themselves are created with.
+    """
+    if obj is None:
+        return {
+            "Tracking": 0.0,
+            "ScaleToSize": True,
+            "ObliqueAngle": 0.0,
+            "Justification": justification,
+            "JustificationReference": "Cap Height",
+            "KeepLeftMargin": False,
+            "MakeFace": True,
+            "Fuse": False,
+        }
+    return {
+        "Tracking": float(obj.Tracking),
+        "ScaleToSize": bool(obj.ScaleToSize),
+        "ObliqueAngle": float(obj.ObliqueAngle),
+        "Justification": obj.Justification,
+        "JustificationReference": obj.JustificationReference,
+        "KeepLeftMargin": bool(obj.KeepLeftMargin),
+        "MakeFace": bool(obj.MakeFace),
+        "Fuse": bool(obj.Fuse),
+    }
+
+
+def outline_string(cache, text, scale, oblique, justification, justification_reference,
+                   keep_left_margin, justification_cap_height):
+    """Outline one string, justified about its own origin.
+
+    Mirrors the object pipeline (scale, oblique shear, justification) on
+    discretised glyph outlines. Returns `(polylines, box)`, where `box` is
+    the justified string's App.BoundBox, or `([], None)` for a string with
+    no visible glyphs.
+    """
+    shear = 0.0
+    if oblique and -80 <= oblique <= 80:
+        shear = math.tan(math.radians(oblique))
+
+    polylines = []
+    for char, pen in cache.pens(text):
+        for outline in cache.outline(char):
+            polylines.append([((x + pen + shear * y) * scale, y * scale) for x, y in outline])
+
+    if not polylines:
+        return [], None
+
+    xs = [x for polyline in polylines for x, _y in polyline]
+    ys = [y for polyline in polylines for _x, y in polyline]
+    box = App.BoundBox(min(xs), min(ys), 0, max(xs), max(ys), 0)
+
+    vec = justification_offset(
+        box, justification_cap_height, justification, justification_reference, keep_left_margin
+    )
+    polylines = translate_polylines(polylines, vec.x, vec.y)
+    box.move(vec)
+    return polylines, box
+
+
+def translate_polylines(polylines, dx, dy):
+    """Return `polylines` shifted by (dx, dy)."""
+    if not dx and not dy:
+        return polylines
+    return [[(x + dx, y + dy) for x, y in polyline] for polyline in polylines]
+
+
+def transform_polylines(polylines, m):
+    """Return `polylines` mapped through the in-plane part of App.Matrix `m`."""
+    a11, a12, a14 = m.A11, m.A12, m.A14
+    a21, a22, a24 = m.A21, m.A22, m.A24
+    return [
+        [(a11 * x + a12 * y + a14, a21 * x + a22 * y + a24) for x, y in polyline]
+        for polyline in polylines
+    ]
+
+
+class OutlineTracker(gui_trackers.Tracker):
+    """A dashed set of polylines, placed by its own transform."""
+
+    def __init__(self):
+        self.transform = coin.SoTransform()
+        self.coords = coin.SoCoordinate3()
+        self.lines = coin.SoLineSet()
+        super().__init__(
+            dotted=True,
+            children=[self.transform, self.coords, self.lines],
+            name="ShapeStringsPreview",
+        )
+
+    def setPlacement(self, placement):
+        self.transform.translation.setValue(tuple(placement.Base))
+        self.transform.rotation.setValue(placement.Rotation.Q)
+
+    def update(self, polylines):
+        points = [(x, y, 0.0) for polyline in polylines for x, y in polyline]
+        counts = [len(polyline) for polyline in polylines]
+        self.lines.numVertices.setNum(0)
+        self.coords.point.setNum(len(points))
+        if points:
+            self.coords.point.setValues(0, len(points), points)
+            self.lines.numVertices.setValues(0, len(counts), counts)
+
+
+class StringsPreview:
+    """Debounced, cancellable outline preview for one task panel.
+
+    `schedule(factory)` (re)starts the debounce countdown. When it fires,
+    `factory()` is called for a generator yielding lists of polylines, one
+    list per string (or None, to offer a cancellation point). The
+    generator is advanced a time slice at a time; a new `schedule()` or
+    `cancel()` drops it wherever it is.
+    """
+
+    def __init__(self, delay=DEBOUNCE_DELAY):
+        self.tracker = None
+        self._placement = App.Placement()
+        self._factory = None
+        self._job = None
+        self._polylines = []
+
+        self._debounce = QtCore.QTimer()
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(delay)
+        QtCore.QObject.connect(self._debounce, QtCore.SIGNAL("timeout()"), self._start)
+
+        self._step = QtCore.QTimer()
+        self._step.setInterval(0)
+        QtCore.QObject.connect(self._step, QtCore.SIGNAL("timeout()"), self._advance)
+
+    def schedule(self, factory):
+        """Lay out again with `factory` once changes have settled."""
+        self.cancel()
+        self._factory = factory
+        self._debounce.start()
+
+    def cancel(self):
+        """Abandon any pending or running layout; the last one stays shown."""
+        self._debounce.stop()
+        self._step.stop()
+        self._job = None
+
+    def setPlacement(self, placement):
+        """Move the preview; cheap, so it is applied immediately."""
+        self._placement = placement
+        if self.tracker:
+            self.tracker.setPlacement(placement)
+
+    def remove(self):
+        """Cancel any layout and take the overlay out of the 3D view."""
+        self.cancel()
+        self._factory = None
+        if self.tracker:
+            self.tracker.finalize()
+            self.tracker = None
+
+    def _start(self):
+        if self._factory is None:
+            return
+        self._job = self._factory()
+        self._polylines = []
+        self._step.start()
+
+    def _advance(self):
+        deadline = time.perf_counter() + TIME_SLICE
+        try:
+            while time.perf_counter() < deadline:
+                polylines = next(self._job)
+                if polylines:
+                    self._polylines.extend(polylines)
+        except StopIteration:
+            self._step.stop()
+            self._job = None
+            self._show(self._polylines)
+        except Exception as e:
+            # Half-typed values and missing fonts are normal while editing;
+            # the preview just keeps showing the last good layout.
+            self._step.stop()
+            self._job = None
+            App.Console.PrintLog("ShapeStrings preview: {}\n".format(e))
+
+    def _show(self, polylines):
+        if self.tracker is None:
+            self.tracker = OutlineTracker()
+            self.tracker.setPlacement(self._placement)
+        self.tracker.update(polylines)
+        self.tracker.on()
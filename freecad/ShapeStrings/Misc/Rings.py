@@ -0,0 +1,179 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Concentric rings of strings in one RadialShapeString.
+
+A dial face has several rings of labels - major numerals, minor ticks, unit
+text - each on its own radius, at its own pitch and size. Those used to be
+separate RadialShapeStrings, each rendering its own glyphs and recomputing
+on its own. `RingCounts` instead splits the object's strings into rings,
+in order: the first `RingCounts[0]` strings are ring 0, the next
+`RingCounts[1]` ring 1, and so on. Strings past the last ring are not
+rendered.
+
+Each ring takes its radius, start angle, angle step, size and tangential
+setting from the matching entry of `RingRadii`, `RingStartAngles`,
+`RingAngleSteps`, `RingSizes` and `RingTangential`; a ring without an
+entry uses the object's own `Radius`, `StartAngle`, `AngleStep`, `Size`
+and `Tangential`. An empty `RingCounts` is the classic single ring.
+
+Strings sit `AngleStep` apart, or, with `Distribution` Even, are spread
+over `ArcSpan` with equal gaps between them, measured from the glyph
+cache's advance widths before anything is rendered.
+
+Rings are rendered string by string like a single ring, at the ring's
+size, so adding a ring never moves the glyphs of another. Rendered
+strings are kept between recomputes (see `Misc/Dedup.py`), so editing
+one ring only renders its changed strings again. Curved text is placed
+glyph by glyph instead (see `Misc/Instances.py`); each ring's placed
+glyphs are then kept with a `ring_signature`, and only rings whose
+signature changed are laid out again.
+"""
+
+import math
+
+from .Glyphs import get_glyph_cache
+from .Layout import distributed_angles, radial_angle
+from .Pattern import object_strings
+
+
+# Properties every ring shares; a change to one of them invalidates all rings
+SHARED_PROPERTIES = (
+    "FontFile",
+    "Tracking",
+    "Justification",
+    "JustificationReference",
+    "KeepLeftMargin",
+    "ScaleToSize",
+    "ObliqueAngle",
+    "MakeFace",
+    "Fuse",
+    "RotationDirection",
+    "StringRotation",
+    "CurvedText",
+    "Distribution",
+    "ArcSpan",
+)
+
+
+class Ring:
+    """One ring of a RadialShapeString: its strings and where they go.
+
+    `first` is the index of the ring's first string in the object's
+    string list, so `first + i` identifies the ring's i-th string.
+    """
+
+    def __init__(self, index, first, texts, radius, start_angle, angle_step, size, tangential):
+        self.index = index
+        self.first = first
+        self.texts = texts
+        self.radius = radius
+        self.start_angle = start_angle
+        self.angle_step = angle_step
+        self.size = size
+        self.tangential = tangential
+
+
+def is_curved(obj):
+    """Whether `obj` bends its strings glyph by glyph onto the arc."""
+    return getattr(obj, "CurvedText", "Off") != "Off"
+
+
+def is_even(obj):
+    """Whether `obj` spreads its strings by width instead of by AngleStep."""
+    return getattr(obj, "Distribution", "AngleStep") == "Even"
+
+
+def has_rings(obj):
+    """Whether `obj` splits its strings into rings."""
+    return bool(getattr(obj, "RingCounts", None))
+
+
+def _entry(values, index, default):
+    return values[index] if index < len(values) else default
+
+
+def object_rings(obj):
+    """The rings of a RadialShapeString, as a list of `Ring`.
+
+    Without `RingCounts` this is a single ring holding every string.
+    """
+    texts = list(object_strings(obj))
+    radius = float(obj.Radius)
+    start_angle = float(obj.StartAngle)
+    angle_step = float(obj.AngleStep)
+    size = float(obj.Size)
+    tangential = bool(obj.Tangential)
+
+    if not has_rings(obj):
+        return [Ring(0, 0, texts, radius, start_angle, angle_step, size, tangential)]
+
+    rings = []
+    first = 0
+    for index, count in enumerate(obj.RingCounts):
+        count = max(0, int(count))
+        rings.append(Ring(
+            index,
+            first,
+            texts[first:first + count],
+            float(_entry(obj.RingRadii, index, radius)),
+            float(_entry(obj.RingStartAngles, index, start_angle)),
+            float(_entry(obj.RingAngleSteps, index, angle_step)),
+            float(_entry(obj.RingSizes, index, size)) or size,
+            bool(_entry(obj.RingTangential, index, tangential)),
+        ))
+        first += count
+    return rings
+
+
+def ring_angles(obj, ring):
+    """Angle of each string slot of `ring`, in string order.
+
+    By `AngleStep`, this is where each string's origin goes; with
+    `Distribution` Even it is where its middle goes, see `anchor_angle`.
+    """
+    clockwise = getattr(obj, "RotationDirection", "CounterClockwise") == "Clockwise"
+    if not is_even(obj):
+        return [
+            radial_angle(index, ring.start_angle, ring.angle_step, clockwise)
+            for index in range(len(ring.texts))
+        ]
+    cache = get_glyph_cache(obj.FontFile, ring.size, float(obj.Tracking))
+    widths = [cache.width(text) for text in ring.texts]
+    return distributed_angles(widths, ring.radius, ring.start_angle, float(obj.ArcSpan), clockwise)
+
+
+def anchor_angle(obj, ring, angle, middle):
+    """Angle of a string's origin, for the slot angle `ring_angles` gave it.
+
+    `middle` is the distance from the string's origin to its middle,
+    along the baseline. Only evenly distributed strings that follow the
+    arc are shifted; others keep their slot angle.
+    """
+    if not is_even(obj) or ring.radius <= 0:
+        return angle
+    if is_curved(obj):
+        # Outside reading runs clockwise, inside counter-clockwise
+        reading = 1.0 if obj.CurvedText == "Inside" else -1.0
+    elif ring.tangential:
+        reading = -1.0
+    else:
+        return angle
+    return angle - reading * math.degrees(middle / ring.radius)
+
+
+def ring_signature(obj, ring):
+    """Everything `ring`'s placed glyphs depend on, for comparison."""
+    shared = []
+    for name in SHARED_PROPERTIES:
+        value = getattr(obj, name, None)
+        shared.append(value if isinstance(value, (str, bool, int, float)) else str(value))
+    return (
+        tuple(shared),
+        tuple(ring.texts),
+        ring.radius,
+        ring.start_angle,
+        ring.angle_step,
+        ring.size,
+        ring.tangential,
+    )
@@ -0,0 +1,126 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Bind a ShapeString's `Strings` to a Spreadsheet range.
+
+Labels driven from a spreadsheet - part numbers, computed dimensions -
+used to be copied into `Strings` by hand or by a macro. With `Spreadsheet`
+linking a sheet and `SpreadsheetRange` naming its cells, such as "A1:A500"
+or "B2:D20", the range's computed values are copied into `Strings` at the
+start of every recompute instead, read row by row. The link makes the
+ShapeString recompute after the sheet does.
+
+The copy is compared with the current `Strings` first: unchanged ranges
+leave `Strings` alone, and a change logs which entries differ. Together
+with the rendered strings kept between recomputes (see `Misc/Dedup.py`)
+only the changed entries are rendered again, and the rest only re-laid
+out.
+
+A `Pattern` or scale labels still take precedence over `Strings`.
+"""
+
+import re
+
+import FreeCAD as App
+
+from draftutils.translate import translate
+
+from .Commit import assignQuietly
+
+
+CELL = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+
+def is_bound(obj):
+    """Whether `obj` takes its strings from a spreadsheet range."""
+    return getattr(obj, "Spreadsheet", None) is not None and bool(getattr(obj, "SpreadsheetRange", ""))
+
+
+def _column_index(letters):
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def _column_letters(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord("A") + rest) + letters
+    return letters
+
+
+def _parse_cell(text):
+    match = CELL.match(text.strip())
+    if not match:
+        raise ValueError(translate("draft", "'{}' is not a cell address").format(text.strip()))
+    return int(match.group(2)) - 1, _column_index(match.group(1))
+
+
+def range_addresses(cell_range):
+    """The cell addresses of a range such as "A1:C10", row by row.
+
+    A single address is a range of one cell. Raises ValueError for a
+    malformed range.
+    """
+    first, _sep, last = cell_range.partition(":")
+    top, left = _parse_cell(first)
+    bottom, right = _parse_cell(last) if last else (top, left)
+    top, bottom = min(top, bottom), max(top, bottom)
+    left, right = min(left, right), max(left, right)
+    return [
+        "{}{}".format(_column_letters(col), row + 1)
+        for row in range(top, bottom + 1)
+        for col in range(left, right + 1)
+    ]
+
+
+def cell_text(sheet, address):
+    """The computed value of a cell as label text, "" for an empty cell."""
+    if not sheet.getContents(address):
+        return ""
+    try:
+        value = sheet.get(address)
+    except (ValueError, RuntimeError):
+        return ""
+    if hasattr(value, "UserString"):
+        return value.UserString
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def sync_strings(obj):
+    """Copy `obj`'s bound range into its `Strings`.
+
+    Returns the indices of the entries that changed; nothing changes for
+    an unbound object, or when the range cannot be read (reported).
+    """
+    if not is_bound(obj):
+        return []
+    sheet = obj.Spreadsheet
+    if sheet.TypeId != "Spreadsheet::Sheet":
+        App.Console.PrintError(
+            translate("draft", "{}: Spreadsheet must link a spreadsheet").format(obj.Label) + "\n"
+        )
+        return []
+    try:
+        addresses = range_addresses(obj.SpreadsheetRange)
+    except ValueError as e:
+        App.Console.PrintError("{}: {}\n".format(obj.Label, e))
+        return []
+
+    texts = [cell_text(sheet, address) for address in addresses]
+    current = list(obj.Strings)
+    changed = [
+        index for index in range(max(len(texts), len(current)))
+        if index >= len(texts) or index >= len(current) or texts[index] != current[index]
+    ]
+    if changed:
+        App.Console.PrintLog(
+            "{}: {} of {} strings changed in {}\n".format(obj.Label, len(changed), len(texts), sheet.Label)
+        )
+        assignQuietly(obj, "Strings", texts)
+    return changed
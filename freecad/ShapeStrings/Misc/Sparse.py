@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Sparse storage for the cells of a GridShapeString.
+
+A GridShapeString reads `Strings` row-major, so an empty cell is a blank
+entry: a 200 x 200 grid with a few hundred labels stores, iterates and
+shows 40 000 of them. With `StringRows` and `StringColumns` set, `Strings`
+only holds the occupied cells instead, `Strings[i]` going to row
+`StringRows[i]`, column `StringColumns[i]`. Entries past the shortest of
+the three lists, or at a negative row or column, are ignored, and the
+grid is as wide as `Columns` or its rightmost cell, whichever is more.
+Rendering, the edit panel and the API then cost as much as the occupied
+cells, not the whole grid.
+
+A `Pattern` always fills the grid row-major.
+"""
+
+from .Pattern import is_generated, object_strings
+
+
+def is_sparse(obj):
+    """Whether `obj` stores its strings as (row, col, text) cells."""
+    return bool(getattr(obj, "StringRows", None)) and not is_generated(obj)
+
+
+def cell_positions(obj, count):
+    """(row, col) of each of the first `count` strings of `obj`.
+
+    Sparse objects may have fewer positions than strings, and None for a
+    cell they cannot place; those strings are not placed.
+    """
+    if is_sparse(obj):
+        return [
+            (row, col) if row >= 0 and col >= 0 else None
+            for row, col in list(zip(obj.StringRows, obj.StringColumns))[:count]
+        ]
+    columns = max(1, int(obj.Columns))
+    return [divmod(index, columns) for index in range(count)]
+
+
+def indexed_cells(obj):
+    """Yield `(index, row, col, text)` for every cell of `obj`, `index`
+    being the cell's position in the string list.
+
+    Dense grids include their blank entries.
+    """
+    if is_sparse(obj):
+        for index, (row, col, text) in enumerate(zip(obj.StringRows, obj.StringColumns, obj.Strings)):
+            if row >= 0 and col >= 0:
+                yield index, row, col, text
+        return
+    columns = max(1, int(obj.Columns))
+    for index, text in enumerate(object_strings(obj)):
+        row, col = divmod(index, columns)
+        yield index, row, col, text
+
+
+def grid_cells(obj):
+    """Yield `(row, col, text)` for every cell of `obj`, in string order.
+
+    Dense grids include their blank entries.
+    """
+    for _index, row, col, text in indexed_cells(obj):
+        yield row, col, text
+
+
+def grid_columns(obj, positions):
+    """Number of columns of a grid whose cells are at `positions`."""
+    return max([int(obj.Columns), 1] + [position[1] + 1 for position in positions if position])
+
+
+def sparse_cells(texts, columns):
+    """The non-blank entries of a row-major list, as (row, col, text)."""
+    columns = max(1, int(columns))
+    return [(*divmod(index, columns), text) for index, text in enumerate(texts) if text]
+
+
+def dense_strings(cells, columns):
+    """Row-major list of `cells`, with blanks for the empty positions.
+
+    Cells beyond the last column are dropped; trailing blanks are not
+    kept.
+    """
+    columns = max(1, int(columns))
+    placed = {row * columns + col: text for row, col, text in cells if 0 <= col < columns and row >= 0 and text}
+    texts = [""] * (max(placed) + 1 if placed else 0)
+    for index, text in placed.items():
+        texts[index] = text
+    return texts
@@ -60,6 +60,27 @@ def compute_measured_cap_height(font_file, size, tracking):
     return Part.Compound(cap_char).BoundBox.YMax
 
 
+def font_can_fill(font_file):
+    """Whether the font's glyphs can be filled with faces.
+
+    Tests a simple letter: "sticky" (single stroke) fonts produce open or
+    degenerate outlines that must be kept as wires.
+    """
+    char = Part.makeWireString("L", font_file, 1, 0)[0]
+    probe_shapes = make_faces(char)
+    if not probe_shapes:
+        return False
+    # The area threshold is scaled by glyph size so it behaves
+    # consistently across fonts/sizes (FreeCAD issue #21501).
+    char_comp = Part.Compound(char)
+    factor = 1 / char_comp.BoundBox.YLength
+    return sum(shape.Area for shape in probe_shapes) > (0.03 / factor**2) and math.isclose(
+        char_comp.BoundBox.DiagonalLength,
+        Part.Compound(probe_shapes).BoundBox.DiagonalLength,
+        rel_tol=1e-7,
+    )
+
+
 def make_faces(wire_char):
     """Create faces from a wire character representation.
 
@@ -105,6 +126,20 @@ def make_faces(wire_char):
     return built_faces
 
 
+def fuse_faces(shapes):
+    """Fuse the faces of one string, as `Fuse` renders it.
+
+    Returns the sub-shapes of the fused, concatenated result.
+    """
+    fused = shapes[0].fuse(shapes[1:])
+    fused = draft_faces.concatenate(fused)
+    # concatenate() can collapse a single-face compound into a bare
+    # Face, but callers rely on `.SubShapes`.
+    if fused.ShapeType == "Face":
+        fused = Part.Compound([fused])
+    return fused.SubShapes
+
+
 def build_string_shape(
     string_text,
     font_file,
@@ -131,23 +166,7 @@ def build_string_shape(
     if not string_text:
         return []
 
-    fill = make_face
-    if fill is True:
-        # Test a simple letter to know if we have a sticky font or not.
-        char = Part.makeWireString("L", font_file, 1, 0)[0]
-        probe_shapes = make_faces(char)
-        if not probe_shapes:
-            fill = False
-        else:
-            # The area threshold is scaled by glyph size so it behaves
-            # consistently across fonts/sizes (FreeCAD issue #21501).
-            char_comp = Part.Compound(char)
-            factor = 1 / char_comp.BoundBox.YLength
-            fill = sum(shape.Area for shape in probe_shapes) > (0.03 / factor**2) and math.isclose(
-                char_comp.BoundBox.DiagonalLength,
-                Part.Compound(probe_shapes).BoundBox.DiagonalLength,
-                rel_tol=1e-7,
-            )
+    fill = make_face and font_can_fill(font_file)
 
     chars = Part.makeWireString(string_text, font_file, size, tracking)
     string_shapes = []
@@ -161,12 +180,7 @@ def build_string_shape(
         return []
 
     if fill and fuse:
-        ss_shape = string_shapes[0].fuse(string_shapes[1:])
-        ss_shape = draft_faces.concatenate(ss_shape)
-        # concatenate() can collapse a single-face compound into a bare
-        # Face, but the code below relies on `.SubShapes`.
-        if ss_shape.ShapeType == "Face":
-            ss_shape = Part.Compound([ss_shape])
+        ss_shape = Part.Compound(fuse_faces(string_shapes))
     else:
         ss_shape = Part.Compound(string_shapes)
 
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Which part of a ShapeString's shape belongs to which string.
+
+A ShapeString's shape is one flat compound, so "the geometry of string
+#417" used to mean rendering it again or guessing from the face order -
+and the order shifts as soon as a blank string renders nothing or `Fuse`
+merges a string's glyphs into fewer faces.
+
+Every render therefore returns one sub-compound per string, blank strings
+included as empty compounds (see `string_compound`). `assign_strings`
+flattens that into the object's shape and records three offset lists
+alongside it, in the `Result` group: string i's sub-shapes, faces and
+edges are `StringStarts[i]`, `StringFaces[i]` and `StringEdges[i]` up to
+the next string's entry. The lists are written together with the shape,
+so a background render never leaves them describing another shape.
+`string_shape` and `string_at` then answer from the lists without a
+recompute.
+
+Faces and edges are counted per string. Two strings whose geometry lands
+on exactly the same spot share their faces in `Shape.Faces`, which shifts
+the later indices; this does not happen in practice.
+"""
+
+from bisect import bisect_right
+
+import Part
+
+from .Commit import assignQuietly
+
+
+def string_compound(parts, count=0):
+    """Compound with one sub-compound per string.
+
+    `parts` maps a string index to the list of its shapes; strings up to
+    `count`, or the highest index, without shapes get an empty compound.
+    Returns None when no string has any shapes.
+    """
+    if not any(parts.values()):
+        return None
+    count = max(count, max(parts) + 1)
+    return Part.Compound([Part.Compound(parts.get(index, [])) for index in range(count)])
+
+
+def assign_strings(obj, shape, count):
+    """Give `obj` the flattened `shape` and record where each string is.
+
+    `shape` comes from `string_compound`; `count` is the number of
+    strings of `obj`, trailing strings past the shape's being empty.
+    """
+    children = []
+    starts, faces, edges = [0], [0], [0]
+    for string in shape.childShapes():
+        children.extend(string.childShapes())
+        starts.append(len(children))
+        faces.append(faces[-1] + len(string.Faces))
+        edges.append(edges[-1] + len(string.Edges))
+    for offsets in (starts, faces, edges):
+        offsets.extend([offsets[-1]] * (count + 1 - len(offsets)))
+
+    obj.Shape = Part.Compound(children)
+    for name, offsets in (("StringStarts", starts), ("StringFaces", faces), ("StringEdges", edges)):
+        if list(getattr(obj, name)) != offsets:
+            assignQuietly(obj, name, offsets)
+
+
+def _is_current(obj):
+    starts = obj.StringStarts
+    return bool(starts) and starts[-1] == len(obj.Shape.childShapes())
+
+
+def string_shape(obj, index):
+    """Compound of the shapes of string `index` of `obj`.
+
+    The compound is empty for a string that renders nothing. Returns None
+    for an index out of range, or when the shape was not rendered with a
+    string map (e.g. before its first recompute).
+    """
+    starts = obj.StringStarts
+    if not 0 <= index < len(starts) - 1 or not _is_current(obj):
+        return None
+    return Part.Compound(obj.Shape.childShapes()[starts[index]:starts[index + 1]])
+
+
+def string_at(obj, subname):
+    """Index of the string that sub-element `subname` of `obj` belongs to.
+
+    `subname` is a selection name such as "Face12" or "Edge3". Returns
+    None for other sub-elements, or ones outside the string map.
+    """
+    for prefix, offsets in (("Face", obj.StringFaces), ("Edge", obj.StringEdges)):
+        if subname.startswith(prefix) and subname[len(prefix):].isdigit():
+            position = int(subname[len(prefix):]) - 1
+            if not offsets or not 0 <= position < offsets[-1]:
+                return None
+            return bisect_right(offsets, position) - 1
+    return None
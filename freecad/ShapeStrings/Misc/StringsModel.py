@@ -0,0 +1,369 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Model/view backing for the task panels' strings editors.
+
+The Spaced and Radial dialogs used to create one QListWidgetItem per
+string, and the Grid dialog one QTableWidgetItem per cell - rebuilding the
+whole table every time `Columns` changed. With tens of thousands of entries
+that froze the panel both on open and on every reshape.
+
+`StringsTableModel` instead keeps the strings in a single flat, row-major
+Python list and only *presents* it as a `columns`-wide table. The view asks
+for the cells it actually paints, and changing the column count just
+changes the index arithmetic - nothing is copied or rebuilt.
+
+The Grid dialog uses `CellsTableModel`, which keeps only the occupied
+cells, keyed by row and column: a large, mostly empty grid then costs as
+much as its labels (see `Misc/Sparse.py`).
+"""
+
+import csv
+
+import PySide.QtCore as QtCore
+
+
+def _read_csv(path):
+    """Rows of stripped cells of a CSV file, sniffing its delimiter."""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        dialect = csv.excel
+        sample = handle.read(4096)
+        handle.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            pass
+        return [[cell.strip() for cell in row] for row in csv.reader(handle, dialect)]
+
+
+class StringsTableModel(QtCore.QAbstractTableModel):
+    """A flat, row-major list of strings shown as a `columns`-wide table.
+
+    With `columns == 1` this is a plain list, which is how the Spaced and
+    Radial dialogs use it (a QListView only shows column 0).
+    """
+
+    def __init__(self, texts=None, columns=1, parent=None):
+        super().__init__(parent)
+        self._texts = list(texts) if texts else []
+        self._columns = max(1, int(columns))
+
+    # -- QAbstractTableModel interface -------------------------------------
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return max(1, -(-len(self._texts) // self._columns))
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._columns
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            flat = self.flatIndex(index)
+            return self._texts[flat] if flat < len(self._texts) else ""
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        flat = self.flatIndex(index)
+        if flat >= len(self._texts):
+            # Editing a padding cell past the end of the list materialises
+            # the blanks in between, so row-major positions are preserved.
+            self._texts.extend([""] * (flat + 1 - len(self._texts)))
+        self._texts[flat] = str(value)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+
+    # -- Shape ---------------------------------------------------------------
+
+    def columns(self):
+        return self._columns
+
+    def setColumns(self, columns):
+        """Reflow the same list into a different number of columns."""
+        columns = max(1, int(columns))
+        if columns == self._columns:
+            return
+        self.beginResetModel()
+        self._columns = columns
+        self.endResetModel()
+
+    def flatIndex(self, index):
+        """Return the position in the flat list that `index` refers to."""
+        return index.row() * self._columns + index.column()
+
+    # -- Bulk access ---------------------------------------------------------
+
+    def texts(self):
+        """Return a copy of the flat, row-major list (blanks kept)."""
+        return list(self._texts)
+
+    def setTexts(self, texts):
+        """Replace the whole list in one model reset."""
+        self.beginResetModel()
+        self._texts = list(texts)
+        self.endResetModel()
+
+    def appendRow(self, text=""):
+        """Append one row: a single entry in list mode, a row of blanks otherwise."""
+        row = self.rowCount()
+        if self._columns == 1:
+            # A list always shows at least one (possibly virtual) row, so an
+            # empty list gains its first real entry without growing.
+            if self._texts:
+                self.beginInsertRows(QtCore.QModelIndex(), row, row)
+                self._texts.append(text)
+                self.endInsertRows()
+                return self.index(row, 0)
+            self._texts.append(text)
+            top = self.index(0, 0)
+            self.dataChanged.emit(top, top)
+            return top
+
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._texts.extend([""] * (row * self._columns - len(self._texts)))
+        self._texts.extend([text] + [""] * (self._columns - 1))
+        self.endInsertRows()
+        return self.index(row, 0)
+
+    def removeRow(self, row, parent=QtCore.QModelIndex()):
+        """Remove one row; later entries move up by a full row."""
+        if row < 0 or row >= self.rowCount() or self.rowCount() <= 1:
+            return False
+        self.beginRemoveRows(parent, row, row)
+        del self._texts[row * self._columns:(row + 1) * self._columns]
+        self.endRemoveRows()
+        return True
+
+    def pasteText(self, text, index):
+        """Paste tab/newline separated text starting at `index`.
+
+        In list mode every pasted cell becomes its own entry. In grid mode
+        the pasted block keeps its shape; cells that would fall beyond the
+        last column are dropped. Returns the number of dropped cells.
+        """
+        rows = [line.split("\t") for line in text.splitlines()]
+        if not rows:
+            return 0
+
+        start = self.flatIndex(index) if index.isValid() else 0
+        updates = {}
+        dropped = 0
+        if self._columns == 1:
+            cells = [cell for row in rows for cell in row]
+            for offset, cell in enumerate(cells):
+                updates[start + offset] = cell
+        else:
+            start_row, start_col = divmod(start, self._columns)
+            for r, row in enumerate(rows):
+                for c, cell in enumerate(row):
+                    if start_col + c >= self._columns:
+                        dropped += 1
+                        continue
+                    updates[(start_row + r) * self._columns + start_col + c] = cell
+
+        last = max(updates)
+        texts = self._texts
+        if last >= len(texts):
+            texts = texts + [""] * (last + 1 - len(texts))
+        else:
+            texts = list(texts)
+        for flat, cell in updates.items():
+            texts[flat] = cell.strip()
+        self.setTexts(texts)
+        return dropped
+
+    def importCsv(self, path):
+        """Replace the contents with a CSV file.
+
+        In list mode every non-blank cell becomes an entry, read row by row.
+        In grid mode the CSV's own shape is kept: the column count becomes
+        the widest CSV row, and short rows are padded with blanks.
+        """
+        rows = _read_csv(path)
+
+        if self._columns == 1:
+            self.setTexts([cell for row in rows for cell in row if cell])
+            return
+
+        width = max((len(row) for row in rows), default=1)
+        texts = []
+        for row in rows:
+            texts.extend(row + [""] * (width - len(row)))
+        self.beginResetModel()
+        self._columns = max(1, width)
+        self._texts = texts
+        self.endResetModel()
+
+
+class CellsTableModel(QtCore.QAbstractTableModel):
+    """Grid cells kept as a `{(row, col): text}` dict, shown as a table.
+
+    Only non-blank cells are stored. With `rowMajor` set the cells stand
+    for a row-major list, and changing the column count reflows them like
+    `StringsTableModel`; otherwise every cell keeps its row and column,
+    and the table is never narrower than its rightmost cell.
+    """
+
+    def __init__(self, cells=None, columns=1, rowMajor=True, parent=None):
+        super().__init__(parent)
+        self._cells = {(int(row), int(col)): text for row, col, text in cells or () if text}
+        self._columns = max(1, int(columns))
+        self._rows = 1
+        self._span = 1
+        self.rowMajor = rowMajor
+        self._measure()
+
+    def _measure(self):
+        """Grow the table to hold every cell."""
+        self._rows = max([self._rows] + [row + 1 for row, _col in self._cells])
+        self._span = max([1] + [col + 1 for _row, col in self._cells])
+
+    # -- QAbstractTableModel interface -------------------------------------
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._rows
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.columns()
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self._cells.get((index.row(), index.column()), "")
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        key = (index.row(), index.column())
+        text = str(value)
+        if text.strip():
+            self._cells[key] = text
+        else:
+            self._cells.pop(key, None)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable
+
+    # -- Shape ---------------------------------------------------------------
+
+    def columns(self):
+        return self._columns if self.rowMajor else max(self._columns, self._span)
+
+    def setColumns(self, columns):
+        """Change the column count, reflowing the cells in row-major mode."""
+        columns = max(1, int(columns))
+        if columns == self._columns:
+            return
+        self.beginResetModel()
+        if self.rowMajor:
+            old = self._columns
+            self._cells = {
+                divmod(row * old + col, columns): text for (row, col), text in self._cells.items()
+            }
+            self._rows = max(1, -(-self._rows * old // columns))
+        self._columns = columns
+        self._measure()
+        self.endResetModel()
+
+    def setRowMajor(self, rowMajor):
+        """Switch between reflowing and fixed cells; the cells stay put."""
+        self.beginResetModel()
+        self.rowMajor = bool(rowMajor)
+        if self.rowMajor and self._span > self._columns:
+            self._columns = self._span
+        self.endResetModel()
+
+    # -- Bulk access ---------------------------------------------------------
+
+    def cells(self):
+        """Return the non-blank cells as (row, col, text), row-major."""
+        return [(row, col, self._cells[row, col]) for row, col in sorted(self._cells)]
+
+    def appendRow(self, text=""):
+        """Append a row of blanks, with `text` in its first cell."""
+        row = self._rows
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._rows += 1
+        if text:
+            self._cells[row, 0] = text
+        self.endInsertRows()
+        return self.index(row, 0)
+
+    def removeRow(self, row, parent=QtCore.QModelIndex()):
+        """Remove one row; later rows move up."""
+        if row < 0 or row >= self._rows or self._rows <= 1:
+            return False
+        self.beginRemoveRows(parent, row, row)
+        self._cells = {
+            (r - (r > row), col): text for (r, col), text in self._cells.items() if r != row
+        }
+        self._rows -= 1
+        self._measure()
+        self.endRemoveRows()
+        return True
+
+    def pasteText(self, text, index):
+        """Paste tab/newline separated text starting at `index`.
+
+        The pasted block keeps its shape; cells that would fall beyond
+        the last column are dropped. Returns the number of dropped cells.
+        """
+        rows = [line.split("\t") for line in text.splitlines()]
+        if not rows:
+            return 0
+        start_row, start_col = (index.row(), index.column()) if index.isValid() else (0, 0)
+        columns = self.columns()
+        dropped = 0
+        self.beginResetModel()
+        for r, row in enumerate(rows):
+            for c, cell in enumerate(row):
+                if start_col + c >= columns:
+                    dropped += 1
+                    continue
+                key = (start_row + r, start_col + c)
+                if cell.strip():
+                    self._cells[key] = cell.strip()
+                else:
+                    self._cells.pop(key, None)
+        self._rows = max(self._rows, start_row + len(rows))
+        self._measure()
+        self.endResetModel()
+        return dropped
+
+    def importCsv(self, path):
+        """Replace the contents with a CSV file, keeping its shape.
+
+        The column count becomes the widest CSV row; blank cells are not
+        stored.
+        """
+        rows = _read_csv(path)
+        self.beginResetModel()
+        self._cells = {
+            (r, c): cell for r, row in enumerate(rows) for c, cell in enumerate(row) if cell
+        }
+        self._columns = max([1] + [len(row) for row in rows])
+        self._rows = max(1, len(rows))
+        self._measure()
+        self.endResetModel()
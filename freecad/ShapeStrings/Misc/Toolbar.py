@@ -25,6 +25,24 @@ class Manipulator:
         },{
             'toolBar' : draft_creation_1_1,
             'append' : 'ShapeStrings_Grid'
+        },{
+            'toolBar' : draft_creation_1_0,
+            'append' : 'ShapeStrings_Path'
+        },{
+            'toolBar' : draft_creation_1_1,
+            'append' : 'ShapeStrings_Path'
+        },{
+            'toolBar' : draft_creation_1_0,
+            'append' : 'ShapeStrings_Multi'
+        },{
+            'toolBar' : draft_creation_1_1,
+            'append' : 'ShapeStrings_Multi'
+        },{
+            'toolBar' : draft_creation_1_0,
+            'append' : 'ShapeStrings_Engrave'
+        },{
+            'toolBar' : draft_creation_1_1,
+            'append' : 'ShapeStrings_Engrave'
         }]
 
 
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Word wrapping of GridShapeString cells.
+
+With a `CellWidth` set, each string is broken into lines no wider than it
+and the lines are stacked `LineSpacing` x `Size` apart inside the cell;
+with a `CellHeight` too, lines that do not fit below the first are
+dropped. Explicit newlines in a string always start a new line.
+
+Line breaks are found from the glyph cache's advance widths (see
+`Misc/Glyphs.py`) in one pass over the characters, with no geometry
+built during the search - only the final lines are rendered. Single
+characters' advances leave out pair kerning, which can tighten or widen
+a pair, so a rendered line may differ slightly from its measured width
+either way, and can exceed `CellWidth` by the kerning of its pairs.
+"""
+
+
+def break_lines(text, advance, width):
+    """Split `text` into lines at most `width` wide.
+
+    `advance(char)` is a character's advance width. Lines break at the
+    last space that fits; a word wider than a line is broken between
+    characters. Spaces at a break are dropped, and leading spaces before
+    a break never make an empty line of their own.
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        start = 0
+        line_width = 0.0
+        # Last space on the line, and the width of what follows it
+        space = None
+        after_space = 0.0
+        for index, char in enumerate(paragraph):
+            char_width = advance(char)
+            if char != " " and line_width + char_width > width and index > start:
+                if space is not None:
+                    # Leading spaces alone do not make a line
+                    if paragraph[start:space].strip():
+                        lines.append(paragraph[start:space].rstrip())
+                    start = space + 1
+                    line_width = after_space
+                    space = None
+                if line_width + char_width > width and index > start:
+                    lines.append(paragraph[start:index])
+                    start = index
+                    line_width = 0.0
+                after_space = line_width
+            line_width += char_width
+            if char == " ":
+                space = index
+                after_space = 0.0
+            else:
+                after_space += char_width
+        lines.append(paragraph[start:].rstrip())
+    return lines
+
+
+def line_offsets(count, pitch, justification):
+    """Y offset of each of `count` lines stacked `pitch` apart.
+
+    The block of lines sits on the string origin the way a single line
+    would for the vertical part of `justification`: its first line at
+    the top, its middle, or its last line at the bottom.
+    """
+    if "Top" in justification:
+        shift = 0.0
+    elif "Middle" in justification:
+        shift = (count - 1) * pitch / 2
+    else:
+        shift = (count - 1) * pitch
+    return [shift - line * pitch for line in range(count)]
+
+
+def is_wrapping(obj):
+    """Whether `obj` lays its strings out as wrapped lines."""
+    return float(getattr(obj, "CellWidth", 0.0)) > 0
+
+
+def cell_lines(obj, text, advance, cap_height):
+    """The lines of one cell, and whether some were dropped for `CellHeight`.
+
+    `advance(char)` is a character's advance in model units, and
+    `cap_height` the height of one line.
+    """
+    lines = break_lines(text, advance, float(obj.CellWidth))
+    pitch = line_pitch(obj)
+    cell_height = float(obj.CellHeight)
+    if cell_height > 0 and pitch > 0 and len(lines) > 1:
+        fit = max(1, int((cell_height - cap_height) // pitch) + 1)
+        if len(lines) > fit:
+            return lines[:fit], True
+    return lines, False
+
+
+def line_pitch(obj):
+    """Distance between the baselines of consecutive lines."""
+    return float(obj.LineSpacing) * float(obj.Size)
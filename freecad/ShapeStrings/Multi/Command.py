@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the GUI command to gather ShapeStrings into a MultiShapeString.
+
+Select Spaced, Radial and Grid ShapeStrings first to combine them; with
+nothing selected an example container is created.
+"""
+
+
+import FreeCAD as App
+import FreeCADGui as Gui
+
+from ..Misc.Resources import asIcon
+from draftutils import utils
+from draftutils.params import get_param
+
+from FreeCAD import Qt
+
+translate = Qt.translate
+
+
+SOURCE_TYPES = ("SpacedShapeString", "RadialShapeString", "GridShapeString")
+
+
+class MultiShapeString:
+    """Gui command for the MultiShapeString tool."""
+
+    def GetResources(self):
+        """Set icon, menu, and tooltip."""
+        return {
+            'Pixmap': asIcon('Multi'),
+            'MenuText': translate(
+                "ShapeStrings-Multi",
+                "Multi ShapeString"
+            ),
+            'ToolTip': translate(
+                "ShapeStrings-Multi",
+                "Creates one object holding many named groups of strings, "
+                "each Spaced, Radial or Grid, rendered together. "
+                "Select ShapeStrings first to combine them into groups."
+            ),
+        }
+
+    def IsActive(self):
+        return App.ActiveDocument is not None
+
+    def Activated(self):
+        """Execute when the command is called."""
+        sources = [
+            obj for obj in Gui.Selection.getSelection()
+            if utils.get_type(obj) in SOURCE_TYPES
+        ]
+
+        doc = App.ActiveDocument
+        doc.openTransaction(translate("draft", "Multi ShapeString"))
+        Gui.addModule("ShapeStrings")
+        if sources:
+            Gui.doCommand(
+                "ShapeStrings.Multi("
+                "Groups=[{}], "
+                "FontFile={!r}, "
+                "Size={})".format(
+                    ", ".join("FreeCAD.ActiveDocument.getObject('{}')".format(obj.Name) for obj in sources),
+                    sources[0].FontFile,
+                    float(sources[0].Size),
+                )
+            )
+            for obj in sources:
+                Gui.doCommand("FreeCAD.ActiveDocument.getObject('{}').Visibility = False".format(obj.Name))
+        else:
+            Gui.doCommand(
+                "ShapeStrings.Multi("
+                "Groups=["
+                "{{'Name': 'Row', 'Strings': ['A', 'B', 'C']}}, "
+                "{{'Name': 'Dial', 'Layout': 'Radial', 'Strings': ['1', '2', '3', '4'], "
+                "'Placement': FreeCAD.Placement(FreeCAD.Vector(0, -80, 0), FreeCAD.Rotation())}}], "
+                "FontFile={!r}, "
+                "Size={})".format(
+                    get_param("FontFile") or "",
+                    get_param("textheight") or 5,
+                )
+            )
+        doc.commitTransaction()
+        doc.recompute()
+
+
+def registerMulti():
+    Gui.addCommand('ShapeStrings_Multi', MultiShapeString())
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides functions to create MultiShapeString objects."""
+
+import FreeCAD as App
+import draftutils.gui_utils as gui_utils
+
+from draftutils import utils
+
+from ..Misc.Pattern import object_strings
+from ..Misc.Rings import object_rings
+from ..Misc.Sparse import dense_strings, grid_cells, is_sparse
+from .Object import MultiShapeString
+
+if App.GuiUp:
+    from .View import ViewProviderMultiShapeString
+
+
+# Group keys, the list property each one fills and the object's default
+GROUP_VALUES = (
+    ("Size", "GroupSizes", "Size"),
+    ("Offset", "GroupOffsets", "Offset"),
+    ("Columns", "GroupColumns", "Columns"),
+    ("RowOffset", "GroupRowOffsets", "RowOffset"),
+    ("Radius", "GroupRadii", "Radius"),
+    ("StartAngle", "GroupStartAngles", "StartAngle"),
+    ("AngleStep", "GroupAngleSteps", "AngleStep"),
+)
+
+
+def groups_of(source):
+    """The groups that reproduce a Spaced, Radial or Grid ShapeString.
+
+    A RadialShapeString gives one group per ring. Settings a group cannot
+    hold - scale labels' fixed pitch, curved text, wrapped or nested
+    Grid cells - fall back to the plain layout.
+    """
+    kind = utils.get_type(source)
+    name = source.Label
+    placement = App.Placement(source.Placement)
+    if kind == "SpacedShapeString":
+        return [{
+            "Name": name,
+            "Layout": "Spaced",
+            "Strings": list(object_strings(source)),
+            "Placement": placement,
+            "Size": float(source.Size),
+            "Offset": float(source.Offset),
+        }]
+    if kind == "RadialShapeString":
+        rings = object_rings(source)
+        return [{
+            "Name": name if len(rings) == 1 else "{} {}".format(name, ring.index),
+            "Layout": "Radial",
+            "Strings": list(ring.texts),
+            "Placement": placement,
+            "Size": ring.size,
+            "Radius": ring.radius,
+            "StartAngle": ring.start_angle,
+            "AngleStep": ring.angle_step,
+        } for ring in rings]
+    if kind == "GridShapeString":
+        columns = max(1, int(source.Columns))
+        if is_sparse(source):
+            cells = list(grid_cells(source))
+            columns = max([columns] + [col + 1 for _row, col, _text in cells])
+            strings = dense_strings(cells, columns)
+        else:
+            strings = list(object_strings(source))
+        return [{
+            "Name": name,
+            "Layout": "Grid",
+            "Strings": strings,
+            "Placement": placement,
+            "Size": float(source.Size),
+            "Offset": float(source.ColumnOffset),
+            "Columns": columns,
+            "RowOffset": float(source.RowOffset),
+        }]
+    return []
+
+
+def make_multishapestring(Groups,
+                          FontFile,
+                          Size=10,
+                          Tangential=True,
+                          UseBoundingBox=True):
+    """MultiShapeString(Groups,FontFile,[Size],[Tangential],[UseBoundingBox])
+
+    Turns many groups of text strings into a single Compound Shape, each
+    group laid out on its own and rendered in one pass with shared glyphs.
+
+    `Groups` is a list of dicts, one per group, with a "Strings" list and
+    optionally a "Name", a "Layout" ("Spaced", the default, "Radial" or
+    "Grid"), a "Placement", and the group's "Size", "Offset", "Columns",
+    "RowOffset", "Radius", "StartAngle" and "AngleStep"; missing values
+    use the object's. A Spaced, Radial or Grid ShapeString can stand in
+    for a dict, and is converted with `groups_of`.
+    """
+    if not App.ActiveDocument:
+        App.Console.PrintError("No active document. Aborting\n")
+        return
+
+    groups = []
+    for group in Groups:
+        groups.extend([group] if isinstance(group, dict) else groups_of(group))
+
+    obj = App.ActiveDocument.addObject(
+        "Part::Part2DObjectPython",
+        "MultiShapeString"
+    )
+    MultiShapeString(obj)
+
+    obj.FontFile = FontFile
+    obj.Size = Size
+    obj.Tangential = bool(Tangential)
+    obj.UseBoundingBox = bool(UseBoundingBox)
+
+    strings = []
+    for group in groups:
+        strings.extend(str(text) for text in group.get("Strings", ()))
+    obj.Strings = strings
+    obj.GroupCounts = [len(group.get("Strings", ())) for group in groups]
+    obj.GroupNames = [str(group.get("Name", "")) for group in groups]
+    obj.GroupLayouts = [str(group.get("Layout", "Spaced")) for group in groups]
+    obj.GroupPlacements = [App.Placement(group.get("Placement", App.Placement())) for group in groups]
+    for key, prop, default in GROUP_VALUES:
+        if any(key in group for group in groups):
+            value = 0 if key == "Size" else getattr(obj, default)
+            cast = int if key == "Columns" else float
+            setattr(obj, prop, [cast(group.get(key, value)) for group in groups])
+
+    if App.GuiUp:
+        ViewProviderMultiShapeString(obj.ViewObject)
+        gui_utils.format_object(obj)
+        gui_utils.select(obj)
+
+    obj.recompute()
+    return obj
@@ -0,0 +1,339 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the object code for the MultiShapeString object.
+
+A MultiShapeString holds many named layout groups - Spaced rows, Radial
+rings and Grids, each with its own strings, placement and layout
+settings - and renders them in one pass into one compound (see
+`Misc/Groups.py`). Every group takes its glyphs from the same `GlyphSet`,
+so a character is built once for the whole object rather than once per
+ShapeString, and a project with thousands of labels is one object in the
+tree with one recompute.
+
+Glyphs are placed as instances (see `Misc/Instances.py`), so `Fuse` does
+not apply. `GroupStarts` records where each group's shapes start in the
+compound; `Misc.Groups.group_shape` picks a group out by name.
+"""
+
+import FreeCAD as App
+
+from draftobjects.base import DraftObject
+from ..Misc.Background import OVER_BUDGET, PENDING, run_render
+from ..Misc.Estimate import check_budget
+from ..Misc.Extrude import solid_steps
+from ..Misc.Groups import record_starts
+from ..Misc.Instances import instanced_steps
+from ..Misc.Pattern import string_count
+from ..Misc.Sheet import sync_strings
+from ..Misc.StringMap import assign_strings, string_shape
+
+from FreeCAD import Qt
+
+translate = Qt.translate
+
+
+class MultiShapeString(DraftObject):
+    """The MultiShapeString object - renders many groups of strings, each with its own layout"""
+
+    def __init__(self, obj):
+        super().__init__(obj, "MultiShapeString")
+        self.set_properties(obj)
+
+    def set_properties(self, obj):
+        """Add properties to the object and set them."""
+        properties = obj.PropertiesList
+
+        if "Strings" not in properties:
+            _tip = translate("App::Property", "List of text strings of every group, group after group")
+            obj.addProperty("App::PropertyStringList", "Strings", "Draft", _tip)
+
+        if "Pattern" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Generate the strings from a pattern such as SN-{00001..05000} "
+                "or {0..100..10}mm instead of Strings (empty = use Strings)",
+            )
+            obj.addProperty("App::PropertyString", "Pattern", "Draft", _tip)
+
+        if "Spreadsheet" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Spreadsheet whose SpreadsheetRange is copied into Strings on every recompute",
+            )
+            obj.addProperty("App::PropertyLink", "Spreadsheet", "Draft", _tip)
+
+        if "SpreadsheetRange" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Cells of Spreadsheet to read the strings from, row by row, such as A1:A500 "
+                "(empty = use Strings as they are)",
+            )
+            obj.addProperty("App::PropertyString", "SpreadsheetRange", "Draft", _tip)
+
+        if "GroupCounts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Split the strings into groups: the number of strings "
+                "in each group, in order (empty = a single group)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "GroupCounts", "Draft", _tip)
+
+        if "GroupNames" not in properties:
+            _tip = translate("App::Property", "Name of each group (missing entries are numbered)")
+            obj.addProperty("App::PropertyStringList", "GroupNames", "Draft", _tip)
+
+        if "GroupLayouts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Layout of each group: Spaced, Radial or Grid (missing entries are Spaced)",
+            )
+            obj.addProperty("App::PropertyStringList", "GroupLayouts", "Draft", _tip)
+
+        if "GroupPlacements" not in properties:
+            _tip = translate("App::Property", "Placement of each group within the object (missing entries at the origin)")
+            obj.addProperty("App::PropertyPlacementList", "GroupPlacements", "Draft", _tip)
+
+        if "GroupSizes" not in properties:
+            _tip = translate("App::Property", "Text height of each group (missing or 0 entries use Size)")
+            obj.addProperty("App::PropertyFloatList", "GroupSizes", "Draft", _tip)
+
+        if "GroupOffsets" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Spacing between the strings (Spaced) or columns (Grid) of each group "
+                "(missing entries use Offset)",
+            )
+            obj.addProperty("App::PropertyFloatList", "GroupOffsets", "Draft", _tip)
+
+        if "GroupColumns" not in properties:
+            _tip = translate("App::Property", "Number of columns of each Grid group (missing entries use Columns)")
+            obj.addProperty("App::PropertyIntegerList", "GroupColumns", "Draft", _tip)
+
+        if "GroupRowOffsets" not in properties:
+            _tip = translate("App::Property", "Spacing between the rows of each Grid group (missing entries use RowOffset)")
+            obj.addProperty("App::PropertyFloatList", "GroupRowOffsets", "Draft", _tip)
+
+        if "GroupRadii" not in properties:
+            _tip = translate("App::Property", "Radius of each Radial group (missing entries use Radius)")
+            obj.addProperty("App::PropertyFloatList", "GroupRadii", "Draft", _tip)
+
+        if "GroupStartAngles" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Starting angle of each Radial group, in degrees (missing entries use StartAngle)",
+            )
+            obj.addProperty("App::PropertyFloatList", "GroupStartAngles", "Draft", _tip)
+
+        if "GroupAngleSteps" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Angular increment of each Radial group, in degrees (missing entries use AngleStep)",
+            )
+            obj.addProperty("App::PropertyFloatList", "GroupAngleSteps", "Draft", _tip)
+
+        if "Offset" not in properties:
+            _tip = translate("App::Property", "Default spacing between strings (Spaced) or columns (Grid)")
+            obj.addProperty("App::PropertyLength", "Offset", "Draft", _tip)
+            obj.Offset = 10.0
+
+        if "Columns" not in properties:
+            _tip = translate("App::Property", "Default number of columns of a Grid group")
+            obj.addProperty("App::PropertyInteger", "Columns", "Draft", _tip)
+            obj.Columns = 3
+
+        if "RowOffset" not in properties:
+            _tip = translate("App::Property", "Default spacing between the rows of a Grid group")
+            obj.addProperty("App::PropertyLength", "RowOffset", "Draft", _tip)
+            obj.RowOffset = 15.0
+
+        if "Radius" not in properties:
+            _tip = translate("App::Property", "Default distance from the center of a Radial group to the text baseline")
+            obj.addProperty("App::PropertyLength", "Radius", "Draft", _tip)
+            obj.Radius = 50.0
+
+        if "StartAngle" not in properties:
+            _tip = translate("App::Property", "Default starting angle of a Radial group (0° = +X axis)")
+            obj.addProperty("App::PropertyAngle", "StartAngle", "Draft", _tip)
+            obj.StartAngle = 0.0
+
+        if "AngleStep" not in properties:
+            _tip = translate("App::Property", "Default angular increment between the strings of a Radial group")
+            obj.addProperty("App::PropertyAngle", "AngleStep", "Draft", _tip)
+            obj.AngleStep = 30.0
+
+        if "Tangential" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Rotate the strings of Radial groups so their baseline is tangent to the arc",
+            )
+            obj.addProperty("App::PropertyBool", "Tangential", "Draft", _tip)
+            obj.Tangential = True
+
+        if "UseBoundingBox" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Use each string's bounding box to space Spaced and Grid groups, "
+                "adding the offsets as the gap",
+            )
+            obj.addProperty("App::PropertyBool", "UseBoundingBox", "Draft", _tip)
+            obj.UseBoundingBox = True
+
+        if "FontFile" not in properties:
+            _tip = translate("App::Property", "Font file name")
+            obj.addProperty("App::PropertyFile", "FontFile", "Draft", _tip)
+
+        if "Size" not in properties:
+            _tip = translate("App::Property", "Height of text")
+            obj.addProperty("App::PropertyLength", "Size", "Draft", _tip)
+
+        if "Justification" not in properties:
+            _tip = translate("App::Property", "Horizontal and vertical alignment")
+            obj.addProperty("App::PropertyEnumeration", "Justification", "Draft", _tip)
+            obj.Justification = ["Top-Left", "Top-Center", "Top-Right",
+                                 "Middle-Left", "Middle-Center", "Middle-Right",
+                                 "Bottom-Left", "Bottom-Center", "Bottom-Right"]
+            obj.Justification = "Bottom-Left"
+
+        if "JustificationReference" not in properties:
+            _tip = translate("App::Property", "Height reference used for justification")
+            obj.addProperty("App::PropertyEnumeration", "JustificationReference", "Draft", _tip)
+            obj.JustificationReference = ["Cap Height", "Shape Height"]
+            obj.JustificationReference = "Cap Height"
+
+        if "KeepLeftMargin" not in properties:
+            _tip = translate("App::Property", "Keep left margin and leading white space when justification is left")
+            obj.addProperty("App::PropertyBool", "KeepLeftMargin", "Draft", _tip)
+            obj.KeepLeftMargin = False
+
+        if "ScaleToSize" not in properties:
+            _tip = translate("App::Property", "Scale to ensure cap height is equal to size")
+            obj.addProperty("App::PropertyBool", "ScaleToSize", "Draft", _tip)
+            obj.ScaleToSize = True
+
+        if "Tracking" not in properties:
+            _tip = translate("App::Property", "Inter-character spacing")
+            obj.addProperty("App::PropertyDistance", "Tracking", "Draft", _tip)
+
+        if "ObliqueAngle" not in properties:
+            _tip = translate("App::Property", "Oblique (slant) angle")
+            obj.addProperty("App::PropertyAngle", "ObliqueAngle", "Draft", _tip)
+
+        if "MakeFace" not in properties:
+            _tip = translate("App::Property", "Fill letters with faces")
+            obj.addProperty("App::PropertyBool", "MakeFace", "Draft", _tip)
+            obj.MakeFace = True
+
+        if "Height" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Extrude each glyph into a solid of this height (0 = flat faces)",
+            )
+            obj.addProperty("App::PropertyDistance", "Height", "Draft", _tip)
+            obj.Height = 0.0
+
+        if "Taper" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Taper angle of the extruded sides; positive narrows the glyphs towards the top",
+            )
+            obj.addProperty("App::PropertyAngle", "Taper", "Draft", _tip)
+            obj.Taper = 0.0
+
+        if "BackgroundRecompute" not in properties:
+            _tip = translate("App::Property", "Render large string lists in the background, keeping the previous shape until done")
+            obj.addProperty("App::PropertyBool", "BackgroundRecompute", "Draft", _tip)
+            obj.BackgroundRecompute = True
+
+        if "TimeBudget" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Maximum recompute time in seconds; a recompute expected or found "
+                "to take longer is stopped and the previous shape kept (0 = no limit)",
+            )
+            obj.addProperty("App::PropertyFloat", "TimeBudget", "Draft", _tip)
+            obj.TimeBudget = 0.0
+
+        if "GroupStarts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first sub-shape of each group in the compound (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "GroupStarts", "Result", _tip)
+            obj.setEditorMode("GroupStarts", 1)
+
+        if "StringStarts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first sub-shape of each string in the compound, "
+                "plus the sub-shape count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringStarts", "Result", _tip)
+            obj.setEditorMode("StringStarts", 1)
+
+        if "StringFaces" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first face of each string in the shape, plus the face count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringFaces", "Result", _tip)
+            obj.setEditorMode("StringFaces", 1)
+
+        if "StringEdges" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first edge of each string in the shape, plus the edge count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringEdges", "Result", _tip)
+            obj.setEditorMode("StringEdges", 1)
+
+    def onDocumentRestored(self, obj):
+        super().onDocumentRestored(obj)
+        # Ensure all properties exist after document restoration
+        self.set_properties(obj)
+
+    def execute(self, obj):
+        """Generate the compound shape of every group, in one pass."""
+        if self.props_changed_placement_only():
+            obj.positionBySupport()
+            self.props_changed_clear()
+            return
+
+        sync_strings(obj)
+        count = string_count(obj)
+        if count and obj.FontFile:
+            plm = obj.Placement
+
+            estimate, message = check_budget(obj, "MultiShapeString")
+            if message:
+                shape = OVER_BUDGET
+                App.Console.PrintError(message + "\n")
+            else:
+                steps = instanced_steps(obj)
+                if obj.Height.Value:
+                    steps = solid_steps(obj, steps)
+                # Instanced glyphs cost differently from the estimate's
+                # model, so they are not timed to calibrate it
+                shape = run_render(obj, steps, count, "MultiShapeString")
+            if shape is PENDING or shape is OVER_BUDGET:
+                # Either rendering continues in the background, or it was
+                # refused or abandoned for the TimeBudget (already
+                # reported); the previous shape stays either way.
+                pass
+            elif shape is not None:
+                assign_strings(obj, shape, count)
+                record_starts(obj)
+            else:
+                App.Console.PrintWarning(translate("draft", "MultiShapeString: strings have no wires") + "\n")
+
+            obj.Placement = plm
+
+        obj.positionBySupport()
+        self.props_changed_clear()
+
+    def onChanged(self, obj, prop):
+        self.props_changed_store(prop)
+
+    def getStringShape(self, obj, index):
+        """Shapes of string `index`, without recomputing; see `Misc/StringMap.py`."""
+        return string_shape(obj, index)
@@ -0,0 +1,2 @@
+
+from .Command import registerMulti
\ No newline at end of file
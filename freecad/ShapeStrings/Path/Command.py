@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the GUI command to lay a ShapeString along a path.
+
+Select an edge, wire or sketch - or some edges of one object - first.
+"""
+
+
+import FreeCAD as App
+import FreeCADGui as Gui
+
+from ..Misc.Resources import asIcon
+from draftutils.messages import _err
+from draftutils.params import get_param
+
+from FreeCAD import Qt
+
+translate = Qt.translate
+
+
+class PathShapeString:
+    """Gui command for the PathShapeString tool."""
+
+    def GetResources(self):
+        """Set icon, menu, and tooltip."""
+        return {
+            'Pixmap': asIcon('Path'),
+            'MenuText': translate(
+                "ShapeStrings-Path",
+                "Path ShapeString"
+            ),
+            'ToolTip': translate(
+                "ShapeStrings-Path",
+                "Creates strings laid along an edge, wire or sketch, "
+                "each glyph turned to follow the path. "
+                "Select the path (or some of its edges) first."
+            ),
+        }
+
+    def IsActive(self):
+        return len(Gui.Selection.getSelectionEx()) == 1
+
+    def Activated(self):
+        """Execute when the command is called."""
+        selection = Gui.Selection.getSelectionEx()
+        if len(selection) != 1:
+            _err(translate("draft", "Select one edge, wire or sketch to lay the strings along") + "\n")
+            return
+        path = selection[0].Object
+        edges = [name for name in selection[0].SubElementNames if name.startswith("Edge")]
+        if not hasattr(path, "Shape") or not path.Shape.Edges:
+            _err(translate("draft", "PathShapeString: the selected object has no edges") + "\n")
+            return
+
+        doc = App.ActiveDocument
+        doc.openTransaction(translate("draft", "Path ShapeString"))
+        Gui.addModule("ShapeStrings")
+        Gui.doCommand(
+            "ShapeStrings.Path("
+            "Strings=['ShapeStrings'], "
+            "FontFile={!r}, "
+            "Path=(FreeCAD.ActiveDocument.getObject('{}'), {!r}), "
+            "Size={})".format(
+                get_param("FontFile") or "",
+                path.Name,
+                edges,
+                get_param("textheight") or 5,
+            )
+        )
+        doc.commitTransaction()
+        doc.recompute()
+
+
+def registerPath():
+    Gui.addCommand('ShapeStrings_Path', PathShapeString())
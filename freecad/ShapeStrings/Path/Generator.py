@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides functions to create PathShapeString objects."""
+
+import FreeCAD as App
+import draftutils.gui_utils as gui_utils
+
+from .Object import PathShapeString
+
+if App.GuiUp:
+    from .View import ViewProviderPathShapeString
+
+
+def make_pathshapestring(Strings,
+                         FontFile,
+                         Path,
+                         Size=5,
+                         Offset=10,
+                         StartOffset=0,
+                         UseBoundingBox=True,
+                         Reverse=False,
+                         Pattern=""):
+    """PathShapeString(Strings,FontFile,Path,
+                       [Size],[Offset],[StartOffset],[UseBoundingBox],[Reverse],[Pattern])
+
+    Turns a list of text strings into a single Compound Shape laid along
+    `Path`: an object with edges (an edge, wire or sketch), or an
+    `(object, ["Edge1", ...])` tuple to follow only some of its edges.
+
+    The first string starts `StartOffset` along the path and each next one
+    `Offset` further, measured edge to edge with `UseBoundingBox` and
+    origin to origin without. Every glyph is turned to the path's
+    direction where it sits; `Reverse` runs the strings from the end of
+    the path. A sketch's Placement is taken over so the text lies in its
+    plane.
+    """
+    if not App.ActiveDocument:
+        App.Console.PrintError("No active document. Aborting\n")
+        return
+
+    if not isinstance(Path, (tuple, list)):
+        Path = (Path, [])
+
+    obj = App.ActiveDocument.addObject(
+        "Part::Part2DObjectPython",
+        "PathShapeString"
+    )
+    PathShapeString(obj)
+
+    obj.Strings = list(Strings)
+    obj.Pattern = Pattern
+    obj.FontFile = FontFile
+    obj.Path = (Path[0], list(Path[1]))
+    obj.Size = Size
+    obj.Offset = Offset
+    obj.StartOffset = StartOffset
+    obj.UseBoundingBox = bool(UseBoundingBox)
+    obj.Reverse = bool(Reverse)
+    if Path[0].isDerivedFrom("Sketcher::SketchObject"):
+        obj.Placement = Path[0].Placement
+
+    if App.GuiUp:
+        ViewProviderPathShapeString(obj.ViewObject)
+        gui_utils.format_object(obj)
+        gui_utils.select(obj)
+
+    obj.recompute()
+    return obj
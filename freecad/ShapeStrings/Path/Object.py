@@ -0,0 +1,247 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the object code for the PathShapeString object.
+
+Strings follow each other along a path - an edge, a wire or a sketch -
+like a Spaced layout bent onto it: each glyph's center sits on the path at
+its arc length and the glyph is turned to the path's direction there. The
+path is flattened into the object's plane (see `Misc/ArcLength.py`) and
+looked up through one arc-length table per recompute, so placing a glyph
+costs a binary search rather than a projection onto the curve.
+
+Glyphs come from the shared glyph cache and are placed as instances (see
+`Misc/Instances.py`), so `Fuse` does not apply.
+"""
+
+import FreeCAD as App
+
+from draftobjects.base import DraftObject
+from ..Misc.ArcLength import link_shape
+from ..Misc.Background import OVER_BUDGET, PENDING, run_render
+from ..Misc.Estimate import check_budget
+from ..Misc.Extrude import solid_steps
+from ..Misc.Instances import instanced_steps
+from ..Misc.Pattern import string_count
+from ..Misc.Sheet import sync_strings
+from ..Misc.StringMap import assign_strings, string_shape
+
+from FreeCAD import Qt
+
+translate = Qt.translate
+
+
+class PathShapeString(DraftObject):
+    """The PathShapeString object - renders multiple strings along a path"""
+
+    def __init__(self, obj):
+        super().__init__(obj, "PathShapeString")
+        self.set_properties(obj)
+
+    def set_properties(self, obj):
+        """Add properties to the object and set them."""
+        properties = obj.PropertiesList
+
+        if "Strings" not in properties:
+            _tip = translate("App::Property", "List of text strings to render along the path")
+            obj.addProperty("App::PropertyStringList", "Strings", "Draft", _tip)
+
+        if "Pattern" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Generate the strings from a pattern such as SN-{00001..05000} "
+                "or {0..100..10}mm instead of Strings (empty = use Strings)",
+            )
+            obj.addProperty("App::PropertyString", "Pattern", "Draft", _tip)
+
+        if "Spreadsheet" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Spreadsheet whose SpreadsheetRange is copied into Strings on every recompute",
+            )
+            obj.addProperty("App::PropertyLink", "Spreadsheet", "Draft", _tip)
+
+        if "SpreadsheetRange" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Cells of Spreadsheet to read the strings from, row by row, such as A1:A500 "
+                "(empty = use Strings as they are)",
+            )
+            obj.addProperty("App::PropertyString", "SpreadsheetRange", "Draft", _tip)
+
+        if "Path" not in properties:
+            _tip = translate("App::Property", "Edge, wire or sketch the strings follow (optionally some of its edges)")
+            obj.addProperty("App::PropertyLinkSub", "Path", "Draft", _tip)
+
+        if "StartOffset" not in properties:
+            _tip = translate("App::Property", "Distance along the path to the first string")
+            obj.addProperty("App::PropertyDistance", "StartOffset", "Draft", _tip)
+            obj.StartOffset = 0.0
+
+        if "Offset" not in properties:
+            _tip = translate("App::Property", "Distance along the path between each string")
+            obj.addProperty("App::PropertyLength", "Offset", "Draft", _tip)
+            obj.Offset = 10.0
+
+        if "UseBoundingBox" not in properties:
+            _tip = translate("App::Property", "Use bounding box width to calculate spacing between strings")
+            obj.addProperty("App::PropertyBool", "UseBoundingBox", "Draft", _tip)
+            obj.UseBoundingBox = True
+
+        if "Reverse" not in properties:
+            _tip = translate("App::Property", "Run the strings from the end of the path to its start")
+            obj.addProperty("App::PropertyBool", "Reverse", "Draft", _tip)
+            obj.Reverse = False
+
+        if "FontFile" not in properties:
+            _tip = translate("App::Property", "Font file name")
+            obj.addProperty("App::PropertyFile", "FontFile", "Draft", _tip)
+
+        if "Size" not in properties:
+            _tip = translate("App::Property", "Height of text")
+            obj.addProperty("App::PropertyLength", "Size", "Draft", _tip)
+
+        if "Justification" not in properties:
+            _tip = translate("App::Property", "Horizontal and vertical alignment")
+            obj.addProperty("App::PropertyEnumeration", "Justification", "Draft", _tip)
+            obj.Justification = ["Top-Left", "Top-Center", "Top-Right",
+                                 "Middle-Left", "Middle-Center", "Middle-Right",
+                                 "Bottom-Left", "Bottom-Center", "Bottom-Right"]
+            obj.Justification = "Bottom-Left"
+
+        if "JustificationReference" not in properties:
+            _tip = translate("App::Property", "Height reference used for justification")
+            obj.addProperty("App::PropertyEnumeration", "JustificationReference", "Draft", _tip)
+            obj.JustificationReference = ["Cap Height", "Shape Height"]
+            obj.JustificationReference = "Cap Height"
+
+        if "KeepLeftMargin" not in properties:
+            _tip = translate("App::Property", "Keep left margin and leading white space when justification is left")
+            obj.addProperty("App::PropertyBool", "KeepLeftMargin", "Draft", _tip)
+            obj.KeepLeftMargin = False
+
+        if "ScaleToSize" not in properties:
+            _tip = translate("App::Property", "Scale to ensure cap height is equal to size")
+            obj.addProperty("App::PropertyBool", "ScaleToSize", "Draft", _tip)
+            obj.ScaleToSize = True
+
+        if "Tracking" not in properties:
+            _tip = translate("App::Property", "Inter-character spacing")
+            obj.addProperty("App::PropertyDistance", "Tracking", "Draft", _tip)
+
+        if "ObliqueAngle" not in properties:
+            _tip = translate("App::Property", "Oblique (slant) angle")
+            obj.addProperty("App::PropertyAngle", "ObliqueAngle", "Draft", _tip)
+
+        if "MakeFace" not in properties:
+            _tip = translate("App::Property", "Fill letters with faces")
+            obj.addProperty("App::PropertyBool", "MakeFace", "Draft", _tip)
+            obj.MakeFace = True
+
+        if "Height" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Extrude each glyph into a solid of this height (0 = flat faces)",
+            )
+            obj.addProperty("App::PropertyDistance", "Height", "Draft", _tip)
+            obj.Height = 0.0
+
+        if "Taper" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Taper angle of the extruded sides; positive narrows the glyphs towards the top",
+            )
+            obj.addProperty("App::PropertyAngle", "Taper", "Draft", _tip)
+            obj.Taper = 0.0
+
+        if "BackgroundRecompute" not in properties:
+            _tip = translate("App::Property", "Render large string lists in the background, keeping the previous shape until done")
+            obj.addProperty("App::PropertyBool", "BackgroundRecompute", "Draft", _tip)
+            obj.BackgroundRecompute = True
+
+        if "TimeBudget" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Maximum recompute time in seconds; a recompute expected or found "
+                "to take longer is stopped and the previous shape kept (0 = no limit)",
+            )
+            obj.addProperty("App::PropertyFloat", "TimeBudget", "Draft", _tip)
+            obj.TimeBudget = 0.0
+
+        if "StringStarts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first sub-shape of each string in the compound, "
+                "plus the sub-shape count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringStarts", "Result", _tip)
+            obj.setEditorMode("StringStarts", 1)
+
+        if "StringFaces" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first face of each string in the shape, plus the face count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringFaces", "Result", _tip)
+            obj.setEditorMode("StringFaces", 1)
+
+        if "StringEdges" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first edge of each string in the shape, plus the edge count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringEdges", "Result", _tip)
+            obj.setEditorMode("StringEdges", 1)
+
+    def onDocumentRestored(self, obj):
+        super().onDocumentRestored(obj)
+        # Ensure all properties exist after document restoration
+        self.set_properties(obj)
+
+    def execute(self, obj):
+        """Generate the compound shape from the list of strings, laid along the path."""
+        if self.props_changed_placement_only():
+            obj.positionBySupport()
+            self.props_changed_clear()
+            return
+
+        sync_strings(obj)
+        count = string_count(obj)
+        path = link_shape(obj.Path)
+        if path is None or path.isNull() or not path.Edges:
+            App.Console.PrintWarning(translate("draft", "PathShapeString: the path has no edges") + "\n")
+        elif count and obj.FontFile:
+            plm = obj.Placement
+
+            estimate, message = check_budget(obj, "PathShapeString")
+            if message:
+                shape = OVER_BUDGET
+                App.Console.PrintError(message + "\n")
+            else:
+                steps = instanced_steps(obj)
+                if obj.Height.Value:
+                    steps = solid_steps(obj, steps)
+                # Instanced glyphs cost differently from the estimate's
+                # model, so they are not timed to calibrate it
+                shape = run_render(obj, steps, count, "PathShapeString")
+            if shape is PENDING or shape is OVER_BUDGET:
+                # Either rendering continues in the background, or it was
+                # refused or abandoned for the TimeBudget (already
+                # reported); the previous shape stays either way.
+                pass
+            elif shape is not None:
+                assign_strings(obj, shape, count)
+            else:
+                App.Console.PrintWarning(translate("draft", "PathShapeString: strings have no wires") + "\n")
+
+            obj.Placement = plm
+
+        obj.positionBySupport()
+        self.props_changed_clear()
+
+    def onChanged(self, obj, prop):
+        self.props_changed_store(prop)
+
+    def getStringShape(self, obj, index):
+        """Shapes of string `index`, without recomputing; see `Misc/StringMap.py`."""
+        return string_shape(obj, index)
@@ -0,0 +1,28 @@
+# SPDX-License-Identifier: LGPL-2.1-only
+# SPDX-FileNotice: Part of the ShapeStrings addon.
+
+"""Provides the viewprovider code for the PathShapeString object."""
+
+
+from draftviewproviders.view_base import ViewProviderDraft
+from ..Misc.Commit import isCommitting
+from ..Misc.Resources import asIcon
+
+
+class ViewProviderPathShapeString(ViewProviderDraft):
+
+    def __init__(self, vobj):
+        vobj.Proxy = self
+
+    def getIcon(self):
+        return asIcon('Path')
+
+    def updateData(self, obj, prop):
+        if isCommitting(obj):
+            # A batched edit recomputes once when it is done
+            return
+
+        if prop in ["Strings", "Pattern", "Spreadsheet", "SpreadsheetRange", "FontFile",
+                    "Size", "StartOffset", "Offset", "UseBoundingBox", "Reverse"]:
+            obj.recompute()
+        return
@@ -0,0 +1,2 @@
+
+from .Command import registerPath
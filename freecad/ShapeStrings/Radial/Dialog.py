@@ -43,7 +43,19 @@ from draftutils.params import get_param
 from draftutils.translate import translate
 from DraftVecUtils import toString
 
+from ..Misc.Commit import commitProperties
+from ..Misc.Estimate import estimate_cost
+from ..Misc.Glyphs import get_glyph_cache
+from ..Misc.Layout import radial_angle, radial_matrix
+from ..Misc.Preview import (
+    StringsPreview,
+    outline_string,
+    preview_settings,
+    transform_polylines,
+    working_plane_rotation,
+)
 from ..Misc.Resources import asIcon , asUI
+from ..Misc.StringsModel import StringsTableModel
 
 
 # So the resource file doesn't trigger errors from code checkers (flake8)
@@ -95,18 +107,15 @@ class RadialShapeStringTaskPanel:
         self.form.sbHeight.setProperty("rawValue", size)
         self.form.sbHeight.setProperty("unit", unit_length)
 
-        # Strings list
-        list_widget = self.form.listStrings
-        list_widget.clear()
-        if strings:
-            for s in strings:
-                item = QtGui.QListWidgetItem(s)
-                item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
-                list_widget.addItem(item)
-        else:
-            item = QtGui.QListWidgetItem(translate("draft", "Default"))
-            item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
-            list_widget.addItem(item)
+        # Strings list, held in a model so the view only materialises visible rows
+        if not strings:
+            strings = [translate("draft", "Default")]
+        self.stringsModel = StringsTableModel(strings, 1, self.form)
+        list_view = self.form.listStrings
+        list_view.setModel(self.stringsModel)
+        list_view.setUniformItemSizes(True)
+        list_view.setEditTriggers(QtGui.QAbstractItemView.DoubleClicked
+                                  | QtGui.QAbstractItemView.EditKeyPressed)
 
         # Radius
         self.form.sbRadius.setProperty("rawValue", radius)
@@ -185,6 +194,41 @@ class RadialShapeStringTaskPanel:
             QtCore.SIGNAL("clicked()"),
             self.removeStringItem,
         )
+        QtCore.QObject.connect(
+            self.form.pbImportCsv,
+            QtCore.SIGNAL("clicked()"),
+            self.importCsv,
+        )
+
+        self.pasteShortcut = QtGui.QShortcut(QtGui.QKeySequence.Paste, self.form.listStrings)
+        self.pasteShortcut.setContext(QtCore.Qt.WidgetShortcut)
+        QtCore.QObject.connect(
+            self.pasteShortcut,
+            QtCore.SIGNAL("activated()"),
+            self.pasteStrings,
+        )
+
+        # Live outline preview: layout changes are debounced, moving the
+        # center only moves the existing overlay.
+        self.previewSettings = preview_settings(justification="Middle-Center")
+        self.previewRotation = working_plane_rotation()
+        self.preview = StringsPreview()
+        for widget, signal in (
+            (self.form.sbHeight, "valueChanged(double)"),
+            (self.form.sbRadius, "valueChanged(double)"),
+            (self.form.sbStartAngle, "valueChanged(double)"),
+            (self.form.sbAngleStep, "valueChanged(double)"),
+            (self.form.sbStringRotation, "valueChanged(double)"),
+            (self.form.cbTangential, "toggled(bool)"),
+            (self.form.cbRotationDirection, "currentIndexChanged(int)"),
+        ):
+            QtCore.QObject.connect(widget, QtCore.SIGNAL(signal), self.schedulePreview)
+        for widget in (self.form.sbX, self.form.sbY, self.form.sbZ):
+            QtCore.QObject.connect(widget, QtCore.SIGNAL("valueChanged(double)"), self.previewPlacementChanged)
+        self.stringsModel.dataChanged.connect(self.schedulePreview)
+        self.stringsModel.modelReset.connect(self.schedulePreview)
+        self.stringsModel.rowsInserted.connect(self.schedulePreview)
+        self.stringsModel.rowsRemoved.connect(self.schedulePreview)
 
         self.updateRemoveButtonState()
 
@@ -194,6 +238,8 @@ class RadialShapeStringTaskPanel:
         if not hasattr(self, "_adv_params"):
             self._adv_params = App.ParamGet(ADV_PARAM_GROUP)
         self._adv_params.SetString("FontFile", str(fn))
+        if hasattr(self, "preview"):
+            self.schedulePreview()
 
     def resetPoint(self):
         """Reset the selected center point to origin."""
@@ -201,51 +247,126 @@ class RadialShapeStringTaskPanel:
         origin = App.Vector(0.0, 0.0, 0.0)
         self.setPoint(origin)
 
-    def _createEditableItem(self, text):
-        """Create an editable QListWidgetItem with the given text."""
-        item = QtGui.QListWidgetItem(text)
-        item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
-        return item
-
     def addStringItem(self):
         """Add a new editable entry to listStrings."""
-        list_widget = self.form.listStrings
-        item = self._createEditableItem(translate("draft", "New string"))
-        list_widget.addItem(item)
-        list_widget.setCurrentItem(item)
-        list_widget.editItem(item)
+        list_view = self.form.listStrings
+        index = self.stringsModel.appendRow(translate("draft", "New string"))
+        list_view.setCurrentIndex(index)
+        list_view.scrollTo(index)
+        list_view.edit(index)
         self.updateRemoveButtonState()
 
     def removeStringItem(self):
         """Remove the currently selected entry from listStrings if more than one."""
-        list_widget = self.form.listStrings
-        count = list_widget.count()
+        model = self.stringsModel
+        count = model.rowCount()
         if count <= 1:
             return
 
-        current_row = list_widget.currentRow()
+        current_row = self.form.listStrings.currentIndex().row()
         if current_row < 0:
             current_row = count - 1
-        item = list_widget.takeItem(current_row)
-        del item
+        model.removeRow(current_row)
+        self.updateRemoveButtonState()
+
+    def pasteStrings(self):
+        """Paste clipboard text into listStrings, one string per line."""
+        text = QtGui.QApplication.clipboard().text()
+        if text:
+            self.stringsModel.pasteText(text, self.form.listStrings.currentIndex())
+            self.updateRemoveButtonState()
+
+    def importCsv(self):
+        """Replace listStrings with the non-blank cells of a CSV file."""
+        path, _filter = QtGui.QFileDialog.getOpenFileName(
+            self.form,
+            translate("draft", "Import strings"),
+            "",
+            translate("draft", "CSV files (*.csv *.txt);;All files (*)"),
+        )
+        if not path:
+            return
+        try:
+            self.stringsModel.importCsv(path)
+        except (OSError, UnicodeDecodeError) as e:
+            _err(translate("draft", "RadialShapeString: could not import CSV file") + " {}\n".format(e))
+            return
         self.updateRemoveButtonState()
 
     def collectStrings(self):
-        """Read strings from the listStrings widget, one row per string."""
+        """Read strings from the listStrings model, one row per string."""
         items = []
-        list_widget = self.form.listStrings
-        for i in range(list_widget.count()):
-            text = list_widget.item(i).text().strip()
+        for text in self.stringsModel.texts():
+            text = text.strip()
             if text:
                 items.append(text)
         return items
 
     def updateRemoveButtonState(self):
         """Enable/disable the Remove button depending on the number of items."""
-        list_widget = self.form.listStrings
-        can_remove = list_widget.count() > 1
+        can_remove = self.stringsModel.rowCount() > 1
         self.form.pbRemoveString.setEnabled(can_remove)
 
+    def schedulePreview(self, *_args):
+        """Re-lay out the preview once the current burst of edits settles."""
+        self.preview.schedule(self.previewOutlines)
+
+    def previewPlacementChanged(self, *_args):
+        """Move the preview overlay to the center point in the spin boxes."""
+        try:
+            center = App.Vector(
+                App.Units.Quantity(self.form.sbX.text()).Value,
+                App.Units.Quantity(self.form.sbY.text()).Value,
+                App.Units.Quantity(self.form.sbZ.text()).Value,
+            )
+        except ValueError:
+            return  # Mid-edit text; keep the overlay where it is
+        self.preview.setPlacement(App.Placement(center, self.previewRotation))
+
+    def updateEstimate(self, strings, size):
+        """Show the predicted recompute time for the panel's current values."""
+        settings = self.previewSettings
+        estimate = estimate_cost(
+            self.fileSpec, size, strings, settings["MakeFace"], settings["Fuse"], settings["Tracking"]
+        )
+        self.form.lEstimate.setText(
+            translate("draft", "Estimated recompute: {}").format(estimate.describe())
+        )
+
+    def previewOutlines(self):
+        """Yield the outlines of each string, laid out like RadialShapeString."""
+        settings = self.previewSettings
+        size = App.Units.Quantity(self.form.sbHeight.text()).Value
+        radius = App.Units.Quantity(self.form.sbRadius.text()).Value
+        start_angle = App.Units.Quantity(self.form.sbStartAngle.text()).Value
+        angle_step = App.Units.Quantity(self.form.sbAngleStep.text()).Value
+        string_rotation = App.Units.Quantity(self.form.sbStringRotation.text()).Value
+        tangential = self.form.cbTangential.isChecked()
+        clockwise = self.form.cbRotationDirection.currentIndex() == 1
+
+        strings = self.collectStrings()
+        self.updateEstimate(strings, size)
+
+        cache = get_glyph_cache(self.fileSpec, size, settings["Tracking"])
+        cap_height = size if settings["ScaleToSize"] else cache.cap_height()
+
+        for index, text in enumerate(strings):
+            polylines, box = outline_string(
+                cache,
+                text,
+                1.0,
+                settings["ObliqueAngle"],
+                settings["Justification"],
+                settings["JustificationReference"],
+                settings["KeepLeftMargin"],
+                cap_height,
+            )
+            if box is None:
+                yield None
+                continue
+            angle = radial_angle(index, start_angle, angle_step, clockwise)
+            yield transform_polylines(polylines, radial_matrix(angle, radius, tangential, string_rotation))
+
     def action(self, arg):
         """Scene event handler."""
         if arg["Type"] == "SoKeyboardEvent":
@@ -289,6 +410,8 @@ class RadialShapeStringTaskPanelCmd(RadialShapeStringTaskPanel):
     def __init__(self, sourceCmd):
         super().__init__()
         self.sourceCmd = sourceCmd
+        self.previewPlacementChanged()
+        self.schedulePreview()
 
     def accept(self):
         """Execute when clicking the OK button."""
@@ -302,6 +425,7 @@ class RadialShapeStringTaskPanelCmd(RadialShapeStringTaskPanel):
 
     def reject(self):
         """Run when clicking the Cancel button."""
+        self.preview.remove()
         Gui.ActiveDocument.resetEdit()
         self.sourceCmd.finish()
         self.platWinDialog("Restore")
@@ -411,6 +535,11 @@ class RadialShapeStringTaskPanelEdit(RadialShapeStringTaskPanel):
         self.vobj = vobj
         self.call = Gui.activeView().addEventCallback("SoEvent", self.action)
 
+        self.previewSettings = preview_settings(obj)
+        self.previewRotation = obj.Placement.Rotation
+        self.previewPlacementChanged()
+        self.schedulePreview()
+
     def accept(self):
         # Center point
         x = App.Units.Quantity(self.form.sbX.text()).Value
@@ -433,18 +562,21 @@ class RadialShapeStringTaskPanelEdit(RadialShapeStringTaskPanel):
         )
         string_rotation = App.Units.Quantity(self.form.sbStringRotation.text()).Value
 
-        o = 'FreeCAD.ActiveDocument.getObject("{}")'.format(self.vobj.Object.Name)
-        Gui.doCommand(o + ".Placement.Base=" + toString(base))
-        Gui.doCommand(o + ".Size=" + str(size))
-        Gui.doCommand(o + ".Strings=" + repr(strings))
-        Gui.doCommand(o + ".Radius=" + str(radius))
-        Gui.doCommand(o + ".StartAngle=" + str(start_angle))
-        Gui.doCommand(o + ".AngleStep=" + str(angle_step))
-        Gui.doCommand(o + ".Tangential=" + str(tangential))
-        Gui.doCommand(o + '.FontFile="' + font_file + '"')
-        Gui.doCommand(o + ".RotationDirection=" + repr(rotation_direction))
-        Gui.doCommand(o + ".StringRotation=" + str(string_rotation))
-        Gui.doCommand("FreeCAD.ActiveDocument.recompute()")
+        obj = self.vobj.Object
+        placement = App.Placement(obj.Placement)
+        placement.Base = base
+        commitProperties(obj, {
+            "Placement": placement,
+            "Size": size,
+            "Strings": strings,
+            "Radius": radius,
+            "StartAngle": start_angle,
+            "AngleStep": angle_step,
+            "Tangential": tangential,
+            "FontFile": font_file,
+            "RotationDirection": rotation_direction,
+            "StringRotation": string_rotation,
+        }, translate("draft", "Edit Radial ShapeString"))
 
         if not hasattr(self, "_adv_params"):
             self._adv_params = App.ParamGet(ADV_PARAM_GROUP)
@@ -454,11 +586,13 @@ class RadialShapeStringTaskPanelEdit(RadialShapeStringTaskPanel):
         return True
 
     def reject(self):
+        self.preview.remove()
         self.vobj.Document.resetEdit()
         self.platWinDialog("Restore")
         return True
 
     def finish(self):
+        self.preview.remove()
         Gui.activeView().removeEventCallback("SoEvent", self.call)
         Gui.Snapper.off()
         Gui.Control.closeDialog()
@@ -43,9 +43,13 @@ def make_radialshapestring(Strings,
                            AngleStep=30,
                            Tangential=True,
                            RotationDirection="CounterClockwise",
-                           StringRotation=0):
+                           StringRotation=0,
+                           Pattern="",
+                           Rings=(),
+                           CurvedText="Off"):
     """RadialShapeString(Strings, FontFile,
-                         [Size], [Radius], [StartAngle], [AngleStep], [Tangential])
+                         [Size], [Radius], [StartAngle], [AngleStep], [Tangential], [Pattern],
+                         [Rings], [CurvedText])
 
     Turns a list of text strings into a single Compound Shape, with each
     string rendered using the given font and placed on an arc of radius
@@ -55,7 +59,18 @@ def make_radialshapestring(Strings,
 
     If `Tangential` is True, each string’s baseline is rotated to be
     tangent to the arc at its position; otherwise the baseline stays
-    parallel to the global X axis.
+    parallel to the global X axis. `CurvedText` "Outside" or "Inside"
+    bends each string glyph by glyph onto the arc instead, reading
+    clockwise (tops out) or counter-clockwise (tops in).
+
+    A non-empty `Pattern`, such as "{0..330..30}", generates the strings
+    at recompute time instead; `Strings` can then be empty.
+
+    `Rings` adds concentric rings after the first one, which holds
+    `Strings`. Each is a dict with its own "Strings" and optionally
+    "Radius", "StartAngle", "AngleStep", "Size" and "Tangential"; missing
+    keys take the values given for the first ring. All rings share their
+    glyphs, and editing one only lays that ring out again.
     """
     App.Console.PrintMessage("Creating RadialShapeString object...\n")
 
@@ -71,6 +86,7 @@ def make_radialshapestring(Strings,
 
     # Core radial properties
     obj.Strings = list(Strings)
+    obj.Pattern = Pattern
     obj.FontFile = FontFile
     obj.Size = Size
     obj.Radius = Radius
@@ -79,6 +95,17 @@ def make_radialshapestring(Strings,
     obj.Tangential = bool(Tangential)
     obj.RotationDirection = str(RotationDirection)
     obj.StringRotation = StringRotation
+    obj.CurvedText = str(CurvedText)
+
+    if Rings:
+        rings = [dict(Strings=list(Strings))] + [dict(ring) for ring in Rings]
+        obj.Strings = [text for ring in rings for text in ring["Strings"]]
+        obj.RingCounts = [len(ring["Strings"]) for ring in rings]
+        obj.RingRadii = [float(ring.get("Radius", Radius)) for ring in rings]
+        obj.RingStartAngles = [float(ring.get("StartAngle", StartAngle)) for ring in rings]
+        obj.RingAngleSteps = [float(ring.get("AngleStep", AngleStep)) for ring in rings]
+        obj.RingSizes = [float(ring.get("Size", Size)) for ring in rings]
+        obj.RingTangential = [bool(ring.get("Tangential", Tangential)) for ring in rings]
 
     # Print all object properties to the FreeCAD console
     App.Console.PrintMessage("RadialShapeString properties:\n")
@@ -35,7 +35,18 @@ from draftgeoutils import faces
 from draftutils.messages import _wrn
 
 from draftobjects.base import DraftObject
+from ..Misc.Background import OVER_BUDGET, PENDING, run_render
+from ..Misc.Dedup import string_cache
+from ..Misc.Estimate import check_budget
+from ..Misc.Extrude import solid_steps
+from ..Misc.Fit import auto_fit
+from ..Misc.Instances import ring_steps
 from ..Misc.Justify import justification_vector
+from ..Misc.Layout import radial_matrix
+from ..Misc.Pattern import string_count
+from ..Misc.Rings import anchor_angle, is_curved, is_even, object_rings, ring_angles
+from ..Misc.Sheet import sync_strings
+from ..Misc.StringMap import assign_strings, string_compound, string_shape
 
 from FreeCAD import Qt
 
@@ -60,6 +71,29 @@ class RadialShapeString(DraftObject):
             )
             obj.addProperty("App::PropertyStringList", "Strings", "Draft", _tip)
 
+        if "Pattern" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Generate the strings from a pattern such as SN-{00001..05000} "
+                "or {0..100..10}mm instead of Strings (empty = use Strings)",
+            )
+            obj.addProperty("App::PropertyString", "Pattern", "Draft", _tip)
+
+        if "Spreadsheet" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Spreadsheet whose SpreadsheetRange is copied into Strings on every recompute",
+            )
+            obj.addProperty("App::PropertyLink", "Spreadsheet", "Draft", _tip)
+
+        if "SpreadsheetRange" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Cells of Spreadsheet to read the strings from, row by row, such as A1:A500 "
+                "(empty = use Strings as they are)",
+            )
+            obj.addProperty("App::PropertyString", "SpreadsheetRange", "Draft", _tip)
+
         if "Radius" not in properties:
             _tip = translate(
                 "App::Property",
@@ -84,6 +118,25 @@ class RadialShapeString(DraftObject):
             obj.addProperty("App::PropertyAngle", "AngleStep", "Draft", _tip)
             obj.AngleStep = 30.0
 
+        if "Distribution" not in properties:
+            _tip = translate(
+                "App::Property",
+                "AngleStep: strings sit AngleStep apart. Even: strings are spread "
+                "over ArcSpan with equal gaps between them, by their widths",
+            )
+            obj.addProperty("App::PropertyEnumeration", "Distribution", "Draft", _tip)
+            obj.Distribution = ["AngleStep", "Even"]
+            obj.Distribution = "AngleStep"
+
+        if "ArcSpan" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Arc the strings are spread over when Distribution is Even "
+                "(360° = the full circle)",
+            )
+            obj.addProperty("App::PropertyAngle", "ArcSpan", "Draft", _tip)
+            obj.ArcSpan = 360.0
+
         if "Tangential" not in properties:
             _tip = translate(
                 "App::Property",
@@ -93,6 +146,17 @@ class RadialShapeString(DraftObject):
             obj.addProperty("App::PropertyBool", "Tangential", "Draft", _tip)
             obj.Tangential = True
 
+        if "CurvedText" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Bend each string glyph by glyph so its baseline follows the arc: "
+                "Outside reads clockwise with glyph tops facing out, Inside reads "
+                "counter-clockwise with them facing the center (Off = rigid strings)",
+            )
+            obj.addProperty("App::PropertyEnumeration", "CurvedText", "Draft", _tip)
+            obj.CurvedText = ["Off", "Outside", "Inside"]
+            obj.CurvedText = "Off"
+
         if "FontFile" not in properties:
             _tip = translate("App::Property", "Font file name")
             obj.addProperty("App::PropertyFile", "FontFile", "Draft", _tip)
@@ -101,6 +165,32 @@ class RadialShapeString(DraftObject):
             _tip = translate("App::Property", "Height of text")
             obj.addProperty("App::PropertyLength", "Size", "Draft", _tip)
 
+        if "AutoFit" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Set Size to the largest that fits: Width = every string within FitWidth, "
+                "Arc = every string within the span between neighbouring positions",
+            )
+            obj.addProperty("App::PropertyEnumeration", "AutoFit", "Draft", _tip)
+            obj.AutoFit = ["Off", "Width", "Arc"]
+            obj.AutoFit = "Off"
+
+        if "FitWidth" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Maximum width of each string when AutoFit is Width",
+            )
+            obj.addProperty("App::PropertyLength", "FitWidth", "Draft", _tip)
+            obj.FitWidth = 50.0
+
+        if "FitMargin" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Space kept clear when fitting, taken off the target width",
+            )
+            obj.addProperty("App::PropertyLength", "FitMargin", "Draft", _tip)
+            obj.FitMargin = 0.0
+
         if "Justification" not in properties:
             _tip = translate(
                 "App::Property",
@@ -193,6 +283,108 @@ class RadialShapeString(DraftObject):
             obj.addProperty("App::PropertyAngle", "StringRotation", "Draft", _tip)
             obj.StringRotation = 0.0
 
+        if "RingCounts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Split the strings into concentric rings: the number of strings "
+                "in each ring, in order (empty = a single ring)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "RingCounts", "Draft", _tip)
+
+        if "RingRadii" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Radius of each ring (missing entries use Radius)",
+            )
+            obj.addProperty("App::PropertyFloatList", "RingRadii", "Draft", _tip)
+
+        if "RingStartAngles" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Starting angle of each ring, in degrees (missing entries use StartAngle)",
+            )
+            obj.addProperty("App::PropertyFloatList", "RingStartAngles", "Draft", _tip)
+
+        if "RingAngleSteps" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Angular increment of each ring, in degrees (missing entries use AngleStep)",
+            )
+            obj.addProperty("App::PropertyFloatList", "RingAngleSteps", "Draft", _tip)
+
+        if "RingSizes" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Text height of each ring (missing or 0 entries use Size)",
+            )
+            obj.addProperty("App::PropertyFloatList", "RingSizes", "Draft", _tip)
+
+        if "RingTangential" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Tangential setting of each ring (missing entries use Tangential)",
+            )
+            obj.addProperty("App::PropertyBoolList", "RingTangential", "Draft", _tip)
+
+        if "Height" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Extrude each glyph into a solid of this height (0 = flat faces)",
+            )
+            obj.addProperty("App::PropertyDistance", "Height", "Draft", _tip)
+            obj.Height = 0.0
+
+        if "Taper" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Taper angle of the extruded sides; positive narrows the glyphs towards the top",
+            )
+            obj.addProperty("App::PropertyAngle", "Taper", "Draft", _tip)
+            obj.Taper = 0.0
+
+        if "BackgroundRecompute" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Render large string lists in the background, "
+                "keeping the previous shape until done",
+            )
+            obj.addProperty("App::PropertyBool", "BackgroundRecompute", "Draft", _tip)
+            obj.BackgroundRecompute = True
+
+        if "TimeBudget" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Maximum recompute time in seconds; a recompute expected or found "
+                "to take longer is stopped and the previous shape kept (0 = no limit)",
+            )
+            obj.addProperty("App::PropertyFloat", "TimeBudget", "Draft", _tip)
+            obj.TimeBudget = 0.0
+
+        if "StringStarts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first sub-shape of each string in the compound, "
+                "plus the sub-shape count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringStarts", "Result", _tip)
+            obj.setEditorMode("StringStarts", 1)
+
+        if "StringFaces" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first face of each string in the shape, plus the face count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringFaces", "Result", _tip)
+            obj.setEditorMode("StringFaces", 1)
+
+        if "StringEdges" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first edge of each string in the shape, plus the edge count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringEdges", "Result", _tip)
+            obj.setEditorMode("StringEdges", 1)
+
     def onDocumentRestored(self, obj):
         super().onDocumentRestored(obj)
         # Ensure all properties exist after document restoration
@@ -205,165 +397,197 @@ class RadialShapeString(DraftObject):
             self.props_changed_clear()
             return
 
-        if obj.Strings and obj.FontFile:
+        sync_strings(obj)
+        count = string_count(obj)
+        if count and obj.FontFile:
             plm = obj.Placement
-            all_shapes = []
 
-            # Pre-calculate justification vector parameters once
-            cap_char = Part.makeWireString("M", obj.FontFile, obj.Size, obj.Tracking)[0]
+            auto_fit(obj)
+            estimate, message = check_budget(obj, "RadialShapeString")
+            if message:
+                shape = OVER_BUDGET
+                App.Console.PrintError(message + "\n")
+            else:
+                if is_curved(obj):
+                    # Glyphs are placed one by one on the arc. The
+                    # estimate models `render_steps`; timing this path
+                    # would skew its calibration, see `Misc/Estimate.py`.
+                    steps = ring_steps(obj, self.ring_cache())
+                    estimate = None
+                else:
+                    steps = self.render_steps(obj)
+                if obj.Height.Value:
+                    # Extrude the flat render, so only the thickness changes
+                    steps = solid_steps(obj, steps)
+                    estimate = None
+                shape = run_render(obj, steps, count, "RadialShapeString", estimate)
+            if shape is PENDING or shape is OVER_BUDGET:
+                # Either rendering continues in the background, or it was
+                # refused or abandoned for the TimeBudget (already
+                # reported); the previous shape stays either way.
+                pass
+            elif shape is not None:
+                assign_strings(obj, shape, count)
+            else:
+                _wrn(
+                    translate("draft", "RadialShapeString: strings have no wires")
+                    + "\n"
+                )
+
+            obj.Placement = plm
+
+        obj.positionBySupport()
+        self.props_changed_clear()
+
+    def ring_cache(self):
+        """Placed glyphs of each ring from the last render, see `ring_steps`.
+
+        Kept on the proxy only, so it starts empty in every session.
+        """
+        if getattr(self, "_ring_cache", None) is None:
+            self._ring_cache = {}
+        return self._ring_cache
+
+    def render_steps(self, obj):
+        """Render the strings around their rings, yielding once per string.
+
+        Returns the finished compound, one sub-compound per string (see
+        `Misc/StringMap.py`), or None if no string produced any geometry.
+        See `Misc/Background.py` for how this is driven.
+        """
+        parts = {}
+
+        fill = obj.MakeFace
+        if fill is True:
+            # Test a simple letter to know if we have a sticky font or not
+            char = Part.makeWireString("L", obj.FontFile, 1, 0)[0]
+            shapes = self.make_faces(char)
+            if not shapes:
+                fill = False
+            else:
+                fill = (
+                    sum([shape.Area for shape in shapes]) > 0.03
+                    and math.isclose(
+                        Part.Compound(char).BoundBox.DiagonalLength,
+                        Part.Compound(shapes).BoundBox.DiagonalLength,
+                        rel_tol=1e-7,
+                    )
+                )
+
+        # Process each ring, and each string in it
+        string_shapes = string_cache(self, obj)
+        for ring in object_rings(obj):
+            angles = ring_angles(obj, ring)
+
+            # Pre-calculate justification vector parameters once per ring
+            cap_char = Part.makeWireString("M", obj.FontFile, ring.size, obj.Tracking)[0]
             cap_height = Part.Compound(cap_char).BoundBox.YMax
             if obj.ScaleToSize:
-                cap_height = obj.Size
+                cap_height = ring.size
 
-            # Process each string in the list
-            for string_index, string_text in enumerate(obj.Strings):
+            for string_index, string_text in enumerate(ring.texts):
+                yield
                 if not string_text:
                     continue
 
-                fill = obj.MakeFace
-                if fill is True:
-                    # Test a simple letter to know if we have a sticky font or not
-                    char = Part.makeWireString("L", obj.FontFile, 1, 0)[0]
-                    shapes = self.make_faces(char)
-                    if not shapes:
-                        fill = False
-                    else:
-                        fill = (
-                            sum([shape.Area for shape in shapes]) > 0.03
-                            and math.isclose(
-                                Part.Compound(char).BoundBox.DiagonalLength,
-                                Part.Compound(shapes).BoundBox.DiagonalLength,
-                                rel_tol=1e-7,
-                            )
-                        )
-
-                # Generate wire representation for this string
-                chars = Part.makeWireString(
-                    string_text, obj.FontFile, obj.Size, obj.Tracking
+                # Repeated strings are rendered once and copied, see
+                # `Misc/Dedup.py`
+                shapes = string_shapes.get(
+                    (string_text, ring.size),
+                    lambda: self.render_string(obj, string_text, ring.size, fill, cap_height),
                 )
-                string_shapes = []
-
-                for char in chars:
-                    if fill is False:
-                        string_shapes.extend(char)
-                    elif char:
-                        string_shapes.extend(self.make_faces(char))
-
-                if not string_shapes:
+                if not shapes:
                     continue
 
-                # Create compound for this string
-                if fill and obj.Fuse:
-                    ss_shape = string_shapes[0].fuse(string_shapes[1:])
-                    ss_shape = faces.concatenate(ss_shape)
-                else:
-                    ss_shape = Part.Compound(string_shapes)
-
-                # Apply scaling and oblique angle transformations
-                if obj.ScaleToSize:
-                    ss_shape.scale(obj.Size / cap_height)
-
-                if obj.ObliqueAngle:
-                    if -80 <= obj.ObliqueAngle <= 80:
-                        mtx = App.Matrix()
-                        mtx.A12 = math.tan(math.radians(obj.ObliqueAngle))
-                        ss_shape = ss_shape.transformGeometry(mtx)
-                    else:
-                        wrn = (
-                            translate(
-                                "draft",
-                                "RadialShapeString: oblique angle must be in the "
-                                "-80 to +80 degree range",
-                            )
-                            + "\n"
-                        )
-                        _wrn(wrn)
-
-                # Apply justification
-                just_vec = justification_vector(
-                    ss_shape,
-                    cap_height,
-                    obj.Justification,
-                    obj.JustificationReference,
-                    obj.KeepLeftMargin,
+                # Place the string on the ring; blank entries still use up
+                # their angular slot, so the index is the raw list index.
+                middle = 0.0
+                if is_even(obj):
+                    box = Part.Compound(shapes).BoundBox
+                    middle = box.XMin + box.XLength / 2
+                angle_deg = anchor_angle(obj, ring, angles[string_index], middle)
+                m = radial_matrix(
+                    angle_deg,
+                    ring.radius,
+                    ring.tangential,
+                    float(getattr(obj, "StringRotation", 0.0)),
                 )
-                shapes = ss_shape.SubShapes
-                for shape in shapes:
-                    shape.translate(just_vec)
 
-                # Determine direction sign: +1 = CCW, -1 = CW
-                try:
-                    if obj.RotationDirection == "Clockwise":
-                        direction = -1.0
-                    else:
-                        direction = 1.0
-                except Exception:
-                    direction = 1.0
-
-                step = float(obj.AngleStep) * direction
-
-                # Compute radial position for this string
-                angle_deg = float(obj.StartAngle) + string_index * step
-                angle_rad = math.radians(angle_deg)
-
-                # Radius is an App::PropertyLength, ensure we use value in mm
-                radius_val = float(obj.Radius)
-
-                # Base center for this string (relative to object origin)
-                cx = radius_val * math.cos(angle_rad)
-                cy = radius_val * math.sin(angle_rad)
-                offset_vec = App.Vector(cx, cy, 0)
-
-                # Extra per-string rotation
-                extra_rot = float(getattr(obj, "StringRotation", 0.0))
-
-                # Apply tangent or horizontal orientation
-                if obj.Tangential:
-                    # Tangent direction pointing toward the center:
-                    # radial angle + 180° is inward; minus 90° for baseline.
-                    rot_deg = angle_deg - 90.0
-                else:
-                    # Baseline kept parallel to global X axis
-                    rot_deg = 0.0
-
-                # Apply global string rotation offset
-                rot_deg += extra_rot
-
-                # Apply placement: we rotate and translate all shapes
-                m = App.Matrix()
-                # Rotation around Z
-                rot_rad = math.radians(rot_deg)
-                m.A11 = math.cos(rot_rad)
-                m.A12 = -math.sin(rot_rad)
-                m.A21 = math.sin(rot_rad)
-                m.A22 = math.cos(rot_rad)
-                # Translation
-                m.A14 = offset_vec.x
-                m.A24 = offset_vec.y
-                m.A34 = offset_vec.z
-
-                transformed = []
-                for shape in shapes:
-                    transformed.append(shape.transformGeometry(m))
-
-                all_shapes.extend(transformed)
-
-            if all_shapes:
-                obj.Shape = Part.Compound(all_shapes)
+                # The placed copies keep sharing the string's geometry
+                placement = App.Placement(m)
+                parts[ring.first + string_index] = [shape.moved(placement) for shape in shapes]
+
+        string_shapes.report("RadialShapeString")
+
+        return string_compound(parts)
+
+    def render_string(self, obj, string_text, size, fill, cap_height):
+        """Render one string at `size` at its own origin, justified.
+
+        Returns the list of its shapes, empty if it has no geometry.
+        """
+        # Generate wire representation for this string
+        chars = Part.makeWireString(
+            string_text, obj.FontFile, size, obj.Tracking
+        )
+        string_shapes = []
+
+        for char in chars:
+            if fill is False:
+                string_shapes.extend(char)
+            elif char:
+                string_shapes.extend(self.make_faces(char))
+
+        if not string_shapes:
+            return []
+
+        # Create compound for this string
+        if fill and obj.Fuse:
+            ss_shape = string_shapes[0].fuse(string_shapes[1:])
+            ss_shape = faces.concatenate(ss_shape)
+        else:
+            ss_shape = Part.Compound(string_shapes)
+
+        # Apply scaling and oblique angle transformations
+        if obj.ScaleToSize:
+            ss_shape.scale(size / cap_height)
+
+        if obj.ObliqueAngle:
+            if -80 <= obj.ObliqueAngle <= 80:
+                mtx = App.Matrix()
+                mtx.A12 = math.tan(math.radians(obj.ObliqueAngle))
+                ss_shape = ss_shape.transformGeometry(mtx)
             else:
-                _wrn(
-                    translate("draft", "RadialShapeString: strings have no wires")
+                wrn = (
+                    translate(
+                        "draft",
+                        "RadialShapeString: oblique angle must be in the "
+                        "-80 to +80 degree range",
+                    )
                     + "\n"
                 )
-
-            obj.Placement = plm
-
-        obj.positionBySupport()
-        self.props_changed_clear()
+                _wrn(wrn)
+
+        # Apply justification
+        just_vec = justification_vector(
+            ss_shape,
+            cap_height,
+            obj.Justification,
+            obj.JustificationReference,
+            obj.KeepLeftMargin,
+        )
+        shapes = ss_shape.SubShapes
+        for shape in shapes:
+            shape.translate(just_vec)
+        return shapes
 
     def onChanged(self, obj, prop):
         self.props_changed_store(prop)
 
+    def getStringShape(self, obj, index):
+        """Shapes of string `index`, without recomputing; see `Misc/StringMap.py`."""
+        return string_shape(obj, index)
+
     # justification_vector moved to shared module `justification.py`
 
     def make_faces(self, wireChar):
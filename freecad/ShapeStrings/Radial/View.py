@@ -29,6 +29,7 @@
 import FreeCADGui as Gui
 
 from draftviewproviders.view_base import ViewProviderDraft
+from ..Misc.Commit import isCommitting
 from ..Misc.Resources import asIcon
 from .Dialog import RadialShapeStringTaskPanelEdit
 
@@ -42,16 +43,35 @@ class ViewProviderRadialShapeString(ViewProviderDraft):
         return asIcon('Radial')
 
     def updateData(self, obj, prop):
+        if isCommitting(obj):
+            # A batched edit recomputes once when it is done
+            return
+
         if (
             prop == "Strings"
+            or prop == "Pattern"
+            or prop == "Spreadsheet"
+            or prop == "SpreadsheetRange"
             or prop == "FontFile"
             or prop == "Size"
+            or prop == "AutoFit"
+            or prop == "FitWidth"
+            or prop == "FitMargin"
             or prop == "Radius"
             or prop == "StartAngle"
             or prop == "AngleStep"
+            or prop == "Distribution"
+            or prop == "ArcSpan"
             or prop == "Tangential"
+            or prop == "CurvedText"
             or prop == "RotationDirection"
             or prop == "StringRotation"
+            or prop == "RingCounts"
+            or prop == "RingRadii"
+            or prop == "RingStartAngles"
+            or prop == "RingAngleSteps"
+            or prop == "RingSizes"
+            or prop == "RingTangential"
         ):
             obj.recompute()
         return
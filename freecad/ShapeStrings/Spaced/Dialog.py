@@ -41,7 +41,18 @@ from draftutils.params import get_param
 from draftutils.translate import translate
 from DraftVecUtils import toString
 
+from ..Misc.Commit import commitProperties
+from ..Misc.Estimate import estimate_cost
+from ..Misc.Glyphs import get_glyph_cache
+from ..Misc.Preview import (
+    StringsPreview,
+    outline_string,
+    preview_settings,
+    translate_polylines,
+    working_plane_rotation,
+)
 from ..Misc.Resources import asIcon , asUI
+from ..Misc.StringsModel import StringsTableModel
 
 
 # So the resource file doesn't trigger errors from code checkers (flake8)
@@ -82,19 +93,16 @@ class SpacedShapeStringTaskPanel:
         self.form.sbHeight.setProperty("rawValue", size)
         self.form.sbHeight.setProperty("unit", unit_length)
 
-        # Populate listStrings instead of pteStrings
-        list_widget = self.form.listStrings
-        list_widget.clear()
-        if strings:
-            for s in strings:
-                item = QtGui.QListWidgetItem(s)
-                item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
-                list_widget.addItem(item)
-        else:
-            # Provide a default editable item
-            item = QtGui.QListWidgetItem(translate("draft", "Default"))
-            item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
-            list_widget.addItem(item)
+        # Strings live in a model so the view only materialises visible rows
+        if not strings:
+            # Provide a default editable entry
+            strings = [translate("draft", "Default")]
+        self.stringsModel = StringsTableModel(strings, 1, self.form)
+        list_view = self.form.listStrings
+        list_view.setModel(self.stringsModel)
+        list_view.setUniformItemSizes(True)
+        list_view.setEditTriggers(QtGui.QAbstractItemView.DoubleClicked
+                                  | QtGui.QAbstractItemView.EditKeyPressed)
 
         # Offset and UseBoundingBox controls
         self.form.sbOffset.setProperty("rawValue", offset)
@@ -152,6 +160,37 @@ class SpacedShapeStringTaskPanel:
             QtCore.SIGNAL("clicked()"),
             self.removeStringItem,
         )
+        QtCore.QObject.connect(
+            self.form.pbImportCsv,
+            QtCore.SIGNAL("clicked()"),
+            self.importCsv,
+        )
+
+        self.pasteShortcut = QtGui.QShortcut(QtGui.QKeySequence.Paste, self.form.listStrings)
+        self.pasteShortcut.setContext(QtCore.Qt.WidgetShortcut)
+        QtCore.QObject.connect(
+            self.pasteShortcut,
+            QtCore.SIGNAL("activated()"),
+            self.pasteStrings,
+        )
+
+        # Live outline preview: layout changes are debounced, moving the
+        # base point only moves the existing overlay.
+        self.previewSettings = preview_settings()
+        self.previewRotation = working_plane_rotation()
+        self.preview = StringsPreview()
+        for widget, signal in (
+            (self.form.sbHeight, "valueChanged(double)"),
+            (self.form.sbOffset, "valueChanged(double)"),
+            (self.form.cbUseBoundingBox, "toggled(bool)"),
+        ):
+            QtCore.QObject.connect(widget, QtCore.SIGNAL(signal), self.schedulePreview)
+        for widget in (self.form.sbX, self.form.sbY, self.form.sbZ):
+            QtCore.QObject.connect(widget, QtCore.SIGNAL("valueChanged(double)"), self.previewPlacementChanged)
+        self.stringsModel.dataChanged.connect(self.schedulePreview)
+        self.stringsModel.modelReset.connect(self.schedulePreview)
+        self.stringsModel.rowsInserted.connect(self.schedulePreview)
+        self.stringsModel.rowsRemoved.connect(self.schedulePreview)
 
     def fileSelect(self, fn):
         """Assign the selected file and remember it as default for ShapeStrings."""
@@ -161,7 +200,8 @@ class SpacedShapeStringTaskPanel:
             self._adv_params = App.ParamGet(ADV_PARAM_GROUP)
         # Store last-used font as mod preference
         self._adv_params.SetString("FontFile", str(fn))
-
+        if hasattr(self, "preview"):
+            self.schedulePreview()
 
     def resetPoint(self):
         """Reset the selected point."""
@@ -169,55 +209,129 @@ class SpacedShapeStringTaskPanel:
         origin = App.Vector(0.0, 0.0, 0.0)
         self.setPoint(origin)
 
-    def _createEditableItem(self, text):
-        """Create an editable QListWidgetItem with the given text."""
-        item = QtGui.QListWidgetItem(text)
-        item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
-        return item
-
     def addStringItem(self):
         """Add a new editable entry to listStrings."""
-        list_widget = self.form.listStrings
+        list_view = self.form.listStrings
         # Use a simple translated default label, user can edit after
-        item = self._createEditableItem(translate("draft", "New string"))
-        list_widget.addItem(item)
+        index = self.stringsModel.appendRow(translate("draft", "New string"))
         # Optionally start editing the new item immediately
-        list_widget.setCurrentItem(item)
-        list_widget.editItem(item)
+        list_view.setCurrentIndex(index)
+        list_view.scrollTo(index)
+        list_view.edit(index)
         self.updateRemoveButtonState()
 
     def removeStringItem(self):
         """Remove the currently selected entry from listStrings if more than one."""
-        list_widget = self.form.listStrings
-        count = list_widget.count()
+        model = self.stringsModel
+        count = model.rowCount()
         if count <= 1:
             return  # Do not allow removing the last remaining item
 
-        current_row = list_widget.currentRow()
+        current_row = self.form.listStrings.currentIndex().row()
         if current_row < 0:
             # If nothing is selected, remove the last item
             current_row = count - 1
-        item = list_widget.takeItem(current_row)
-        # Explicitly delete to avoid leaks in long sessions
-        del item
+        model.removeRow(current_row)
+        self.updateRemoveButtonState()
+
+    def pasteStrings(self):
+        """Paste clipboard text into listStrings, one string per line."""
+        text = QtGui.QApplication.clipboard().text()
+        if text:
+            self.stringsModel.pasteText(text, self.form.listStrings.currentIndex())
+            self.updateRemoveButtonState()
+
+    def importCsv(self):
+        """Replace listStrings with the non-blank cells of a CSV file."""
+        path, _filter = QtGui.QFileDialog.getOpenFileName(
+            self.form,
+            translate("draft", "Import strings"),
+            "",
+            translate("draft", "CSV files (*.csv *.txt);;All files (*)"),
+        )
+        if not path:
+            return
+        try:
+            self.stringsModel.importCsv(path)
+        except (OSError, UnicodeDecodeError) as e:
+            _err(translate("draft", "SpacedShapeString: could not import CSV file") + " {}\n".format(e))
+            return
         self.updateRemoveButtonState()
 
     def collectStrings(self):
-        """Read strings from the listStrings widget, one row per string."""
+        """Read strings from the listStrings model, one row per string."""
         items = []
-        list_widget = self.form.listStrings
-        for i in range(list_widget.count()):
-            text = list_widget.item(i).text().strip()
+        for text in self.stringsModel.texts():
+            text = text.strip()
             if text:
                 items.append(text)
         return items
 
     def updateRemoveButtonState(self):
         """Enable/disable the Remove button depending on the number of items."""
-        list_widget = self.form.listStrings
-        can_remove = list_widget.count() > 1
+        can_remove = self.stringsModel.rowCount() > 1
         self.form.pbRemoveString.setEnabled(can_remove)
 
+    def schedulePreview(self, *_args):
+        """Re-lay out the preview once the current burst of edits settles."""
+        self.preview.schedule(self.previewOutlines)
+
+    def previewPlacementChanged(self, *_args):
+        """Move the preview overlay to the base point in the spin boxes."""
+        try:
+            base = App.Vector(
+                App.Units.Quantity(self.form.sbX.text()).Value,
+                App.Units.Quantity(self.form.sbY.text()).Value,
+                App.Units.Quantity(self.form.sbZ.text()).Value,
+            )
+        except ValueError:
+            return  # Mid-edit text; keep the overlay where it is
+        self.preview.setPlacement(App.Placement(base, self.previewRotation))
+
+    def updateEstimate(self, strings, size):
+        """Show the predicted recompute time for the panel's current values."""
+        settings = self.previewSettings
+        estimate = estimate_cost(
+            self.fileSpec, size, strings, settings["MakeFace"], settings["Fuse"], settings["Tracking"]
+        )
+        self.form.lEstimate.setText(
+            translate("draft", "Estimated recompute: {}").format(estimate.describe())
+        )
+
+    def previewOutlines(self):
+        """Yield the outlines of each string, laid out like SpacedShapeString."""
+        settings = self.previewSettings
+        size = App.Units.Quantity(self.form.sbHeight.text()).Value
+        offset = App.Units.Quantity(self.form.sbOffset.text()).Value
+        use_bounding_box = self.form.cbUseBoundingBox.isChecked()
+
+        strings = self.collectStrings()
+        self.updateEstimate(strings, size)
+
+        cache = get_glyph_cache(self.fileSpec, size, settings["Tracking"])
+        cap_height = size if settings["ScaleToSize"] else cache.cap_height()
+
+        # Same rule as Layout.spaced_positions, applied as we go
+        x = 0.0
+        for text in strings:
+            polylines, box = outline_string(
+                cache,
+                text,
+                1.0,
+                settings["ObliqueAngle"],
+                settings["Justification"],
+                settings["JustificationReference"],
+                settings["KeepLeftMargin"],
+                cap_height,
+            )
+            if box is None:
+                yield None
+                continue
+            yield translate_polylines(polylines, x, 0.0)
+            if use_bounding_box:
+                x += box.XLength
+            x += offset
+
     def action(self, arg):
         """Scene event handler."""
         if arg["Type"] == "SoKeyboardEvent":
@@ -262,6 +376,8 @@ class SpacedShapeStringTaskPanelCmd(SpacedShapeStringTaskPanel):
     def __init__(self, sourceCmd):
         super().__init__()
         self.sourceCmd = sourceCmd
+        self.previewPlacementChanged()
+        self.schedulePreview()
 
     def accept(self):
         """Execute when clicking the OK button."""
@@ -276,6 +392,7 @@ class SpacedShapeStringTaskPanelCmd(SpacedShapeStringTaskPanel):
 
     def reject(self):
         """Run when clicking the Cancel button."""
+        self.preview.remove()
         Gui.ActiveDocument.resetEdit()
         self.sourceCmd.finish()
         self.platWinDialog("Restore")
@@ -352,6 +469,10 @@ class SpacedShapeStringTaskPanelEdit(SpacedShapeStringTaskPanel):
         self.vobj = vobj
         self.call = Gui.activeView().addEventCallback("SoEvent", self.action)
 
+        self.previewSettings = preview_settings(vobj.Object)
+        self.previewRotation = vobj.Object.Placement.Rotation
+        self.previewPlacementChanged()
+
         # Bind the numeric fields to their document object properties so the
         # "=" shortcut and "fx" icon open FreeCAD's expression editor.
         Gui.ExpressionBinding(self.form.sbX).bind(vobj.Object, "Placement.Base.x")
@@ -359,6 +480,7 @@ class SpacedShapeStringTaskPanelEdit(SpacedShapeStringTaskPanel):
         Gui.ExpressionBinding(self.form.sbZ).bind(vobj.Object, "Placement.Base.z")
         Gui.ExpressionBinding(self.form.sbHeight).bind(vobj.Object, "Size")
         Gui.ExpressionBinding(self.form.sbOffset).bind(vobj.Object, "Offset")
+        self.schedulePreview()
 
     def accept(self):
         x = App.Units.Quantity(self.form.sbX.text()).Value
@@ -372,14 +494,17 @@ class SpacedShapeStringTaskPanelEdit(SpacedShapeStringTaskPanel):
         use_bounding_box = bool(self.form.cbUseBoundingBox.isChecked())
         font_file = self.fileSpec
 
-        o = 'FreeCAD.ActiveDocument.getObject("{}")'.format(self.vobj.Object.Name)
-        Gui.doCommand(o + ".Placement.Base=" + toString(base))
-        Gui.doCommand(o + ".Size=" + str(size))
-        Gui.doCommand(o + ".Strings=" + repr(strings))
-        Gui.doCommand(o + ".Offset=" + str(offset))
-        Gui.doCommand(o + ".UseBoundingBox=" + str(use_bounding_box))
-        Gui.doCommand(o + '.FontFile="' + font_file + '"')
-        Gui.doCommand("FreeCAD.ActiveDocument.recompute()")
+        obj = self.vobj.Object
+        placement = App.Placement(obj.Placement)
+        placement.Base = base
+        commitProperties(obj, {
+            "Placement": placement,
+            "Size": size,
+            "Strings": strings,
+            "Offset": offset,
+            "UseBoundingBox": use_bounding_box,
+            "FontFile": font_file,
+        }, translate("draft", "Edit Spaced ShapeString"))
 
         # Persist font used in edit as Shapestring default
         if not hasattr(self, "_adv_params"):
@@ -390,11 +515,13 @@ class SpacedShapeStringTaskPanelEdit(SpacedShapeStringTaskPanel):
         return True
 
     def reject(self):
+        self.preview.remove()
         self.vobj.Document.resetEdit()
         self.platWinDialog("Restore")
         return True
 
     def finish(self):
+        self.preview.remove()
         Gui.activeView().removeEventCallback("SoEvent", self.call)
         Gui.Snapper.off()
         Gui.Control.closeDialog()
@@ -35,13 +35,16 @@ if App.GuiUp:
     from .View import ViewProviderSpacedShapeString
 
 
-def make_spacedshapestring(Strings, FontFile, Size=100, Offset=10, UseBoundingBox=False):
-    """SpacedShapeString(Strings,FontFile,[Height],[Offset],[UseBoundingBox])
+def make_spacedshapestring(Strings, FontFile, Size=100, Offset=10, UseBoundingBox=False, Pattern=""):
+    """SpacedShapeString(Strings,FontFile,[Height],[Offset],[UseBoundingBox],[Pattern])
 
     Turns a list of text strings into a single Compound Shape, with each
     string rendered using the given font and separated in the x-direction
     by the specified offset (and optionally using each string's bounding
     box width to compute spacing).
+
+    A non-empty `Pattern`, such as "SN-{00001..05000}", generates the
+    strings at recompute time instead; `Strings` can then be empty.
     """
     App.Console.PrintMessage("Creating SpacedShapeString object...\n")
 
@@ -60,6 +63,7 @@ def make_spacedshapestring(Strings, FontFile, Size=100, Offset=10, UseBoundingBo
     obj.Size = Size
     obj.Offset = Offset
     obj.UseBoundingBox = bool(UseBoundingBox)
+    obj.Pattern = Pattern
 
     # Print all object properties to the FreeCAD console
     App.Console.PrintMessage("SpacedShapeString properties:\n")
@@ -84,3 +88,25 @@ def make_spacedshapestring(Strings, FontFile, Size=100, Offset=10, UseBoundingBo
     App.Console.PrintMessage("SpacedShapeString object created successfully.\n")
     return obj
 
+
+
+def make_scaleshapestring(FontFile, Start=0, Stop=10, Step=1, Pitch=10, Size=5, Format="{:g}"):
+    """ScaleShapeString(FontFile,[Start],[Stop],[Step],[Pitch],[Size],[Format])
+
+    Creates a SpacedShapeString in scale label mode: the values from
+    `Start` to `Stop` by `Step`, formatted with the Python format string
+    `Format`, centred on ticks exactly `Pitch` apart - the labels of a
+    ruler or linear scale.
+    """
+    obj = make_spacedshapestring([], FontFile, Size, Pitch)
+    if obj is None:
+        return None
+
+    obj.LabelMode = "Scale"
+    obj.ScaleStart = Start
+    obj.ScaleStop = Stop
+    obj.ScaleStep = Step
+    obj.ScaleFormat = Format
+    obj.Justification = "Bottom-Center"
+    obj.recompute()
+    return obj
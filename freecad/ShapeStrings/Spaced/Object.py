@@ -32,10 +32,18 @@ import FreeCAD as App
 import Part
 
 from draftgeoutils import faces
-from draftutils.messages import _toolmsg
 
 from draftobjects.base import DraftObject
+from ..Misc.Background import OVER_BUDGET, PENDING, run_render
+from ..Misc.Dedup import string_cache
+from ..Misc.Estimate import check_budget
+from ..Misc.Extrude import solid_steps
+from ..Misc.Fit import auto_fit
 from ..Misc.Justify import justification_vector
+from ..Misc.Layout import pitch_positions, spaced_positions
+from ..Misc.Pattern import is_scale, object_strings, string_count
+from ..Misc.Sheet import sync_strings
+from ..Misc.StringMap import assign_strings, string_compound, string_shape
 
 from FreeCAD import Qt
 
@@ -57,6 +65,29 @@ class SpacedShapeString(DraftObject):
             _tip = translate("App::Property", "List of text strings to render")
             obj.addProperty("App::PropertyStringList", "Strings", "Draft", _tip)
 
+        if "Pattern" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Generate the strings from a pattern such as SN-{00001..05000} "
+                "or {0..100..10}mm instead of Strings (empty = use Strings)",
+            )
+            obj.addProperty("App::PropertyString", "Pattern", "Draft", _tip)
+
+        if "Spreadsheet" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Spreadsheet whose SpreadsheetRange is copied into Strings on every recompute",
+            )
+            obj.addProperty("App::PropertyLink", "Spreadsheet", "Draft", _tip)
+
+        if "SpreadsheetRange" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Cells of Spreadsheet to read the strings from, row by row, such as A1:A500 "
+                "(empty = use Strings as they are)",
+            )
+            obj.addProperty("App::PropertyString", "SpreadsheetRange", "Draft", _tip)
+
         if "Offset" not in properties:
             _tip = translate("App::Property", "X-direction offset between each string")
             obj.addProperty("App::PropertyLength", "Offset", "Draft", _tip)
@@ -67,6 +98,32 @@ class SpacedShapeString(DraftObject):
             obj.addProperty("App::PropertyBool", "UseBoundingBox", "Draft", _tip)
             obj.UseBoundingBox = False
 
+        if "LabelMode" not in properties:
+            _tip = translate("App::Property", "Strings: render Strings or Pattern. Scale: render the numbers from ScaleStart to ScaleStop at an exact pitch of Offset")
+            obj.addProperty("App::PropertyEnumeration", "LabelMode", "Draft", _tip)
+            obj.LabelMode = ["Strings", "Scale"]
+            obj.LabelMode = "Strings"
+
+        if "ScaleStart" not in properties:
+            _tip = translate("App::Property", "First value of the scale labels")
+            obj.addProperty("App::PropertyFloat", "ScaleStart", "Draft", _tip)
+            obj.ScaleStart = 0.0
+
+        if "ScaleStop" not in properties:
+            _tip = translate("App::Property", "Last value of the scale labels (included when a step lands on it)")
+            obj.addProperty("App::PropertyFloat", "ScaleStop", "Draft", _tip)
+            obj.ScaleStop = 10.0
+
+        if "ScaleStep" not in properties:
+            _tip = translate("App::Property", "Increment between consecutive scale labels")
+            obj.addProperty("App::PropertyFloat", "ScaleStep", "Draft", _tip)
+            obj.ScaleStep = 1.0
+
+        if "ScaleFormat" not in properties:
+            _tip = translate("App::Property", "Python format string for the scale labels, e.g. {:g} or {:.1f}")
+            obj.addProperty("App::PropertyString", "ScaleFormat", "Draft", _tip)
+            obj.ScaleFormat = "{:g}"
+
         if "FontFile" not in properties:
             _tip = translate("App::Property", "Font file name")
             obj.addProperty("App::PropertyFile", "FontFile", "Draft", _tip)
@@ -75,6 +132,22 @@ class SpacedShapeString(DraftObject):
             _tip = translate("App::Property", "Height of text")
             obj.addProperty("App::PropertyLength", "Size", "Draft", _tip)
 
+        if "AutoFit" not in properties:
+            _tip = translate("App::Property", "Set Size to the largest that fits: Width = every string within FitWidth")
+            obj.addProperty("App::PropertyEnumeration", "AutoFit", "Draft", _tip)
+            obj.AutoFit = ["Off", "Width"]
+            obj.AutoFit = "Off"
+
+        if "FitWidth" not in properties:
+            _tip = translate("App::Property", "Maximum width of each string when AutoFit is Width")
+            obj.addProperty("App::PropertyLength", "FitWidth", "Draft", _tip)
+            obj.FitWidth = 50.0
+
+        if "FitMargin" not in properties:
+            _tip = translate("App::Property", "Space kept clear when fitting, taken off the target width")
+            obj.addProperty("App::PropertyLength", "FitMargin", "Draft", _tip)
+            obj.FitMargin = 0.0
+
         if "Justification" not in properties:
             _tip = translate("App::Property", "Horizontal and vertical alignment")
             obj.addProperty("App::PropertyEnumeration", "Justification", "Draft", _tip)
@@ -117,6 +190,61 @@ class SpacedShapeString(DraftObject):
             obj.addProperty("App::PropertyBool", "Fuse", "Draft", _tip)
             obj.Fuse = False
 
+        if "Height" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Extrude each glyph into a solid of this height (0 = flat faces)",
+            )
+            obj.addProperty("App::PropertyDistance", "Height", "Draft", _tip)
+            obj.Height = 0.0
+
+        if "Taper" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Taper angle of the extruded sides; positive narrows the glyphs towards the top",
+            )
+            obj.addProperty("App::PropertyAngle", "Taper", "Draft", _tip)
+            obj.Taper = 0.0
+
+        if "BackgroundRecompute" not in properties:
+            _tip = translate("App::Property", "Render large string lists in the background, keeping the previous shape until done")
+            obj.addProperty("App::PropertyBool", "BackgroundRecompute", "Draft", _tip)
+            obj.BackgroundRecompute = True
+
+        if "TimeBudget" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Maximum recompute time in seconds; a recompute expected or found "
+                "to take longer is stopped and the previous shape kept (0 = no limit)",
+            )
+            obj.addProperty("App::PropertyFloat", "TimeBudget", "Draft", _tip)
+            obj.TimeBudget = 0.0
+
+        if "StringStarts" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first sub-shape of each string in the compound, "
+                "plus the sub-shape count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringStarts", "Result", _tip)
+            obj.setEditorMode("StringStarts", 1)
+
+        if "StringFaces" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first face of each string in the shape, plus the face count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringFaces", "Result", _tip)
+            obj.setEditorMode("StringFaces", 1)
+
+        if "StringEdges" not in properties:
+            _tip = translate(
+                "App::Property",
+                "Index of the first edge of each string in the shape, plus the edge count (read-only)",
+            )
+            obj.addProperty("App::PropertyIntegerList", "StringEdges", "Result", _tip)
+            obj.setEditorMode("StringEdges", 1)
+
     def onDocumentRestored(self, obj):
         super().onDocumentRestored(obj)
         # Ensure all properties exist after document restoration
@@ -129,103 +257,30 @@ class SpacedShapeString(DraftObject):
             self.props_changed_clear()
             return
 
-        if obj.Strings and obj.FontFile:
+        sync_strings(obj)
+        count = string_count(obj)
+        if count and obj.FontFile:
             plm = obj.Placement
-            all_shapes = []
-            x_offset = App.Units.Quantity(0, App.Units.Length)  # 0 mm
-
-            # Pre-calculate justification vector once (same for all strings)
-            # Create a test shape to get justification parameters
-            cap_char = Part.makeWireString("M", obj.FontFile, obj.Size, obj.Tracking)[0]
-            cap_height = Part.Compound(cap_char).BoundBox.YMax
-            if obj.ScaleToSize:
-                cap_height = obj.Size
-
-            # Process each string in the list
-            for string_index, string_text in enumerate(obj.Strings):
-                if not string_text:
-                    continue
-
-                fill = obj.MakeFace
-                if fill is True:
-                    # Test a simple letter to know if we have a sticky font or not
-                    char = Part.makeWireString("L", obj.FontFile, 1, 0)[0]
-                    shapes = self.make_faces(char)
-                    if not shapes:
-                        fill = False
-                    else:
-                        fill = sum([shape.Area for shape in shapes]) > 0.03\
-                                and math.isclose(Part.Compound(char).BoundBox.DiagonalLength,
-                                                 Part.Compound(shapes).BoundBox.DiagonalLength,
-                                                 rel_tol=1e-7)
-
-                # Generate wire representation for this string
-                chars = Part.makeWireString(string_text, obj.FontFile, obj.Size, obj.Tracking)
-                string_shapes = []
-
-                for char in chars:
-                    if fill is False:
-                        string_shapes.extend(char)
-                    elif char:
-                        string_shapes.extend(self.make_faces(char))
-
-                if string_shapes:
-                    # Create compound for this string
-                    if fill and obj.Fuse:
-                        ss_shape = string_shapes[0].fuse(string_shapes[1:])
-                        ss_shape = faces.concatenate(ss_shape)
-                    else:
-                        ss_shape = Part.Compound(string_shapes)
-
-                    # Apply scaling and oblique angle transformations
-                    if obj.ScaleToSize:
-                        ss_shape.scale(obj.Size / cap_height)
-
-                    if obj.ObliqueAngle:
-                        if -80 <= obj.ObliqueAngle <= 80:
-                            mtx = App.Matrix()
-                            mtx.A12 = math.tan(math.radians(obj.ObliqueAngle))
-                            ss_shape = ss_shape.transformGeometry(mtx)
-                        else:
-                            wrn = translate("draft", "SpacedShapeString: oblique angle must be in the -80 to +80 degree range") + "\n"
-                            App.Console.PrintWarning(wrn)
-
-                    # Apply justification
-                    just_vec = justification_vector(
-                        ss_shape,
-                        cap_height,
-                        obj.Justification,
-                        obj.JustificationReference,
-                        obj.KeepLeftMargin,
-                    )
-                    shapes = ss_shape.SubShapes
-                    for shape in shapes:
-                        shape.translate(just_vec)
-
-                    # Apply x-direction offset for this string
-                    # (first string has no offset applied)
-                    if string_index > 0:
-                        offset_vec = App.Vector(x_offset, 0, 0)
-                        for shape in shapes:
-                            shape.translate(offset_vec)
-
-                    # Calculate spacing for next string if UseBoundingBox is enabled
-                    _toolmsg("type x_offset: {} repr: {}".format(type(x_offset), repr(x_offset)))
-                    _toolmsg("type obj.Offset: {} repr: {}".format(type(obj.Offset), repr(obj.Offset)))
-
-                    # Update x_offset for bounding box width if needed
-                    if obj.UseBoundingBox:
-                        string_compound = Part.Compound(shapes)
-                        bbox = string_compound.optimalBoundingBox()
-                        x_offset += App.Units.Quantity(bbox.XLength, App.Units.Length)
-
-                    # Add fixed offset
-                    x_offset += obj.Offset
-
-                    all_shapes.extend(shapes)
-
-            if all_shapes:
-                obj.Shape = Part.Compound(all_shapes)
+
+            auto_fit(obj)
+            estimate, message = check_budget(obj, "SpacedShapeString")
+            if message:
+                shape = OVER_BUDGET
+                App.Console.PrintError(message + "\n")
+            else:
+                steps = self.render_steps(obj)
+                if obj.Height.Value:
+                    # Extrude the flat render, so only the thickness changes
+                    steps = solid_steps(obj, steps)
+                    estimate = None
+                shape = run_render(obj, steps, count, "SpacedShapeString", estimate)
+            if shape is PENDING or shape is OVER_BUDGET:
+                # Either rendering continues in the background, or it was
+                # refused or abandoned for the TimeBudget (already
+                # reported); the previous shape stays either way.
+                pass
+            elif shape is not None:
+                assign_strings(obj, shape, count)
             else:
                 App.Console.PrintWarning(translate("draft", "SpacedShapeString: strings have no wires") + "\n")
 
@@ -234,9 +289,132 @@ class SpacedShapeString(DraftObject):
         obj.positionBySupport()
         self.props_changed_clear()
 
+    def render_steps(self, obj):
+        """Render the strings side by side, yielding once per string.
+
+        Returns the finished compound, one sub-compound per string (see
+        `Misc/StringMap.py`), or None if no string produced any geometry.
+        See `Misc/Background.py` for how this is driven.
+        """
+        rendered = []
+
+        # Pre-calculate justification vector once (same for all strings)
+        # Create a test shape to get justification parameters
+        cap_char = Part.makeWireString("M", obj.FontFile, obj.Size, obj.Tracking)[0]
+        cap_height = Part.Compound(cap_char).BoundBox.YMax
+        if obj.ScaleToSize:
+            cap_height = obj.Size
+
+        fill = obj.MakeFace
+        if fill is True:
+            # Test a simple letter to know if we have a sticky font or not
+            char = Part.makeWireString("L", obj.FontFile, 1, 0)[0]
+            shapes = self.make_faces(char)
+            if not shapes:
+                fill = False
+            else:
+                fill = sum([shape.Area for shape in shapes]) > 0.03\
+                        and math.isclose(Part.Compound(char).BoundBox.DiagonalLength,
+                                         Part.Compound(shapes).BoundBox.DiagonalLength,
+                                         rel_tol=1e-7)
+
+        # Render each string in the list at its own origin; repeated
+        # strings are rendered once and copied, see `Misc/Dedup.py`
+        string_shapes = string_cache(self, obj)
+        for index, string_text in enumerate(object_strings(obj)):
+            yield
+            if not string_text:
+                continue
+
+            shapes = string_shapes.get(
+                string_text, lambda: self.render_string(obj, string_text, fill, cap_height)
+            )
+            if shapes:
+                rendered.append((index, shapes))
+
+        string_shapes.report("SpacedShapeString")
+
+        if not rendered:
+            return None
+
+        # Lay the rendered strings out left to right
+        if is_scale(obj):
+            # Scale labels sit at exact multiples of the pitch
+            positions = pitch_positions([index for index, _shapes in rendered], float(obj.Offset))
+        elif obj.UseBoundingBox:
+            widths = [Part.Compound(shapes).optimalBoundingBox().XLength for _index, shapes in rendered]
+            positions = spaced_positions(widths, float(obj.Offset), True)
+        else:
+            positions = spaced_positions([0.0] * len(rendered), float(obj.Offset), False)
+
+        parts = {}
+        for (index, shapes), x in zip(rendered, positions):
+            if x:
+                offset_vec = App.Vector(x, 0, 0)
+                for shape in shapes:
+                    shape.translate(offset_vec)
+            parts[index] = shapes
+
+        return string_compound(parts)
+
+    def render_string(self, obj, string_text, fill, cap_height):
+        """Render one string at its own origin, justified.
+
+        Returns the list of its shapes, empty if it has no geometry.
+        """
+        # Generate wire representation for this string
+        chars = Part.makeWireString(string_text, obj.FontFile, obj.Size, obj.Tracking)
+        string_shapes = []
+
+        for char in chars:
+            if fill is False:
+                string_shapes.extend(char)
+            elif char:
+                string_shapes.extend(self.make_faces(char))
+
+        if not string_shapes:
+            return []
+
+        # Create compound for this string
+        if fill and obj.Fuse:
+            ss_shape = string_shapes[0].fuse(string_shapes[1:])
+            ss_shape = faces.concatenate(ss_shape)
+        else:
+            ss_shape = Part.Compound(string_shapes)
+
+        # Apply scaling and oblique angle transformations
+        if obj.ScaleToSize:
+            ss_shape.scale(obj.Size / cap_height)
+
+        if obj.ObliqueAngle:
+            if -80 <= obj.ObliqueAngle <= 80:
+                mtx = App.Matrix()
+                mtx.A12 = math.tan(math.radians(obj.ObliqueAngle))
+                ss_shape = ss_shape.transformGeometry(mtx)
+            else:
+                wrn = translate("draft", "SpacedShapeString: oblique angle must be in the -80 to +80 degree range") + "\n"
+                App.Console.PrintWarning(wrn)
+
+        # Apply justification
+        just_vec = justification_vector(
+            ss_shape,
+            cap_height,
+            obj.Justification,
+            obj.JustificationReference,
+            obj.KeepLeftMargin,
+        )
+        shapes = ss_shape.SubShapes
+        for shape in shapes:
+            shape.translate(just_vec)
+        return shapes
+
     def onChanged(self, obj, prop):
         self.props_changed_store(prop)
 
+    def getStringShape(self, obj, index):
+        """Shapes of string `index`, without recomputing; see `Misc/StringMap.py`."""
+        return string_shape(obj, index)
+
     # justification_vector moved to shared module `justification.py`
 
     def make_faces(self, wireChar):
@@ -28,6 +28,7 @@
 import FreeCADGui as Gui
 
 from draftviewproviders.view_base import ViewProviderDraft
+from ..Misc.Commit import isCommitting
 from ..Misc.Resources import asIcon
 from .Dialog import SpacedShapeStringTaskPanelEdit
 
@@ -40,9 +41,24 @@ class ViewProviderSpacedShapeString(ViewProviderDraft):
         return asIcon('Spaced')
 
     def updateData(self, obj, prop):
+        if isCommitting(obj):
+            # A batched edit recomputes once when it is done
+            return
+
         if (prop == "Strings" or
+            prop == "Pattern" or
+            prop == "Spreadsheet" or
+            prop == "SpreadsheetRange" or
+            prop == "LabelMode" or
+            prop == "ScaleStart" or
+            prop == "ScaleStop" or
+            prop == "ScaleStep" or
+            prop == "ScaleFormat" or
             prop == "FontFile" or
             prop == "Size" or
+            prop == "AutoFit" or
+            prop == "FitWidth" or
+            prop == "FitMargin" or
             prop == "Offset" or
             prop == "UseBoundingBox"):
             obj.recompute()
@@ -6,7 +6,11 @@ from .Misc.Toolbar import extendToolbar
 from .Spaced import registerSpaced
 from .Radial import registerRadial
 from .Grid import registerGrid
+from .Engrave import registerEngrave
+from .Path import registerPath
+from .Multi import registerMulti
 from .API import initializeAPI
+from .Export import registerExporters
 
 from FreeCAD import Gui
 
@@ -18,5 +22,10 @@ initializeAPI()
 registerRadial()
 registerSpaced()
 registerGrid()
+registerEngrave()
+registerPath()
+registerMulti()
+
+registerExporters()
 
 extendToolbar()